@@ -0,0 +1,1023 @@
+# bench.py — micro-benchmarks for whybinder hot paths (headless)
+# usage: python bench.py [name ...]    (no names = run all)
+
+import collections
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import whybinder as wb
+
+
+def _timeit(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+_APP = None
+
+
+def _qapp():
+    # one QApplication for the whole run, kept referenced here
+    global _APP
+    from PySide6 import QtWidgets
+    _APP = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    return _APP
+
+
+# ---------- Text triggers ----------
+def bench_triggers(keystrokes: int = 100_000):
+    rnd = random.Random(1)
+    alphabet = string.ascii_lowercase + "  ."
+    for n in (10, 100, 1000):
+        binds = [wb.Bind(kind="text", key="." + "".join(rnd.choices(string.ascii_lowercase, k=rnd.randint(2, 7))), text="x")
+                 for _ in range(n)]
+        stream: list[str] = []
+        while len(stream) < keystrokes:
+            if rnd.random() < 0.05:
+                stream.extend(rnd.choice(binds).key)
+            else:
+                stream.append(rnd.choice(alphabet))
+
+        def naive():
+            buf = ""
+            hits = 0
+            for ch in stream:
+                buf = (buf + ch)[-120:]
+                for b in binds:
+                    trig = b.key.strip().lower()
+                    if trig and buf.endswith(trig):
+                        hits += 1
+                        buf = ""
+                        break
+            return hits
+
+        def automaton():
+            m = wb.TriggerMatcher(binds)
+            hits = 0
+            for ch in stream:
+                if m.feed(ch) is not None:
+                    hits += 1
+                    m.reset()
+            return hits
+
+        t_build = _timeit(lambda: wb.TriggerMatcher(binds))
+        t_naive = _timeit(naive, 1)
+        t_auto = _timeit(automaton)
+        print(f"triggers={n:5d}  build={t_build*1e3:7.2f} ms  "
+              f"endswith={t_naive/keystrokes*1e6:8.3f} us/key  "
+              f"automaton={t_auto/keystrokes*1e6:6.3f} us/key")
+
+
+# ---------- Hotkey registration ----------
+class _FakeKeyboard:
+    # stands in for the keyboard module: records registrations, never hooks the OS
+    def __init__(self):
+        self.live: dict[int, str] = {}   # handle -> combo, in registration order
+        self.hooks: set[int] = set()
+        self._next = 0
+
+    def _handle(self) -> int:
+        self._next += 1
+        return self._next
+
+    def add_hotkey(self, key, cb, suppress=False, trigger_on_release=False):
+        h = self._handle()
+        self.live[h] = key.strip()
+        return h
+
+    def remove_hotkey(self, h):
+        del self.live[h]   # KeyError on a stale handle, like keyboard's own
+
+    def on_release(self, cb):
+        h = self._handle()
+        self.hooks.add(h)
+        return h
+
+    def unhook(self, h):
+        self.hooks.remove(h)
+
+    def send(self, *_a, **_kw):
+        pass
+
+    def write(self, *_a, **_kw):
+        pass
+
+
+def bench_hotkeys(n_binds: int = 300):
+    # apply_binds against a fake keyboard: exact hook_ops and registered set per edit
+    fake, real = _FakeKeyboard(), wb.keyboard
+    wb.keyboard = fake
+    eng = wb.BinderEngine()
+    try:
+        def step(label, binds, ops):
+            before = eng.hook_ops
+            t0 = time.perf_counter()
+            eng.apply_binds(binds)
+            dt = time.perf_counter() - t0
+            want = sorted([b.key for b in binds if b.enabled and b.kind == "hotkey"] + [wb.INJECT_CANCEL_HOTKEY])
+            assert sorted(fake.live.values()) == want, (label, sorted(fake.live.values()))
+            assert bool(fake.hooks) == any(b.enabled and b.kind == "text" for b in binds), label
+            # a shorter combo sharing parts with a longer one must be registered after it
+            order = list(fake.live.values())
+            for i, a in enumerate(order):
+                for c in order[i + 1:]:
+                    assert not (wb._combo_parts(a) < wb._combo_parts(c)), (label, a, "before", c)
+            print(f"{label:28s} hook_ops={eng.hook_ops - before:4d}  ({dt * 1e3:6.2f} ms)")
+            assert eng.hook_ops - before == ops, (label, eng.hook_ops - before, ops)
+
+        binds = [wb.Bind(kind="hotkey", key=f"ctrl+alt+{i}", text="x") for i in range(n_binds)]
+        step("initial", binds, n_binds + 1)               # + the cancel hotkey
+        step("same list again", binds, 0)
+        b = wb.Bind(kind="hotkey", key="F10+1", text="x")
+        step("add F10+1", binds + [b], 1)
+        short = wb.Bind(kind="hotkey", key="F10", text="x")
+        step("add shorter F10", binds + [b, short], 1)
+        longer = wb.Bind(kind="hotkey", key="F10+1+2", text="x")
+        # F10+1 and F10 are shadowed by the new combo: each re-registered after it
+        step("add longer F10+1+2", binds + [b, short, longer], 1 + 2 * 2)
+        b.key = "F10+2"
+        step("edit F10+1 -> F10+2", binds + [b, short, longer], 2 + 2)   # F10 re-registered after it
+        short.enabled = False
+        step("disable F10", binds + [b, short, longer], 1)
+        step("delete F10+2", binds + [short, longer], 1)
+        txt = wb.Bind(kind="text", key=".hi", text="x")
+        step("add text trigger", binds + [short, longer, txt], 1)
+        step("delete everything", [], n_binds + 1 + 1)    # hotkeys + text hook; cancel stays
+        eng.clear_hotkeys()
+        assert not fake.live and not fake.hooks
+        print("registered set and hook_ops as expected")
+    finally:
+        eng.shutdown()
+        wb.keyboard = real
+
+
+# ---------- Injection queue ----------
+def bench_inject(bursts: int = 20, burst: int = 40, job_ms: float = 2.0):
+    for policy in ("drop_oldest", "drop_new"):
+        w = wb.InjectionWorker(policy=policy)
+        for _ in range(bursts):
+            for i in range(burst):
+                w.submit(i % 24, lambda cancel: time.sleep(job_ms / 1000))
+            time.sleep(burst * job_ms / 1000 / 2)
+        while w.pending():
+            time.sleep(0.01)
+        w.stop()
+        print(f"{policy:12s} injected={w.injected:4d}  {w.stats()}")
+
+
+# ---------- Clipboard paste ----------
+def bench_clipboard(pastes: int = 500, burst: int = 10):
+    _qapp()
+    backends = [("qt", wb.QtClipboardBackend)]
+    if wb.pyperclip is not None:
+        backends.append(("pyperclip", wb.PyperclipBackend))
+    for name, cls in backends:
+        paster = wb.ClipboardPaster(cls())
+        try:
+            t0 = time.perf_counter()
+            for i in range(pastes):
+                paster.paste(f"text {i}", lambda keys: None)
+                if i % burst == burst - 1:
+                    paster.restore()
+            total = time.perf_counter() - t0
+        except Exception as e:
+            print(f"{name:10s} unavailable: {e!r}")
+            continue
+        print(f"{name:10s} {total / pastes * 1e3:7.3f} ms/paste incl. restore  {paster.stats()}")
+
+
+# ---------- Content DB ----------
+def _make_db(n_items: int, area: str = "ppv", cat: str = "DILDO", **kw) -> "wb.ContentDB":
+    path = Path(tempfile.mkdtemp(prefix="wb_bench_")) / "content_bases.json"
+    db = wb.ContentDB(path, **kw)
+    rnd = random.Random(2)
+    arr = db.data[area][cat]["items"]
+    for i in range(n_items):
+        arr.append(db._mk(" ".join(rnd.choices(string.ascii_lowercase, k=40)) + f" #{i}", ""))
+    db._reindex()
+    db.flush_delay = 3600  # time the calls, not the background flush
+    return db
+
+
+def bench_usage(calls: int = 10_000, n_items: int = 2_000, legacy_calls: int = 100):
+    db = _make_db(n_items)
+    ids = [it["id"] for it in db.items("ppv", "DILDO")]
+
+    # legacy: mutate + rewrite the whole file on every call
+    t0 = time.perf_counter()
+    for i in range(legacy_calls):
+        with db._lock:
+            db._apply_use(db.data["ppv"]["DILDO"]["items"][i % n_items], wb.datetime.now().isoformat(timespec="seconds"), True)
+        wb.safe_write_json(db.path, db.data)
+    legacy = (time.perf_counter() - t0) / legacy_calls
+
+    t0 = time.perf_counter()
+    for i in range(calls):
+        db.mark_used("ppv", "DILDO", ids[i % n_items], as_copy=True)
+    journal = (time.perf_counter() - t0) / calls
+    size = db.journal_path.stat().st_size
+    t0 = time.perf_counter()
+    db.compact()
+    t_compact = time.perf_counter() - t0
+    print(f"items={n_items}  full rewrite={legacy*1e3:8.3f} ms/call  journal append={journal*1e3:6.3f} ms/call  "
+          f"({calls} calls: {journal*calls:.2f}s vs ~{legacy*calls:.0f}s)  journal={size/1024:.0f} KiB  compact={t_compact*1e3:.0f} ms")
+    db.close()
+
+
+def bench_backends(sizes=(1_000, 10_000, 100_000), ops: int = 20):
+    for n in sizes:
+        jdb = _make_db(n)
+        jdb.save()
+        jdb.flush()
+        folder = jdb.path.parent
+        t_jload = _timeit(lambda: wb.ContentDB(jdb.path), 1)
+        sdb = wb.SqliteContentDB(folder / "content_bases.sqlite3")
+        t0 = time.perf_counter()
+        sdb.migrate_from_json(jdb.path)
+        t_migrate = time.perf_counter() - t0
+        t_sload = _timeit(lambda: wb.SqliteContentDB(folder / "content_bases.sqlite3").close(), 1)
+        ids = [it["id"] for it in jdb.items("ppv", "DILDO")]
+        picks = [random.Random(i).choice(ids) for i in range(ops)]
+
+        def run(db, durable):
+            out = {}
+            t0 = time.perf_counter()
+            for i in picks:
+                db.update("ppv", "DILDO", i, "edited", "")
+                if durable:
+                    db.flush()
+            out["update"] = (time.perf_counter() - t0) / ops
+            t0 = time.perf_counter()
+            for i in picks:
+                db.mark_used("ppv", "DILDO", i, True)
+            out["mark_used"] = (time.perf_counter() - t0) / ops
+            out["items"] = _timeit(lambda: db.items("ppv", "DILDO"), 2)
+            t0 = time.perf_counter()
+            for _ in range(ops):
+                db.pick_random("ppv", "DILDO", True)
+            out["pick_random"] = (time.perf_counter() - t0) / ops
+            return out
+
+        rj, rs = run(jdb, True), run(sdb, False)
+        print(f"items={n:6d}  load json={t_jload*1e3:8.1f} ms  sqlite={t_sload*1e3:6.1f} ms  (migrate {t_migrate*1e3:.0f} ms)")
+        for k in rj:
+            print(f"    {k:12s} json={rj[k]*1e3:9.3f} ms  sqlite={rs[k]*1e3:9.3f} ms")
+        jdb.close()
+        sdb.close()
+
+
+def bench_views(n_items: int = 20_000, calls: int = 200):
+    import tracemalloc
+    db = _make_db(n_items)
+    arr = db.data["ppv"]["DILDO"]["items"]
+
+    def ui_paths(items_fn):
+        # what one click touched before: refresh/_update_stats/_current_item/pick_random/Spotlight
+        for _ in range(calls):
+            items = items_fn()
+            len(items)
+            items[len(items) // 2]
+            random.choice(items)
+
+    for label, fn in (("list copy", lambda: list(arr)), ("ItemsView", lambda: db.items("ppv", "DILDO"))):
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        ui_paths(fn)
+        dt = time.perf_counter() - t0
+        snap = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        stats = snap.statistics("filename")
+        blocks = sum(st.count for st in stats)
+        print(f"{label:10s} {dt / calls * 1e6:9.1f} us/call  peak={peak / 1024:8.1f} KiB  live blocks={blocks}")
+    db.close()
+
+
+def bench_pick(n_items: int = 100_000, picks: int = 20_000):
+    db = _make_db(n_items)
+    arr = db.data["ppv"]["DILDO"]["items"]
+    rnd = random.Random(4)
+    ids = [it["id"] for it in arr]
+    for iid in rnd.sample(ids, n_items // 3):
+        db.mark_used("ppv", "DILDO", iid, True)
+
+    def legacy(only_today):
+        # the old per-click path: filter the category, then random.choice
+        used = db.used_today_ids("ppv", "DILDO")
+        pool = [it for it in arr if it["id"] not in used] if only_today else list(arr)
+        return random.choice(pool)
+
+    n_legacy = 200
+    for only_today in (False, True):
+        t = _timeit(lambda: [legacy(only_today) for _ in range(n_legacy)], 1) / n_legacy
+        print(f"{'legacy':8s} fresh={only_today!s:5s} {t * 1e6:9.1f} us/pick")
+        for mode in wb.PICK_MODES:
+            db.picker.set_mode(mode)
+            db.picker.seed(7)
+            t0 = time.perf_counter()
+            db.pick_random("ppv", "DILDO", only_today)
+            t_build = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            seen = collections.Counter(db.pick_random("ppv", "DILDO", only_today)["id"] for _ in range(picks))
+            t = (time.perf_counter() - t0) / picks
+            print(f"{mode:8s} fresh={only_today!s:5s} {t * 1e6:9.1f} us/pick  build={t_build * 1e3:6.1f} ms  "
+                  f"distinct={len(seen)}/{picks}")
+    t0 = time.perf_counter()
+    for iid in ids[:picks]:
+        db.mark_used("ppv", "DILDO", iid, True)
+    t = (time.perf_counter() - t0) / picks
+    print(f"mark_used with live picker state: {t * 1e6:.1f} us/call  rebuilds={db.picker.rebuilds}")
+    db.close()
+
+
+def bench_search(n_records: int = 50_000, n_binds: int = 500, queries: int = 300):
+    import statistics
+    rnd = random.Random(5)
+    words = ["".join(rnd.choices(string.ascii_lowercase, k=rnd.randint(3, 9))) for _ in range(5_000)]
+    db = _make_db(0)
+    arr = db.data["ppv"]["DILDO"]["items"]
+    for i in range(n_records - n_binds):
+        arr.append(db._mk(" ".join(rnd.choices(words, k=rnd.randint(6, 20))), ""))
+    db._reindex()
+    binds = [wb.Bind(kind="text", key=f".{rnd.choice(words)}", category="Общее", text=" ".join(rnd.choices(words, k=8)))
+             for _ in range(n_binds)]
+    idx = wb.SearchIndex()
+    t_build = _timeit(lambda: idx.sync(binds, db), 1)
+    t_noop = _timeit(lambda: idx.sync(binds, db))
+    qs = []
+    for _ in range(queries):
+        w = rnd.choice(words)
+        qs.append(w[:rnd.randint(1, len(w))])
+    qs += [" ".join(rnd.choices(words, k=2)) for _ in range(queries // 3)]
+    blobs = [(d, b) for d, b in idx._blob.items()]
+
+    def lat(fn):
+        out = []
+        for q in qs:
+            t0 = time.perf_counter()
+            fn(q)
+            out.append(time.perf_counter() - t0)
+        out.sort()
+        return f"p50={statistics.median(out) * 1e3:7.3f} ms  p95={out[int(len(out) * .95)] * 1e3:7.3f} ms  max={out[-1] * 1e3:7.3f} ms"
+
+    for q in qs[::10]:
+        assert idx.search(q) == [d for d, b in blobs if q in b], q
+    print(f"records={len(idx)}  build={t_build * 1e3:.0f} ms  no-op sync={t_noop * 1e3:.2f} ms  "
+          f"vocabulary={len(idx._tok)} grams={len(idx._gram_toks)}")
+    print(f"linear scan  {lat(lambda q: [d for d, b in blobs if q in b])}")
+    print(f"index        {lat(idx.search)}")
+    print(f"index top-50 {lat(lambda q: idx.search(q, 50))}")
+    print(f"ranked top-{wb.SPOTLIGHT_LIMIT} {lat(lambda q: idx.rank(q))}")
+    typos = []
+    for q in qs[:queries // 3]:
+        if len(q) >= 4:
+            i = rnd.randrange(len(q))
+            typos.append(q[:i] + rnd.choice(string.ascii_lowercase) + q[i + 1:])
+    qs[:] = typos
+    idx._term_cache.clear()
+    print(f"ranked, one typo  {lat(lambda q: idx.rank(q))}  ({len(typos)} queries)")
+    ids = [it["id"] for it in db.items("ppv", "DILDO")][:20]
+    for iid in ids:
+        db.update("ppv", "DILDO", iid, "edited " + rnd.choice(words), "")
+    db.mark_used("ppv", "DILDO", ids[0], True)
+    t0 = time.perf_counter()
+    n = idx.sync(binds, db)
+    print(f"incremental sync after 20 edits: {(time.perf_counter() - t0) * 1e3:.1f} ms  reindexed={n}")
+    for iid in ids:
+        db.mark_used("ppv", "DILDO", iid, True)
+    t0 = time.perf_counter()
+    n = idx.sync(binds, db)
+    print(f"sync after 20 copies (usage only): {(time.perf_counter() - t0) * 1e3:.2f} ms  reindexed={n}")
+    db.close()
+
+
+def bench_binds(n_binds: int = 5_000, toggles: int = 50):
+    from PySide6 import QtWidgets
+    app = _qapp()
+    rnd = random.Random(6)
+    cats = [f"Категория {i}" for i in range(12)]
+    binds = [wb.Bind(kind=rnd.choice(("text", "hotkey")), key="." + "".join(rnd.choices(string.ascii_lowercase, k=6)),
+                     text=" ".join(rnd.choices(string.ascii_lowercase, k=30)), category=rnd.choice(cats),
+                     favorite=rnd.random() < 0.05) for _ in range(n_binds)]
+
+    def pump():
+        app.processEvents()
+
+    # legacy: what BindsPage.refresh did on every toggle/edit/delete
+    legacy = QtWidgets.QTableWidget(0, 7)
+    legacy.resize(900, 600)
+    legacy.show()
+
+    def legacy_refresh():
+        legacy.setRowCount(0)
+        for b in sorted(binds, key=lambda b: (not b.favorite, b.category, b.key)):
+            r = legacy.rowCount()
+            legacy.insertRow(r)
+            for c, v in enumerate(("★" if b.favorite else "☆", b.category, b.kind, b.key, b.mode, "●", b.text[:80])):
+                legacy.setItem(r, c, QtWidgets.QTableWidgetItem(v))
+        legacy.resizeColumnsToContents()
+        pump()
+
+    t_legacy = _timeit(legacy_refresh, 1)
+    legacy.close()
+
+    model = wb.BindsModel(binds)
+    proxy = wb.BindsProxy()
+    proxy.setSourceModel(model)
+    view = QtWidgets.QTableView()
+    view.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+    view.horizontalHeader().setResizeContentsPrecision(50)
+    view.setModel(proxy)
+    view.resize(900, 600)
+    view.show()
+
+    def reset():
+        model.set_binds(binds)
+        view.resizeColumnsToContents()
+        pump()
+
+    t_reset = _timeit(reset, 3)
+    t0 = time.perf_counter()
+    for i in range(toggles):
+        b = binds[rnd.randrange(n_binds)]
+        b.favorite = not b.favorite
+        model.touch([binds.index(b)])  # favorite flips move the row
+        pump()
+    t_toggle = (time.perf_counter() - t0) / toggles
+    t_filter = _timeit(lambda: (proxy.set_category(rnd.choice(cats)), pump()), 5)
+    sel = rnd.sample(range(n_binds), 500)
+    t0 = time.perf_counter()
+    for i in sel:
+        binds[i].enabled = not binds[i].enabled
+    model.touch(sel)
+    pump()
+    t_mass = time.perf_counter() - t0
+    print(f"binds={n_binds}  legacy refresh={t_legacy * 1e3:8.1f} ms (ran after every toggle)")
+    print(f"model reset={t_reset * 1e3:8.1f} ms  favorite toggle={t_toggle * 1e3:6.2f} ms  "
+          f"category filter={t_filter * 1e3:6.1f} ms  mass enable 500={t_mass * 1e3:6.1f} ms")
+    view.close()
+
+
+def bench_selection(n_binds: int = 10_000, every: int = 3):
+    # multi-select under a category filter must resolve to exactly the binds shown
+    from PySide6 import QtCore, QtWidgets
+    _qapp()
+    rnd = random.Random(7)
+    cats = [f"cat{i}" for i in range(8)]
+    binds = [wb.Bind(kind="text", key=f".k{rnd.randrange(10**6):06d}", text=f"t{i}", category=rnd.choice(cats),
+                     favorite=rnd.random() < 0.1) for i in range(n_binds)]
+    model = wb.BindsModel(binds)
+    proxy = wb.BindsProxy()
+    proxy.setSourceModel(model)
+    view = QtWidgets.QTableView()
+    view.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+    view.setSelectionMode(QtWidgets.QAbstractItemView.MultiSelection)
+    view.setModel(proxy)
+
+    def selected_ids():
+        # same mapping as BindsPage.selected_ids
+        rows = set()
+        for rng in view.selectionModel().selection():
+            rows.update(range(rng.top(), rng.bottom() + 1))
+        return [model.uid_at(proxy.mapToSource(proxy.index(r, 0)).row()) for r in sorted(rows)]
+
+    for cat in ("", cats[0]):
+        proxy.set_category(cat)
+        view.clearSelection()
+        sel = QtCore.QItemSelection()
+        for r in range(0, proxy.rowCount(), every):
+            sel.select(proxy.index(r, 0), proxy.index(r, 6))
+        view.selectionModel().select(sel, QtCore.QItemSelectionModel.Select | QtCore.QItemSelectionModel.Rows)
+        shown = sorted(binds, key=lambda b: (not b.favorite, b.category, b.key))
+        expect = {id(b) for b in shown if not cat or b.category == cat}
+        expect = {id(b) for k, b in enumerate(b for b in shown if id(b) in expect) if k % every == 0}
+        t0 = time.perf_counter()
+        ids = selected_ids()
+        idxs = sorted(model.index_of(u) for u in ids)
+        dt = time.perf_counter() - t0
+        assert {id(binds[i]) for i in idxs} == expect, cat
+        # flip favorites on the selection, then check every bind kept its id
+        before = {model.uid(i): binds[i] for i in range(len(binds))}
+        for i in idxs:
+            binds[i].favorite = not binds[i].favorite
+        model.touch(idxs)
+        assert all(binds[model.index_of(u)] is b for u, b in before.items())
+        assert [binds[model.bind_index(r)] for r in range(model.rowCount())] == \
+            sorted(binds, key=lambda b: (not b.favorite, b.category, b.key))
+        print(f"binds={n_binds}  filter={cat or 'all':5s} selected={len(idxs):5d}  resolve={dt * 1e3:6.2f} ms  ok")
+    t0 = time.perf_counter()
+    model.remove(idxs)
+    print(f"remove {len(idxs)} selected: {(time.perf_counter() - t0) * 1e3:.1f} ms; ids still resolve: "
+          f"{all(binds[model.index_of(u)] is b for u, b in before.items() if model.index_of(u) is not None)}")
+
+
+def bench_content(n_items: int = 50_000, lookups: int = 200):
+    # category switch on a large content list: per-row widget items vs the lazy model
+    from PySide6 import QtWidgets
+    app = _qapp()
+    db = _make_db(n_items)
+    items = db.items("ppv", "DILDO")
+
+    # legacy: what ContentPage.refresh did on every category switch
+    legacy = QtWidgets.QListWidget()
+    legacy.resize(400, 600)
+    legacy.show()
+
+    def legacy_refresh():
+        legacy.clear()
+        for it in items:
+            txt = (it.get("text") or "").replace("\n", " ")
+            legacy.addItem(QtWidgets.QListWidgetItem(txt[:60] + "…" if len(txt) > 60 else txt))
+        app.processEvents()
+
+    t_legacy = _timeit(legacy_refresh, 1)
+    legacy.close()
+
+    model = wb.ContentListModel()
+    view = QtWidgets.QListView()
+    view.setUniformItemSizes(True)
+    view.setModel(model)
+    view.resize(400, 600)
+    view.show()
+
+    def refresh():
+        model.set_rows(db.items("ppv", "DILDO"))
+        app.processEvents()
+
+    t_reset = _timeit(refresh, 3)
+    rnd = random.Random(8)
+    rows = [rnd.randrange(n_items) for _ in range(lookups)]
+    t0 = time.perf_counter()
+    for r in rows:
+        view.scrollTo(model.index(r, 0))
+        app.processEvents()
+    t_scroll = (time.perf_counter() - t0) / lookups
+    t0 = time.perf_counter()
+    for r in rows:
+        assert model.item(r) is items[r]
+    t_item = (time.perf_counter() - t0) / lookups
+    t_first = _timeit(lambda: (model.set_rows(items), model.row_of(items[-1]["id"])), 1)
+    t_row = _timeit(lambda: model.row_of(items[rnd.randrange(n_items)]["id"]), lookups)
+    print(f"items={n_items}  legacy fill={t_legacy * 1e3:8.1f} ms  model reset={t_reset * 1e3:6.2f} ms")
+    print(f"jump+paint={t_scroll * 1e3:6.2f} ms  row->item={t_item * 1e6:5.2f} us  "
+          f"first id->row={t_first * 1e3:5.1f} ms  then {t_row * 1e6:5.2f} us  previews cached={len(model._cache)}")
+    view.close()
+    db.close()
+
+
+def bench_import(n_lines: int = 500_000, n_existing: int = 20_000):
+    # 500k-line files (~8% repeats, some differing only in case/spacing) into a category
+    # that already holds n_existing texts, a quarter of which reappear in the file
+    import json
+    import tracemalloc
+    db = _make_db(n_existing)
+    existing = [it["text"] for it in db.items("ppv", "DILDO")]
+    rnd = random.Random(9)
+    texts = []
+    for i in range(n_lines):
+        r = rnd.random()
+        if r < 0.01:
+            texts.append(rnd.choice(existing))
+        elif r < 0.05 and texts:
+            texts.append(rnd.choice(texts).upper())
+        elif r < 0.08 and texts:
+            texts.append("  " + rnd.choice(texts).replace(" ", "   "))
+        else:
+            texts.append(" ".join(rnd.choices(string.ascii_lowercase, k=12)) + f" {i}")
+    tmp = Path(tempfile.mkdtemp(prefix="wb_import_"))
+    files = {"jsonl": tmp / "in.jsonl", "json": tmp / "in.json", "txt": tmp / "in.txt"}
+    with open(files["jsonl"], "w", encoding="utf-8") as f:
+        for t in texts:
+            f.write(json.dumps({"text": t, "hint": ""}, ensure_ascii=False) + "\n")
+    files["json"].write_text(json.dumps({"version": 1, "items": [{"text": t, "hint": ""} for t in texts]},
+                                        ensure_ascii=False, indent=2), encoding="utf-8")
+    files["txt"].write_text("\n".join(texts), encoding="utf-8")
+    expect = len({" ".join(t.split()).casefold() for t in texts} - {" ".join(t.split()).casefold() for t in existing})
+    del texts
+
+    def peak(fn) -> float:
+        tracemalloc.start()
+        fn()
+        _, top = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return top / 2**20
+
+    # legacy import_json: the whole file as one string and one parsed tree
+    legacy = peak(lambda: len(json.loads(files["json"].read_text(encoding="utf-8"))["items"]))
+    print(f"lines={n_lines}  legacy json.loads peak={legacy:7.1f} MiB (before creating any item)")
+    with open(files["jsonl"], "a", encoding="utf-8") as f:
+        f.write('{"text": "cut off by a cras\n[1, 2\n{"hint": "no text"}\n')  # skipped and counted, not fatal
+    for fmt, path in files.items():
+        parse = peak(lambda: sum(1 for _ in wb.iter_import(path)))
+        # batches are dropped as they come, like add_many() commits them: only the key set grows
+        dedupe = peak(lambda: [None for _ in wb.dedupe_import(wb.iter_import(path), set(db.text_keys("ppv", "DILDO")), db._mk)])
+        counts: dict[str, int] = {}
+        t0 = time.perf_counter()
+        new = sum(len(b) for b in wb.dedupe_import(wb.iter_import(path, counts=counts),
+                                                   set(db.text_keys("ppv", "DILDO")), db._mk, counts))
+        t_read = time.perf_counter() - t0
+        print(f"{fmt:5s} {path.stat().st_size / 2**20:6.1f} MiB  stream peak={parse:5.2f} MiB  "
+              f"+dedupe peak={dedupe:5.1f} MiB  read+dedupe={t_read:5.2f} s  new={new} "
+              f"dup={counts.get('dup', 0)} bad={counts.get('bad', 0)}")
+        assert new == expect, (fmt, new, expect)
+        assert counts.get("bad", 0) == (3 if fmt == "jsonl" else 0), counts
+    flushes = db.flushes
+    t0 = time.perf_counter()
+    n = db.import_json("ppv", "DILDO", files["jsonl"])
+    t_commit = time.perf_counter() - t0
+    db.flush()
+    print(f"import_json {n} items in batches of {wb.IMPORT_BATCH}: {t_commit:.2f} s, {db.flushes - flushes} write; "
+          f"re-import adds {db.import_json('ppv', 'DILDO', files['txt'])}")
+    db.close()
+
+
+def bench_export(n_items: int = 200_000):
+    import json
+    import tracemalloc
+    import zipfile
+    db = _make_db(n_items)
+    for cat in db.categories("mailing"):
+        for i in range(n_items // 20):
+            db._append("mailing", cat, db._mk(f"mail {cat} {i} " + "x" * 80, "h"))
+    tmp = Path(tempfile.mkdtemp(prefix="wb_export_"))
+
+    def peak(fn):
+        # timed without tracemalloc, then run again for the peak
+        t0 = time.perf_counter()
+        fn()
+        dt = time.perf_counter() - t0
+        tracemalloc.start()
+        out = fn()
+        _, top = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return out, dt, top / 2**20
+
+    def legacy():
+        # the old export_json: whole payload as one indented string
+        payload = {"version": 1, "area": "ppv", "category": "DILDO", "exported_at": wb.utcnow(),
+                   "items": [{"text": it.get("text", ""), "hint": it.get("hint", "")} for it in db.items("ppv", "DILDO")]}
+        (tmp / "legacy.json").write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    _, t_legacy, m_legacy = peak(legacy)
+    print(f"items={n_items}  legacy export={t_legacy * 1e3:6.0f} ms  peak={m_legacy:6.1f} MiB")
+    for fmt in ("json", "jsonl"):
+        path = tmp / f"out.{fmt}"
+        n, dt, m = peak(lambda: db.export_json("ppv", "DILDO", path))
+        back = [t for t, _ in wb.iter_import(path)]
+        assert back == [it["text"] for it in db.items("ppv", "DILDO")]
+        print(f"stream {fmt:5s}  {dt * 1e3:6.0f} ms  peak={m:6.2f} MiB  {path.stat().st_size / 2**20:5.1f} MiB  round-trip ok")
+    path = tmp / "all.zip"
+    total = sum(db.count(a, c) for a in ("ppv", "mailing") for c in db.categories(a))
+    ticks = []
+    man, dt, m = peak(lambda: db.export_archive(path, progress=lambda: ticks.append(1)))
+    with zipfile.ZipFile(path) as zf:
+        assert json.loads(zf.read(wb.ARCHIVE_MANIFEST))["items"] == total == len(ticks) // 2
+        raw = sum(i.file_size for i in zf.infolist())
+    print(f"archive {len(man['categories'])} categories, {man['items']} items: {dt * 1e3:6.0f} ms  peak={m:6.2f} MiB  "
+          f"{path.stat().st_size / 2**20:5.1f} MiB (raw {raw / 2**20:5.1f} MiB)")
+    db.close()
+
+
+def bench_paint(frames: int = 20):
+    # GlassRoot background per frame into an offscreen QImage, as during a fade/slide
+    from PySide6 import QtCore, QtGui, QtWidgets
+    _qapp()
+    t = wb.THEMES["Ametrine"]
+
+    def legacy_paint(p, r):
+        # the old paintEvent: path + 3 gradients + one drawPixmap per 128px grain tile, every frame
+        radius = float(t.get("radius", "16"))
+        path = QtGui.QPainterPath()
+        path.addRoundedRect(QtCore.QRectF(r), radius, radius)
+        grad = QtGui.QLinearGradient(r.topLeft(), r.bottomRight())
+        grad.setColorAt(0.0, QtGui.QColor(t["bg1"]))
+        grad.setColorAt(0.45, QtGui.QColor(t["bg2"]))
+        grad.setColorAt(1.0, QtGui.QColor(t["bg3"]))
+        p.fillPath(path, grad)
+        hl = QtGui.QLinearGradient(r.topLeft(), r.bottomLeft())
+        hl.setColorAt(0.0, QtGui.QColor(255, 255, 255, 52))
+        hl.setColorAt(1.0, QtGui.QColor(255, 255, 255, 10))
+        p.fillPath(path, hl)
+        pen = QtGui.QPen(QtGui.QColor(255, 255, 255, 36))
+        pen.setWidthF(1.1)
+        p.setPen(pen)
+        p.drawPath(path)
+        pm = wb._grain_pixmap(int(t.get("grain", "12")))
+        p.save()
+        p.setOpacity(0.22)
+        for y in range(r.top(), r.bottom(), pm.height()):
+            for x in range(r.left(), r.right(), pm.width()):
+                p.drawPixmap(x, y, pm)
+        p.restore()
+
+    for name, (w, h) in (("1080p", (1920, 1080)), ("4K", (3840, 2160))):
+        img = QtGui.QImage(w, h, QtGui.QImage.Format_ARGB32_Premultiplied)
+
+        def legacy():
+            img.fill(0)
+            p = QtGui.QPainter(img)
+            p.setRenderHint(QtGui.QPainter.Antialiasing, True)
+            legacy_paint(p, QtCore.QRect(0, 0, w, h).adjusted(1, 1, -1, -1))
+            p.end()
+
+        t_legacy = _timeit(legacy, frames)
+        root = wb.GlassRoot(lambda: "Ametrine")
+        root.resize(w, h)
+
+        def frame():
+            img.fill(0)
+            root.render(img, QtCore.QPoint(), QtGui.QRegion(), QtWidgets.QWidget.RenderFlags())
+
+        t0 = time.perf_counter()
+        frame()
+        t_cold = time.perf_counter() - t0
+        t_warm = _timeit(frame, frames)
+        print(f"{name:5s} legacy={t_legacy * 1e3:7.2f} ms/frame  cached: first={t_cold * 1e3:7.2f} ms  "
+              f"then={t_warm * 1e3:6.2f} ms/frame  background renders={root.bg_renders}")
+        root.deleteLater()
+
+
+def bench_grain(size: int = 128):
+    # cold start: one tile per theme strength
+    from PySide6 import QtCore, QtGui
+    _qapp()
+    strengths = sorted({int(t.get("grain", "12")) for t in wb.THEMES.values()})
+
+    def legacy(strength):
+        # the old _grain_pixmap: two bounded() calls and a setPixelColor per pixel
+        img = QtGui.QImage(size, size, QtGui.QImage.Format_ARGB32_Premultiplied)
+        img.fill(QtCore.Qt.transparent)
+        rnd = QtCore.QRandomGenerator.global_()
+        for y in range(size):
+            for x in range(size):
+                a = int(rnd.bounded(strength))
+                if a == 0:
+                    continue
+                v = 255 if rnd.bounded(2) == 0 else 0
+                img.setPixelColor(x, y, QtGui.QColor(v, v, v, a))
+        return QtGui.QPixmap.fromImage(img)
+
+    t0 = time.perf_counter()
+    for st in strengths:
+        legacy(st)
+    t_legacy = time.perf_counter() - t0
+    t_bulk = _timeit(lambda: [wb.grain_bytes(st, size) for st in strengths], 5)
+    t_fallback = _timeit(lambda: [wb.grain_bytes(st, size, random.Random(st)) for st in strengths], 5)
+    wb.CACHE_DIR = Path(tempfile.mkdtemp(prefix="wb_grain_"))
+
+    def cold():
+        wb._GRAIN_CACHE.clear()
+        for st in strengths:
+            wb._grain_pixmap(st, size)
+
+    t0 = time.perf_counter()
+    cold()
+    t_first = time.perf_counter() - t0  # generate + write the tiles
+    t_disk = _timeit(cold, 5)           # later starts: read + wrap
+    img = wb._grain_pixmap(strengths[-1], size).toImage().convertToFormat(QtGui.QImage.Format_RGBA8888_Premultiplied)
+    px = bytes(img.constBits())[:size * size * 4]
+    ok = all(px[i] == px[i + 1] == px[i + 2] in (0, px[i + 3]) and px[i + 3] < strengths[-1] for i in range(0, len(px), 4))
+    alphas = collections.Counter(px[3::4])
+    print(f"{len(strengths)} tiles {size}px  legacy={t_legacy * 1e3:7.1f} ms  bulk ({'numpy' if wb.np is not None else 'randbytes'})="
+          f"{t_bulk * 1e3:5.2f} ms  randbytes={t_fallback * 1e3:5.2f} ms")
+    print(f"first start (generate+write)={t_first * 1e3:5.2f} ms  cached start (read+wrap)={t_disk * 1e3:5.2f} ms  "
+          f"pixels valid={ok}  alpha levels={len(alphas)}")
+
+
+def _main_window(app, n_binds: int, **settings):
+    # a shown MainWindow on throwaway profile/content paths, BindsPage holding n_binds rows
+    tmp = Path(tempfile.mkdtemp(prefix="wb_mw_"))
+    wb.PROFILES_DIR, wb.CONTENT_DB_FILE = tmp / "profiles", tmp / "content_bases.json"
+    wb.SETTINGS_FILE = tmp / "settings.json"
+    g = {"theme": "Ametrine", "profile": "bench", "density": "comfortable", "onboarding_seen": True,
+         "content_backend": "json", "pick_mode": "deck", **settings}
+    app.setStyleSheet(wb.app_stylesheet(g["theme"], g["density"]))
+    mw = wb.MainWindow(g)
+    mw.binds[:] = [wb.Bind(kind="text", key=f".k{i:05d}", text="x" * 60, category=f"cat{i % 12}") for i in range(n_binds)]
+    mw.page_binds.refresh()
+    mw.resize(1280, 800)
+    mw.show()
+    for _ in range(10):
+        app.processEvents()
+    return mw
+
+
+def bench_theme(n_binds: int = 2_000, switches: int = 10):
+    # theme switches on a shown MainWindow whose BindsPage holds n_binds rows
+    app = _qapp()
+    mw = _main_window(app, n_binds)
+    names = list(wb.THEMES)
+
+    def run(apply) -> float:
+        times = []
+        for k in range(switches):
+            t0 = time.perf_counter()
+            apply(names[(k + 1) % len(names)])
+            app.processEvents()  # relayout + repaint
+            times.append(time.perf_counter() - t0)
+        return sorted(times)[len(times) // 2]
+
+    wb._STYLESHEET_CACHE.clear()
+    t_build = _timeit(lambda: [wb.app_stylesheet(n, "comfortable") for n in names], 1)
+    t_legacy = run(lambda n: app.setStyleSheet(wb._build_stylesheet(n, "comfortable")))
+    t_new = run(lambda n: wb.apply_stylesheet(n, "comfortable"))
+    t0 = time.perf_counter()
+    wb.apply_stylesheet(names[switches % len(names)], "comfortable")
+    t_same = time.perf_counter() - t0
+    print(f"widgets={len(app.allWidgets())}  binds={n_binds}  build all sheets={t_build * 1e3:.2f} ms (then cached)")
+    # a real switch is bound by Qt's re-polish either way; the win is the cached
+    # sheet text and the skipped no-op switch
+    print(f"theme switch (median of {switches}): legacy={t_legacy * 1e3:6.1f} ms  apply_stylesheet={t_new * 1e3:6.1f} ms  "
+          f"same theme again={t_same * 1e3:.3f} ms")
+    mw.hide()
+
+
+def bench_glow(sweeps: int = 5, n_buttons: int = 30):
+    # mouse sweep across n_buttons: Leave + Enter + flush of the dirty region per hop
+    from PySide6 import QtCore, QtWidgets
+    app = _qapp()
+    app.setStyleSheet(wb.app_stylesheet("Ametrine", "comfortable"))
+
+    class LegacyGlow(QtCore.QObject):
+        # the old HoverGlow: a fresh QGraphicsDropShadowEffect per Enter
+        def eventFilter(self, obj, event):
+            if event.type() == QtCore.QEvent.Enter:
+                eff = QtWidgets.QGraphicsDropShadowEffect(obj)
+                eff.setBlurRadius(24)
+                eff.setOffset(0, 0)
+                eff.setColor(wb._parse_rgba(wb.THEMES["Ametrine"]["accent"]))
+                obj.setGraphicsEffect(eff)
+            elif event.type() == QtCore.QEvent.Leave:
+                obj.setGraphicsEffect(None)
+            return False
+
+    def window():
+        w = QtWidgets.QWidget()
+        lay = QtWidgets.QVBoxLayout(w)
+        root = wb.GlassRoot(lambda: "Ametrine")
+        lay.addWidget(root)
+        grid = QtWidgets.QGridLayout(root)
+        grid.setContentsMargins(24, 24, 24, 24)
+        buttons = []
+        for i in range(n_buttons):
+            b = QtWidgets.QToolButton() if i % 3 else QtWidgets.QPushButton()
+            b.setText(f"Кнопка {i}")
+            grid.addWidget(b, i // 5, i % 5)
+            buttons.append(b)
+        w.resize(1280, 720)
+        w.show()
+        for _ in range(5):
+            app.processEvents()
+        return w, buttons
+
+    def sweep(buttons) -> list[float]:
+        times = []
+        prev = None
+        order = buttons + buttons[::-1]
+        for _ in range(sweeps):
+            for b in order:
+                t0 = time.perf_counter()
+                if prev is not None:
+                    app.sendEvent(prev, QtCore.QEvent(QtCore.QEvent.Leave))
+                app.sendEvent(b, QtCore.QEvent(QtCore.QEvent.Enter))
+                app.processEvents()
+                times.append(time.perf_counter() - t0)
+                prev = b
+        return sorted(times)
+
+    def report(name, times):
+        n = len(times)
+        print(f"{name:7s} hops={n}  median={times[n // 2] * 1e3:6.2f} ms  p95={times[int(n * 0.95)] * 1e3:6.2f} ms  "
+              f"max={times[-1] * 1e3:6.2f} ms")
+
+    w, buttons = window()
+    legacy = LegacyGlow()
+    for b in buttons:
+        b.installEventFilter(legacy)
+    report("legacy", sweep(buttons))
+    w.hide()
+
+    w, buttons = window()
+    wb._GLOW_CACHE.clear()
+    glow = wb.HoverGlow(lambda: wb._parse_rgba(wb.THEMES["Ametrine"]["accent"]), lambda: 16)
+    app.installEventFilter(glow)  # as MainWindow installs it
+    report("pooled", sweep(buttons))
+    print(f"        cached glow pixmaps={len(wb._GLOW_CACHE)}  overlay paints={glow.overlay(buttons[0]).paints}")
+    late = QtWidgets.QPushButton("Позже", w)  # created after install: glows too
+    late.show()
+    app.sendEvent(late, QtCore.QEvent(QtCore.QEvent.Enter))
+    assert glow.overlay(late)._target is late
+    w.hide()
+    app.removeEventFilter(glow)
+
+
+def bench_anim(bursts: int = 3, clicks: int = 12, n_binds: int = 2_000):
+    # rapid page switching + table refreshes, then frames until every animation settled
+    from PySide6 import QtWidgets
+    app = _qapp()
+    sched = wb.Anim.scheduler()
+    caps = (sched.MAX_EFFECTS, sched.FRAME_BUDGET_MS)
+    for name, perf, uncapped in (("uncapped", False, True), ("budgeted", False, False), ("perf mode", True, False)):
+        # "uncapped" lifts the effect cap and frame budget: every animation runs, as before the scheduler
+        sched.MAX_EFFECTS, sched.FRAME_BUDGET_MS = (1 << 30, float("inf")) if uncapped else caps
+        mw = _main_window(app, n_binds, performance_mode=perf)
+        pages = [mw.page_ppv, mw.page_mail, mw.page_price, mw.page_binds]
+        sched.started = sched.skipped = sched.merged = 0
+        frames, peak = [], 0
+        t_all = time.perf_counter()
+        for _ in range(bursts):
+            for k in range(clicks):
+                t0 = time.perf_counter()
+                mw.switch_page(pages[k % len(pages)])
+                if pages[k % len(pages)] is mw.page_binds:
+                    mw.page_binds.refresh()
+                app.processEvents()
+                frames.append(time.perf_counter() - t0)
+                peak = max(peak, sched.active())
+            while sched.active():
+                t0 = time.perf_counter()
+                time.sleep(0.004)
+                app.processEvents()
+                frames.append(time.perf_counter() - t0)
+        t_all = time.perf_counter() - t_all
+        for _ in range(5):
+            app.processEvents()
+        left = sum(1 for w in [mw, *mw.findChildren(QtWidgets.QWidget)] if w.graphicsEffect() is not None)
+        frames.sort()
+        n = len(frames)
+        print(f"{name:9s} frames={n:4d}  median={frames[n // 2] * 1e3:6.2f} ms  p95={frames[int(n * 0.95)] * 1e3:6.2f} ms  "
+              f"max={frames[-1] * 1e3:6.2f} ms  total={t_all:5.2f} s")
+        print(f"{'':9s} started={sched.started} merged={sched.merged} skipped={sched.skipped}  "
+              f"peak concurrent={peak}  leftover effects={left}")
+        mw.hide()
+    sched.MAX_EFFECTS, sched.FRAME_BUDGET_MS = caps
+
+
+def bench_retention(n_items: int = 2_000, days: int = 365):
+    import json
+    import tracemalloc
+    db = _make_db(n_items)
+    today = wb.date.today()
+    rnd = random.Random(3)
+    keys = [(today - wb.timedelta(days=d)).isoformat() for d in range(days)]
+    for it in db.items("ppv", "DILDO"):
+        it["uses_by_day"] = {k: rnd.randint(1, 5) for k in keys if rnd.random() < 0.6}
+
+    def measure(label):
+        db.save()
+        db.flush()
+        tracemalloc.start()
+        json.loads(db.path.read_text(encoding="utf-8"))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        buckets = sum(len(it["uses_by_day"]) for it in db.items("ppv", "DILDO"))
+        print(f"{label:7s} file={db.path.stat().st_size / 1024:9.0f} KiB  parsed={peak / 1024:9.0f} KiB  buckets={buckets}")
+
+    measure("before")
+    t0 = time.perf_counter()
+    changed = db.compact_histories()
+    dt = time.perf_counter() - t0
+    measure("after")
+    print(f"compacted {changed} items in {dt * 1e3:.0f} ms")
+    db.close()
+
+
+BENCHES = {
+    "triggers": bench_triggers,
+    "hotkeys": bench_hotkeys,
+    "inject": bench_inject,
+    "clipboard": bench_clipboard,
+    "usage": bench_usage,
+    "backends": bench_backends,
+    "views": bench_views,
+    "retention": bench_retention,
+    "pick": bench_pick,
+    "search": bench_search,
+    "binds": bench_binds,
+    "selection": bench_selection,
+    "content": bench_content,
+    "import": bench_import,
+    "export": bench_export,
+    "paint": bench_paint,
+    "grain": bench_grain,
+    "theme": bench_theme,
+    "glow": bench_glow,
+    "anim": bench_anim,
+}
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHES)
+    for name in names:
+        print(f"== {name} ==")
+        BENCHES[name]()
@@ -18,16 +18,29 @@ def setup_logging():
 # whybinder.py — clean premium build (PySide6) — Windows 10+
 
 import base64
+import bisect
+import codecs
+import csv
+import hashlib
+import heapq
+import io
 import json
 import os
 import logging
 from logging.handlers import RotatingFileHandler
 import random
+import re
+import sqlite3
 import sys
+import threading
 import time
+import zipfile
 import zlib
+from collections import OrderedDict, deque
+from collections.abc import Iterable, Iterator, Sequence
 from dataclasses import dataclass, asdict
-from datetime import datetime, date
+from html import escape as html_escape
+from datetime import datetime, date, timedelta
 from pathlib import Path
 from typing import Any, Optional
 
@@ -42,6 +55,11 @@ try:
 except Exception:
     pyperclip = None
 
+try:
+    import numpy as np  # type: ignore  # bulk grain generation; there's a stdlib fallback
+except Exception:
+    np = None
+
 from PySide6 import QtCore, QtGui, QtWidgets, QtSvg
 
 APP_TITLE_1 = "Whybinder - софт для чатера MATRIX TEAM"
@@ -69,7 +87,9 @@ SETTINGS_FILE = DATA_DIR / "settings.json"
 PROFILES_DIR = DATA_DIR / "profiles"
 PROFILES_DIR.mkdir(parents=True, exist_ok=True)
 CONTENT_DB_FILE = DATA_DIR / "content_bases.json"
+CONTENT_SQLITE_FILE = DATA_DIR / "content_bases.sqlite3"
 PRICE_FALLBACK_FILE = DATA_DIR / "price.txt"
+CACHE_DIR = DATA_DIR / "cache"
 
 DEFAULT_PROFILES = ["Judi", "Eva", "Molly"]
 DEFAULT_BIND_CATEGORY = "Без категории"
@@ -108,7 +128,26 @@ THEMES: dict[str, dict[str, str]] = {
     },
 }
 
+_STYLESHEET_CACHE: dict[tuple[str, str], str] = {}
+
 def app_stylesheet(theme: str, density: str = "comfortable") -> str:
+    key = (str(theme), str(density))
+    css = _STYLESHEET_CACHE.get(key)
+    if css is None:
+        css = _STYLESHEET_CACHE[key] = _build_stylesheet(*key)
+    return css
+
+def apply_stylesheet(theme: str, density: str = "comfortable") -> bool:
+    # the sheet text is memoized and a switch to the current sheet is skipped;
+    # a real switch still costs one full Qt re-polish of every widget
+    app = QtWidgets.QApplication.instance()
+    css = app_stylesheet(theme, density)
+    if app.styleSheet() == css:
+        return False
+    app.setStyleSheet(css)
+    return True
+
+def _build_stylesheet(theme: str, density: str) -> str:
     t = THEMES.get(str(theme), THEMES["Ametrine"])
     accent = t["accent"]
     surface = t["surface"]
@@ -169,7 +208,7 @@ def app_stylesheet(theme: str, density: str = "comfortable") -> str:
         background: rgba(255,90,120,0.36);
     }}
 
-    QLineEdit, QPlainTextEdit, QComboBox, QListWidget, QTableWidget {{
+    QLineEdit, QPlainTextEdit, QComboBox, QListView, QTableView {{
         background: {surface};
         border: 1px solid {field_border};
         border-radius: {max(10, radius - 4)}px;
@@ -177,7 +216,7 @@ def app_stylesheet(theme: str, density: str = "comfortable") -> str:
         selection-background-color: {accent};
     }}
     QAbstractScrollArea::viewport {{ background: {surface}; }}
-    QListWidget::item:hover {{ background: {accent}; border-radius: 8px; }}
+    QListView::item:hover {{ background: {accent}; border-radius: 8px; }}
 
     QHeaderView::section {{
         background: {header_bg};
@@ -210,8 +249,8 @@ def app_stylesheet(theme: str, density: str = "comfortable") -> str:
         background: rgba(0,0,0,0.10);
     }}
     QCheckBox::indicator:checked {{ background: {accent}; }}
-    QTableWidget::item:hover {{ background: {accent}; }}
-    QTableWidget::item:selected {{ background: {accent}; }}
+    QTableView::item:hover {{ background: {accent}; }}
+    QTableView::item:selected {{ background: {accent}; }}
     QWidget#Toast {{
         background: rgba(8, 6, 20, 0.78);
         border: 1px solid rgba(255,255,255,0.20);
@@ -255,24 +294,65 @@ def read_price_text() -> str:
 
 
 
-_GRAIN_CACHE: dict[int, QtGui.QPixmap] = {}
+# Grain tiles: per pixel an alpha in [0, strength) and, at random, white or
+# black, stored as premultiplied RGBA bytes (white: a,a,a,a; black: 0,0,0,a).
+# Tiles are generated in bulk, kept on disk under CACHE_DIR and wrapped into a
+# QImage without a per-pixel pass.
+GRAIN_VERSION = 2
+_GRAIN_CACHE: dict[tuple[int, int], QtGui.QPixmap] = {}
+
+def grain_bytes(strength: int, size: int = 128, rnd: Optional[random.Random] = None) -> bytes:
+    n = size * size
+    strength = max(1, int(strength))
+    if np is not None and rnd is None:
+        g = np.random.default_rng()
+        a = g.integers(0, strength, n, dtype=np.uint8)
+        c = np.where(g.integers(0, 2, n, dtype=np.uint8) == 0, a, 0).astype(np.uint8)
+        return np.stack([c, c, c, a], axis=1).tobytes()
+    # one random byte per pixel, v = byte % 2*strength: bit 0 picks white/black,
+    # v >> 1 the alpha; bytes past the last whole multiple are rejected so every
+    # (colour, alpha) pair is equally likely (alpha tops out at 127 here)
+    m = 2 * min(strength, 128)
+    reject = bytes(range(256 - 256 % m, 256))
+    raw = b""
+    while len(raw) < n:
+        raw += (rnd or random).randbytes(n - len(raw) + n // 8).translate(None, reject)
+    raw = raw[:n]
+    a = raw.translate(bytes((r % m) >> 1 for r in range(256)))
+    c = raw.translate(bytes((r % m) >> 1 if r & 1 else 0 for r in range(256)))
+    out = bytearray(4 * n)
+    out[0::4] = c
+    out[1::4] = c
+    out[2::4] = c
+    out[3::4] = a
+    return bytes(out)
+
+def _grain_file(strength: int, size: int) -> Path:
+    return CACHE_DIR / f"grain_v{GRAIN_VERSION}_{strength}_{size}.rgba"
 
 def _grain_pixmap(strength: int = 16, size: int = 128) -> QtGui.QPixmap:
-    cached = _GRAIN_CACHE.get(strength)
+    cached = _GRAIN_CACHE.get((strength, size))
     if cached:
         return cached
-    img = QtGui.QImage(size, size, QtGui.QImage.Format_ARGB32_Premultiplied)
-    img.fill(QtCore.Qt.transparent)
-    rnd = QtCore.QRandomGenerator.global_()
-    for y in range(size):
-        for x in range(size):
-            a = int(rnd.bounded(strength))
-            if a == 0:
-                continue
-            v = 255 if rnd.bounded(2) == 0 else 0
-            img.setPixelColor(x, y, QtGui.QColor(v, v, v, a))
+    path = _grain_file(strength, size)
+    data = b""
+    try:
+        data = path.read_bytes()
+    except Exception:
+        pass
+    if len(data) != size * size * 4:
+        data = grain_bytes(strength, size)
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(path.name + ".tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except Exception:
+            pass
+    # QImage only borrows data; fromImage() copies it before it goes away
+    img = QtGui.QImage(data, size, size, size * 4, QtGui.QImage.Format_RGBA8888_Premultiplied)
     pm = QtGui.QPixmap.fromImage(img)
-    _GRAIN_CACHE[strength] = pm
+    _GRAIN_CACHE[(strength, size)] = pm
     return pm
 
 def _draw_grain(p: QtGui.QPainter, rect: QtCore.QRect, strength: int = 16, step: int = 3):
@@ -280,9 +360,8 @@ def _draw_grain(p: QtGui.QPainter, rect: QtCore.QRect, strength: int = 16, step:
         pm = _grain_pixmap(strength=strength)
         p.save()
         p.setOpacity(0.22)
-        for y in range(rect.top(), rect.bottom(), pm.height()):
-            for x in range(rect.left(), rect.right(), pm.width()):
-                p.drawPixmap(x, y, pm)
+        p.setBrushOrigin(rect.topLeft())
+        p.fillRect(rect, QtGui.QBrush(pm))  # one tiled fill instead of a drawPixmap per tile
         p.restore()
     except Exception:
         pass
@@ -328,28 +407,129 @@ def icon_svg(name: str) -> QtGui.QIcon:
     p.end()
     return QtGui.QIcon(pix)
 
+GLOW_MARGIN = 12  # px of halo around the button, ~ the old drop shadow's blur radius 24
+_GLOW_CACHE: dict[tuple, QtGui.QPixmap] = {}
+
+def _glow_pixmap(w: int, h: int, radius: int, color: QtGui.QColor, dpr: float = 1.0) -> QtGui.QPixmap:
+    # pre-rendered halo for one button size/colour: nested rounded rects, each
+    # overwriting the wider one with a stronger alpha -> a smooth falloff with
+    # no QGraphicsEffect and no offscreen pass per hover
+    key = (w, h, radius, color.rgba(), round(dpr, 2))
+    pm = _GLOW_CACHE.get(key)
+    if pm is not None:
+        return pm
+    m = GLOW_MARGIN
+    pm = QtGui.QPixmap(max(1, int((w + 2 * m) * dpr)), max(1, int((h + 2 * m) * dpr)))
+    pm.setDevicePixelRatio(dpr)
+    pm.fill(QtCore.Qt.transparent)
+    p = QtGui.QPainter(pm)
+    p.setRenderHint(QtGui.QPainter.Antialiasing, True)
+    p.setCompositionMode(QtGui.QPainter.CompositionMode_Source)
+    p.setPen(QtCore.Qt.NoPen)
+    c = QtGui.QColor(color)
+    a = color.alpha()
+    for i in range(m, -1, -1):
+        c.setAlpha(int(a * (1.0 - i / (m + 1)) ** 2))
+        p.setBrush(c)
+        r = radius + i
+        p.drawRoundedRect(QtCore.QRectF(m - i, m - i, w + 2 * i, h + 2 * i), r, r)
+    p.end()
+    if len(_GLOW_CACHE) > 256:
+        _GLOW_CACHE.clear()
+    _GLOW_CACHE[key] = pm
+    return pm
+
+class GlowOverlay(QtWidgets.QWidget):
+    # one per window: paints the halo of the hovered button around (not over) it
+    def __init__(self, parent: QtWidgets.QWidget, color_getter, radius_getter):
+        super().__init__(parent)
+        self.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents, True)
+        self.setAttribute(QtCore.Qt.WA_NoSystemBackground, True)
+        self._color_getter = color_getter
+        self._radius_getter = radius_getter
+        self._target: Optional[QtWidgets.QWidget] = None
+        self._rect = QtCore.QRect()
+        self.paints = 0
+
+    def _glow_rect(self, w: QtWidgets.QWidget) -> QtCore.QRect:
+        m = GLOW_MARGIN
+        top_left = w.mapTo(self.parentWidget(), QtCore.QPoint(0, 0))
+        return QtCore.QRect(top_left, w.size()).adjusted(-m, -m, m, m)
+
+    def set_target(self, w: Optional[QtWidgets.QWidget]):
+        old = self._rect
+        self._target = w
+        self._rect = self._glow_rect(w) if w is not None else QtCore.QRect()
+        if w is not None:
+            host = self.parentWidget()
+            if self.geometry() != host.rect():
+                self.setGeometry(host.rect())
+            self.raise_()
+            self.show()
+        if not old.isNull():
+            self.update(old)
+        if not self._rect.isNull():
+            self.update(self._rect)
+
+    def paintEvent(self, e):
+        w = self._target
+        if w is None:
+            return
+        try:
+            if not w.isVisible():
+                return
+            self.paints += 1
+            rect = self._glow_rect(w)
+            radius = min(w.height() // 2, int(self._radius_getter()))
+            pm = _glow_pixmap(w.width(), w.height(), radius, self._color_getter(), self.devicePixelRatioF())
+            p = QtGui.QPainter(self)
+            # leave the button itself untouched, like the drop shadow behind it did
+            clip = QtGui.QPainterPath()
+            clip.addRect(QtCore.QRectF(rect))
+            button = QtGui.QPainterPath()
+            button.addRoundedRect(QtCore.QRectF(rect.adjusted(GLOW_MARGIN, GLOW_MARGIN, -GLOW_MARGIN, -GLOW_MARGIN)), radius, radius)
+            p.setClipPath(clip.subtracted(button))
+            p.drawPixmap(rect.topLeft(), pm)
+            p.end()
+        except Exception:
+            pass
+
 class HoverGlow(QtCore.QObject):
-    def __init__(self, color_getter):
+    # installed on the QApplication, so buttons created later glow too;
+    # one overlay per window, cached halo pixmaps
+    def __init__(self, color_getter, radius_getter=lambda: 14):
         super().__init__()
         self._color_getter = color_getter
+        self._radius_getter = radius_getter
+        self._overlays: dict[int, GlowOverlay] = {}
+
+    def overlay(self, w: QtWidgets.QWidget) -> GlowOverlay:
+        host = w.window()
+        ov = self._overlays.get(id(host))
+        if ov is None:
+            ov = GlowOverlay(host, self._color_getter, self._radius_getter)
+            self._overlays[id(host)] = ov
+            host.destroyed.connect(lambda *_a, k=id(host): self._overlays.pop(k, None))
+        return ov
 
     def eventFilter(self, obj, event):
-        if isinstance(obj, (QtWidgets.QPushButton, QtWidgets.QToolButton)):
-            if event.type() == QtCore.QEvent.Enter:
+        # sees every event of the app: test the type before anything else
+        et = event.type()
+        if et == QtCore.QEvent.Enter:
+            if isinstance(obj, (QtWidgets.QPushButton, QtWidgets.QToolButton)):
                 try:
-                    eff = QtWidgets.QGraphicsDropShadowEffect(obj)
-                    eff.setBlurRadius(24)
-                    eff.setOffset(0, 0)
-                    eff.setColor(self._color_getter())
-                    obj.setGraphicsEffect(eff)
+                    self.overlay(obj).set_target(obj)
                 except Exception:
                     pass
-            elif event.type() == QtCore.QEvent.Leave:
+        elif et in (QtCore.QEvent.Leave, QtCore.QEvent.Hide):
+            if isinstance(obj, (QtWidgets.QPushButton, QtWidgets.QToolButton)):
                 try:
-                    obj.setGraphicsEffect(None)
+                    ov = self._overlays.get(id(obj.window()))
+                    if ov is not None and ov._target is obj:
+                        ov.set_target(None)
                 except Exception:
                     pass
-        return super().eventFilter(obj, event)
+        return False
 
 
 # ---------- Utils ----------
@@ -361,10 +541,25 @@ def safe_read_json(path: Path, default: Any) -> Any:
     except Exception:
         return default
 
+def atomic_write_text(path: Path, text: str) -> None:
+    # temp file + fsync + rename: readers see the old or the new file, never a torn one
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    if os.name == "posix":
+        fd = os.open(path.parent, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
 def safe_write_json(path: Path, obj: Any) -> None:
     try:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8")
+        atomic_write_text(path, json.dumps(obj, ensure_ascii=False, indent=2))
     except Exception:
         pass
 
@@ -472,10 +667,512 @@ def save_profile(name: str, cats: list[str], binds: list[Bind]):
     safe_write_json(d/"binds.json", [asdict(b) for b in binds])
 
 # ---------- Content DB ----------
+# Streaming import. Files are read in IMPORT_CHUNK pieces and turned into
+# (text, hint) pairs one at a time, so memory stays flat however big the file:
+#   .json         export payload {"items": [...]} or a bare array, decoded element by element
+#   .jsonl/.ndjson one string or {"text", "hint"} object per line
+#   .csv          "text"/"hint" header columns, or text[, hint] without a header
+#   anything else one text per non-empty line
+IMPORT_CHUNK = 1 << 16
+IMPORT_BATCH = 5_000    # new items per add_many() call; an import never holds more than a few of these
+IMPORT_INFLIGHT = 2     # batches an ImportTask may have waiting for the GUI thread
+IMPORT_FORMATS = {".json": "json", ".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv", ".txt": "txt"}
+_JSON_WS = re.compile(r"[ \t\r\n]*")
+_JSON_SCALAR = re.compile(r"[^,\]}\s]*")
+
+def _import_pair(x: Any) -> Optional[tuple[str, str]]:
+    if isinstance(x, dict) and str(x.get("text") or "").strip():
+        return str(x["text"]), str(x.get("hint") or "")
+    if isinstance(x, str) and x.strip():
+        return x.strip(), ""
+    return None
+
+def _json_stream(f, on_read) -> Iterator[Any]:
+    dec = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8-sig")()
+    buf, pos, eof = "", 0, False
+
+    def more() -> bool:
+        nonlocal buf, pos, eof
+        if eof:
+            return False
+        raw = f.read(IMPORT_CHUNK)
+        on_read(len(raw))
+        eof = not raw
+        buf = buf[pos:] + utf8.decode(raw, final=eof)
+        pos = 0
+        return True
+
+    def peek() -> str:
+        nonlocal pos
+        while True:
+            pos = _JSON_WS.match(buf, pos).end()
+            if pos < len(buf):
+                return buf[pos]
+            if not more():
+                return ""
+
+    def value() -> Any:
+        nonlocal pos
+        c = peek()
+        if c and c not in '"[{':
+            # bare numbers/literals aren't self-delimiting ("1." decodes as 1): buffer the whole token
+            while _JSON_SCALAR.match(buf, pos).end() == len(buf) and more():
+                pass
+        while True:
+            try:
+                v, end = dec.raw_decode(buf, pos)
+            except ValueError:
+                if more():
+                    continue  # element cut by the chunk boundary
+                raise
+            pos = end
+            return v
+
+    def array() -> Iterator[Any]:
+        nonlocal pos
+        pos += 1
+        while True:
+            c = peek()
+            if c == "]":
+                pos += 1
+                return
+            if not c:
+                raise ValueError("unterminated JSON array")
+            if c == ",":
+                pos += 1
+                continue
+            yield value()
+
+    c = peek()
+    if c == "[":
+        yield from array()
+    elif c == "{":
+        pos += 1
+        while True:
+            c = peek()
+            if c == "}" or not c:
+                return
+            if c == ",":
+                pos += 1
+                continue
+            key = value()
+            if peek() != ":":
+                raise ValueError("malformed JSON object")
+            pos += 1
+            if key == "items" and peek() == "[":
+                yield from array()
+            else:
+                value()  # version, area, ... — small, skip
+    else:
+        raise ValueError("expected a JSON array or object")
+
+def _line_stream(f, on_read) -> Iterator[str]:
+    first = True
+    for raw in f:
+        on_read(len(raw))
+        line = raw.decode("utf-8", "replace")
+        if first:
+            line, first = line.lstrip("\ufeff"), False
+        yield line
+
+def _count(counts: Optional[dict], key: str):
+    if counts is not None:
+        counts[key] = counts.get(key, 0) + 1
+
+def _jsonl_stream(lines: Iterator[str], counts: Optional[dict]) -> Iterator[Any]:
+    # one record per line; a malformed line is counted ("bad") and skipped, not fatal
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            _count(counts, "bad")
+
+def _csv_stream(lines: Iterator[str]) -> Iterator[Any]:
+    rows = csv.reader(lines)
+    head = next(rows, None)
+    if head is None:
+        return
+    names = [h.strip().lower() for h in head]
+    ti = next((i for i, h in enumerate(names) if h in ("text", "текст")), None)
+    hi = next((i for i, h in enumerate(names) if h in ("hint", "подсказка")), None)
+    if ti is None:
+        ti, hi = 0, 1  # no header: the first row is data
+        yield {"text": head[0] if head else "", "hint": head[1] if len(head) > 1 else ""}
+    for r in rows:
+        if len(r) > ti:
+            yield {"text": r[ti], "hint": r[hi] if hi is not None and len(r) > hi else ""}
+
+def iter_import(path: Path, fmt: Optional[str] = None, progress=None,
+                counts: Optional[dict] = None) -> Iterator[tuple[str, str]]:
+    # progress(bytes_read, total_bytes) is called from the reading thread;
+    # counts["bad"] gets the malformed or text-less records that were skipped
+    fmt = fmt or IMPORT_FORMATS.get(path.suffix.lower(), "txt")
+    total = max(1, path.stat().st_size)
+    done = 0
+
+    def on_read(n: int):
+        nonlocal done
+        done += n
+        if progress is not None:
+            progress(min(done, total), total)
+
+    with open(path, "rb") as f:
+        if fmt == "json":
+            src: Iterable[Any] = _json_stream(f, on_read)
+        elif fmt == "csv":
+            src = _csv_stream(_line_stream(f, on_read))
+        elif fmt == "jsonl":
+            src = _jsonl_stream(_line_stream(f, on_read), counts)
+        else:
+            src = _line_stream(f, on_read)
+        for x in src:
+            p = _import_pair(x)
+            if p is not None:
+                yield p
+            elif not isinstance(x, str):  # blank lines aren't errors
+                _count(counts, "bad")
+
+def text_key(text: str) -> bytes:
+    # dedupe key: texts that differ only in case or whitespace are the same text
+    return hashlib.blake2b(" ".join(text.split()).casefold().encode("utf-8"), digest_size=8).digest()
+
+def dedupe_import(pairs: Iterable[tuple[str, str]], known: set[bytes], mk, counts: Optional[dict] = None,
+                  batch: int = IMPORT_BATCH) -> Iterator[list[tuple[bytes, dict]]]:
+    # (key, new item) for every pair whose text isn't in known (which is extended), in
+    # lists of up to batch items; only the key set grows with the file. counts["dup"]
+    # gets the skipped repeats
+    fresh: list[tuple[bytes, dict]] = []
+    now = utcnow()  # one import, one created_at
+    for text, hint in pairs:
+        k = text_key(text)
+        if k in known:
+            _count(counts, "dup")
+            continue
+        known.add(k)
+        fresh.append((k, mk(text, hint, now)))
+        if len(fresh) >= batch:
+            yield fresh
+            fresh = []
+    if fresh:
+        yield fresh
+
+# Streaming export: items are serialized one at a time straight into the
+# file, so an export never holds a second copy of the category in memory.
+# Archives are zip files with one .jsonl per category plus manifest.json.
+ARCHIVE_MANIFEST = "manifest.json"
+_EXPORT_ENC = json.JSONEncoder(ensure_ascii=False)  # json.dumps(ensure_ascii=False) builds one per call
+
+def export_meta(area: str, cat: str) -> dict:
+    return {"version": 1, "area": area, "category": cat, "exported_at": utcnow()}
+
+def write_export(f, rows: Iterable[tuple[str, str]], fmt: str = "json", meta: Optional[dict] = None,
+                 progress=None) -> int:
+    # json: the export payload ({meta..., "items": [...]}), readable by iter_import; jsonl: one item per line
+    n = 0
+    if fmt == "json":
+        f.write("{")
+        for k, v in (meta or {}).items():
+            f.write(f"{json.dumps(k)}: {json.dumps(v, ensure_ascii=False)}, ")
+        f.write('"items": [')
+    enc = _EXPORT_ENC.encode
+    for text, hint in rows:
+        rec = enc({"text": text, "hint": hint})
+        if fmt == "json":
+            f.write((",\n  " if n else "\n  ") + rec)
+        else:
+            f.write(rec + "\n")
+        n += 1
+        if progress is not None:
+            progress()
+    if fmt == "json":
+        f.write("\n]}\n")
+    return n
+
+_UNSAFE_NAME = re.compile(r'[\\/:*?"<>|]')
+
+def archive_name(area: str, cat: str) -> str:
+    return f"{area}/{_UNSAFE_NAME.sub('_', cat)}.jsonl"
+
+# uses_by_day retention: daily buckets for HISTORY_DAILY_DAYS, then ISO weeks
+# ("2026-W07") for HISTORY_WEEKLY_WEEKS, then months ("2025-03").
+HISTORY_DAILY_DAYS = 60
+HISTORY_WEEKLY_WEEKS = 52
+
+def history_bucket(key: str, today: date, daily_days: int = HISTORY_DAILY_DAYS,
+                   weekly_weeks: int = HISTORY_WEEKLY_WEEKS) -> str:
+    try:
+        if len(key) == 10:
+            d = date.fromisoformat(key)
+        elif len(key) == 8 and key[5] == "W":
+            d = date.fromisocalendar(int(key[:4]), int(key[6:]), 7)  # age a week by its last day
+        else:
+            return key  # month bucket or unknown
+    except ValueError:
+        return key
+    age = (today - d).days
+    if age < daily_days:
+        return key
+    if age < daily_days + 7 * weekly_weeks:
+        y, w, _ = d.isocalendar()
+        return f"{y}-W{w:02d}"
+    return d.strftime("%Y-%m")
+
+def compact_history(by: dict, today: date, memo: Optional[dict] = None) -> Optional[dict]:
+    # rolled-up copy of a uses_by_day dict, or None when nothing needs to move
+    out: dict[str, int] = {}
+    moved = False
+    for k, n in by.items():
+        if memo is None:
+            b = history_bucket(k, today)
+        else:
+            b = memo.get(k)
+            if b is None:
+                b = memo[k] = history_bucket(k, today)
+        moved = moved or b != k
+        out[b] = out.get(b, 0) + int(n or 0)
+    return out if moved else None
+
+# ---------- Random pick ----------
+# pick_random no longer filters + random.choice per click: the picker keeps
+# per-category state keyed by the DB generation and advances it in place on
+# mark_used, so a pick is O(1) (deck/uniform) or O(log n) (lru/weighted).
+#   deck      shuffled deck, reshuffled on exhaustion; no repeats within a pass
+#   lru       least recently handed out / used first (lazy min-heap)
+#   weighted  P ~ 1 / (1 + uses_total), sampled from a Fenwick tree
+#   uniform   plain random, just never the same item twice in a row
+PICK_MODES = {"deck": "Колода (без повторов)", "lru": "Давно не использованные",
+              "weighted": "Реже использованные чаще", "uniform": "Случайно"}
+
+class Fenwick:
+    # prefix sums over non-negative weights; set() and sample() are O(log n)
+    __slots__ = ("w", "tree", "total", "_top")
+
+    def __init__(self, weights: list[float]):
+        n = len(weights)
+        self.w = list(weights)
+        tree = [0.0] * (n + 1)
+        for i, x in enumerate(self.w, 1):
+            tree[i] += x
+            j = i + (i & -i)
+            if j <= n:
+                tree[j] += tree[i]
+        self.tree = tree
+        self.total = float(sum(self.w))
+        self._top = 1 << max(0, n.bit_length() - 1) if n else 0
+
+    def __len__(self) -> int:
+        return len(self.w)
+
+    def set(self, i: int, x: float):
+        d = x - self.w[i]
+        if not d:
+            return
+        self.w[i] = x
+        self.total += d
+        i += 1
+        n = len(self.w)
+        while i <= n:
+            self.tree[i] += d
+            i += i & -i
+
+    def find(self, u: float) -> int:
+        # smallest index whose inclusive prefix sum exceeds u
+        pos, bit, n = 0, self._top, len(self.w)
+        while bit:
+            nxt = pos + bit
+            if nxt <= n and self.tree[nxt] <= u:
+                pos = nxt
+                u -= self.tree[nxt]
+            bit >>= 1
+        return min(pos, n - 1)
+
+    def sample(self, rng: random.Random) -> int:
+        return self.find(rng.random() * self.total)
+
+class ContentPicker:
+    # rows_fn() -> [(id, uses_total, last_used), ...] in item order; only called
+    # when a category's generation moved for a reason other than mark_used.
+    def __init__(self, mode: str = "deck", seed=None):
+        self.mode = mode if mode in PICK_MODES else "deck"
+        self.rng = random.Random(seed)
+        self._states: dict[tuple[str, str], dict] = {}
+        self.rebuilds = 0
+
+    def seed(self, seed):
+        self.rng.seed(seed)
+        self._states.clear()
+
+    def set_mode(self, mode: str):
+        if mode in PICK_MODES and mode != self.mode:
+            self.mode = mode
+            self._states.clear()
+
+    def _state(self, key, gen: int, rows_fn) -> dict:
+        st = self._states.get(key)
+        if st is None or st["gen"] != gen or st["mode"] != self.mode:
+            rows = rows_fn()
+            st = {"gen": gen, "mode": self.mode, "ids": [r[0] for r in rows], "last": -1}
+            st["pos"] = {iid: i for i, iid in enumerate(st["ids"])}
+            if self.mode == "lru":
+                # never-used first, then oldest last_used; ties broken randomly
+                order = sorted(range(len(rows)), key=lambda i: (rows[i][2] or "", self.rng.random()))
+                st["stamp"] = [0] * len(rows)
+                for clock, i in enumerate(order, 1):
+                    st["stamp"][i] = clock
+                st["clock"] = len(rows)
+                st["heap"] = [(st["stamp"][i], i) for i in range(len(rows))]
+                heapq.heapify(st["heap"])
+            elif self.mode == "weighted":
+                st["tree"] = Fenwick([1.0 / (1 + int(r[1] or 0)) for r in rows])
+            elif self.mode == "deck":
+                st["deck"] = []
+            self._states[key] = st
+            self.rebuilds += 1
+        return st
+
+    def note_used(self, key, gen_before: int, gen_after: int, item_id: str, uses_total: int):
+        # advance a still-valid state past one mark_used instead of rebuilding it
+        st = self._states.get(key)
+        if st is None:
+            return
+        if st["gen"] != gen_before:
+            self._states.pop(key, None)
+            return
+        st["gen"] = gen_after
+        i = st["pos"].get(item_id)
+        if i is None:
+            return
+        if st["mode"] == "lru":
+            self._bump(st, i)
+        elif st["mode"] == "weighted":
+            st["tree"].set(i, 1.0 / (1 + int(uses_total or 0)))
+
+    def _bump(self, st: dict, i: int):
+        st["clock"] += 1
+        st["stamp"][i] = st["clock"]
+        heapq.heappush(st["heap"], (st["clock"], i))
+
+    def pick(self, key, gen: int, rows_fn, used: Optional[set] = None) -> Optional[str]:
+        st = self._state(key, gen, rows_fn)
+        ids = st["ids"]
+        n = len(ids)
+        if not n:
+            return None
+        if used is not None and len(used) >= n:
+            used = None  # everything was used today: fall back to the whole category
+        mode = st["mode"]
+        if mode == "deck":
+            i = self._pick_deck(st, used)
+        elif mode == "lru":
+            i = self._pick_lru(st, used)
+        else:
+            sample = st["tree"].sample if mode == "weighted" else (lambda rng: rng.randrange(n))
+            i = -1
+            for _ in range(16):
+                j = sample(self.rng)
+                if (used is None or ids[j] not in used) and (j != st["last"] or n == 1):
+                    i = j
+                    break
+            if i < 0:
+                pool = [j for j in range(n) if used is None or ids[j] not in used] or list(range(n))
+                i = self.rng.choice(pool)
+        st["last"] = i
+        return ids[i]
+
+    def _pick_deck(self, st: dict, used: Optional[set]) -> int:
+        ids, deck = st["ids"], st["deck"]
+        for _ in range(2):
+            while deck:
+                i = deck.pop()
+                if used is None or ids[i] not in used:
+                    return i
+            deck.extend(range(len(ids)))
+            self.rng.shuffle(deck)
+            if len(deck) > 1 and deck[-1] == st["last"]:
+                deck[0], deck[-1] = deck[-1], deck[0]  # no repeat across the reshuffle
+        return st["last"] if st["last"] >= 0 else 0
+
+    def _pick_lru(self, st: dict, used: Optional[set]) -> int:
+        ids, heap, stamp = st["ids"], st["heap"], st["stamp"]
+        skipped = []
+        i = -1
+        while heap:
+            s, j = heapq.heappop(heap)
+            if s != stamp[j]:
+                continue  # stale entry
+            if used is not None and ids[j] in used:
+                skipped.append((s, j))
+                continue
+            i = j
+            break
+        for e in skipped:
+            heapq.heappush(heap, e)
+        if i < 0:
+            i = skipped[0][1] if skipped else 0
+        self._bump(st, i)
+        return i
+
+class ItemsView(Sequence):
+    # Read-only window onto a category's live item list; no copy is made.
+    # Slicing returns a plain list. Pair with ContentDB.generation() to cache.
+    __slots__ = ("_items",)
+
+    def __init__(self, items: list):
+        self._items = items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, i):
+        return self._items[i]
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __repr__(self) -> str:
+        return f"ItemsView({len(self._items)} items)"
+
+_EMPTY_ITEMS = ItemsView([])
+
 class ContentDB:
-    def __init__(self, path: Path):
+    # Write-behind: mutations call save(), which only marks the DB dirty; a
+    # timer thread coalesces them into one atomic write after flush_delay.
+    # flush()/close() force the write (MainWindow.closeEvent calls close()).
+    # Usage events (mark_used) skip the rewrite entirely: each one is appended
+    # to <db>.usage.jsonl as [seq, ts, copy, area, cat, id]; the journal is
+    # replayed on load and truncated whenever a flush has folded it into the
+    # main file (data["usage_seq"] marks the last event already folded in).
+    def __init__(self, path: Path, flush_delay: float = 2.0, compact_every: int = 2000, read_only: bool = False):
         self.path = path
+        self.read_only = read_only          # a migration source: never written, not even by load-time compaction
         self.data = self._migrate(safe_read_json(path, None))
+        self.flush_delay = flush_delay
+        self.compact_every = compact_every
+        self._lock = threading.RLock()      # guards self.data against the flush thread
+        self._io_lock = threading.Lock()    # one writer at a time, in order
+        self._dirty = False
+        self._timer: Optional[threading.Timer] = None
+        self._holds = 0                     # hold_saves() depth: save() only marks dirty meanwhile
+        self.flushes = 0
+        self.journal_path = path.with_name(path.stem + ".usage.jsonl")
+        self._journal = None
+        self._journal_events = 0
+        self._usage_seq = int(self.data.get("usage_seq") or 0)
+        self._index: dict[str, tuple[str, str, int]] = {}  # id -> (area, cat, position)
+        self._gens: dict[tuple[str, str], int] = {}          # bumped on every change to a category
+        self._text_gens: dict[tuple[str, str], int] = {}     # same, minus usage-only changes
+        self._gen = 0
+        self._aggs: dict[tuple[str, str], dict] = {}          # per-category day aggregates, built lazily
+        self._agg_day = ""
+        self._keys: dict[tuple[str, str], tuple[int, set[bytes]]] = {}  # text_key sets, by text generation
+        self.picker = ContentPicker()
+        self._reindex()
+        self._replay_journal()
+        if not read_only:
+            self.compact_histories()
 
     def _default(self):
         return {
@@ -484,12 +1181,12 @@ class ContentDB:
             "mailing": {k: {"items": []} for k in ["SEXY","LIFESTYLE","GOVIP"]},
         }
 
-    def _mk(self, text: str, hint: str="") -> dict:
+    def _mk(self, text: str, hint: str="", now: Optional[str] = None) -> dict:
         return {
-            "id": f"t_{abs(hash((text, hint, time.time()))) % (10**12)}",
+            "id": f"t_{os.urandom(8).hex()}",
             "text": text.strip(),
             "hint": (hint or "").strip(),
-            "created_at": utcnow(),
+            "created_at": now or utcnow(),
             "uses_total": 0,
             "uses_by_day": {},
             "last_used": None,
@@ -511,92 +1208,754 @@ class ContentDB:
         return obj
 
     def save(self):
-        safe_write_json(self.path, self.data)
+        if self.read_only:
+            return
+        with self._lock:
+            self._dirty = True
+            if self._timer is None and not self._holds:
+                self._timer = threading.Timer(self.flush_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def hold_saves(self):
+        # a long batch of changes (an import): no timed flush until release_saves()
+        with self._lock:
+            self._holds += 1
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def release_saves(self):
+        with self._lock:
+            self._holds = max(0, self._holds - 1)
+            if not self._holds and self._dirty:
+                self.save()
+
+    def flush(self):
+        with self._io_lock:
+            with self._lock:
+                timer, self._timer = self._timer, None
+                if timer is not None and timer is not threading.current_thread():
+                    timer.cancel()
+                if not self._dirty:
+                    return
+                seq = self.data["usage_seq"] = self._usage_seq
+                # no indent: the C encoder keeps the lock held for milliseconds, not seconds
+                raw = json.dumps(self.data, ensure_ascii=False, separators=(",", ":"))
+                self._dirty = False
+            try:
+                atomic_write_text(self.path, raw)
+                self.flushes += 1
+            except Exception:
+                logging.exception("ContentDB flush failed")
+                with self._lock:
+                    self._dirty = True
+                return
+            with self._lock:
+                # events appended while writing stay; lines <= usage_seq are skipped on replay
+                if self._usage_seq == seq and (self._journal_events or self._journal_size()):
+                    self._truncate_journal()
+
+    def compact(self) -> int:
+        # fold the usage journal into the main file and truncate it; returns the events folded
+        if self.read_only:
+            return 0
+        with self._lock:
+            n = self._journal_events
+            if n or self.journal_path.exists():
+                self._dirty = True
+        self.flush()
+        if n:
+            logging.info("Usage journal compacted: %d events folded into %s", n, self.path)
+        return n
+
+    def close(self):
+        self.compact()
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+    def _replay_journal(self):
+        if not self.journal_path.exists():
+            return
+        folded = int(self.data.get("usage_seq") or 0)
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        seq, ts, copy, area, cat, item_id = json.loads(line)
+                    except Exception:
+                        continue  # torn tail after a crash
+                    if seq <= folded:
+                        continue
+                    it = self.get(item_id)
+                    if it is not None:
+                        self._apply_use(it, ts, bool(copy))
+                    self._usage_seq = max(self._usage_seq, seq)
+                    self._journal_events += 1
+        except Exception:
+            logging.exception("Usage journal replay failed")
+
+    def _append_usage(self, rec: list):
+        try:
+            if self._journal is None:
+                self._journal = open(self.journal_path, "a", encoding="utf-8")
+                if self._journal.tell() and not self._ends_with_newline():
+                    self._journal.write("\n")  # a torn tail must not swallow this record
+            self._journal.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n")
+            self._journal.flush()
+            self._journal_events += 1
+        except Exception:
+            logging.exception("Usage journal append failed")
+            self.save()  # fall back to a full write so the event isn't lost
+            return
+        if self._journal_events >= self.compact_every:
+            self.save()
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.journal_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _journal_size(self) -> int:
+        # lines already folded in (replayed and skipped) still count as content to drop
+        try:
+            return self.journal_path.stat().st_size
+        except OSError:
+            return 0
+
+    def _truncate_journal(self):
+        try:
+            if self._journal is not None:
+                self._journal.close()
+            self._journal = open(self.journal_path, "w", encoding="utf-8")
+            self._journal_events = 0
+        except Exception:
+            self._journal = None
+
+    def _reindex(self):
+        self._index.clear()
+        fixed = False
+        for area, cats in self.data.items():
+            if not isinstance(cats, dict):
+                continue
+            for cat, c in cats.items():
+                for pos, it in enumerate(c.get("items", [])):
+                    if not isinstance(it, dict):
+                        continue
+                    if not it.get("id") or it["id"] in self._index:
+                        it["id"] = self._mk("", "")["id"]  # legacy hash ids could collide
+                        fixed = True
+                    self._index[it["id"]] = (area, cat, pos)
+        if fixed:
+            self.save()  # persist new ids before journal events are recorded against them
+
+    def compact_histories(self) -> int:
+        # apply the retention policy to every item; returns how many were rewritten
+        today = date.today()
+        cutoff = (today - timedelta(days=HISTORY_DAILY_DAYS)).isoformat()
+        changed = keys_before = keys_after = 0
+        memo: dict[str, str] = {}  # items share the same few hundred day keys
+        with self._lock:
+            for loc in self._index.values():
+                it = self.data[loc[0]][loc[1]]["items"][loc[2]]
+                by = it.get("uses_by_day")
+                # keys sort as strings; anything >= cutoff is a recent daily bucket
+                if not isinstance(by, dict) or not by or min(by) >= cutoff:
+                    continue
+                new = compact_history(by, today, memo)
+                if new is not None:
+                    keys_before += len(by)
+                    keys_after += len(new)
+                    it["uses_by_day"] = new
+                    changed += 1
+            if changed:
+                logging.info("Usage history compacted: %d items, %d -> %d buckets", changed, keys_before, keys_after)
+                self.save()
+        return changed
+
+    def locate(self, item_id: str) -> Optional[tuple[str, str, int]]:
+        return self._index.get(item_id)
+
+    def get(self, item_id: str) -> Optional[dict]:
+        loc = self._index.get(item_id)
+        if loc is None:
+            return None
+        area, cat, pos = loc
+        return self.data[area][cat]["items"][pos]
+
+    def _get_in(self, area: str, cat: str, item_id: str) -> Optional[dict]:
+        loc = self._index.get(item_id)
+        if loc is None or loc[0] != area or loc[1] != cat:
+            return None
+        return self.data[area][cat]["items"][loc[2]]
+
+    def _touch(self, area: str, cat: str, usage: bool = False):
+        self._gen += 1
+        self._gens[(area, cat)] = self._gen
+        if not usage:
+            self._text_gens[(area, cat)] = self._gen
+
+    def generation(self, area: Optional[str] = None, cat: Optional[str] = None, texts: bool = False) -> int:
+        # monotonic change counter for one category, or for the whole DB when called bare;
+        # texts=True ignores mark_used and only moves when items are added/edited/removed
+        if area is None:
+            return self._gen
+        return (self._text_gens if texts else self._gens).get((area, cat), 0)
 
     def categories(self, area: str) -> list[str]:
         return list(self.data.get(area, {}).keys())
 
-    def items(self, area: str, cat: str) -> list[dict]:
-        return list(self.data.get(area, {}).get(cat, {}).get("items", []))
+    def items(self, area: str, cat: str) -> ItemsView:
+        arr = self.data.get(area, {}).get(cat, {}).get("items")
+        return ItemsView(arr) if arr is not None else _EMPTY_ITEMS
+
+    def _append(self, area: str, cat: str, it: dict):
+        arr = self.data.setdefault(area, {}).setdefault(cat, {"items": []})["items"]
+        self._index[it["id"]] = (area, cat, len(arr))
+        arr.append(it)
+        self._touch(area, cat)
 
     def add(self, area: str, cat: str, text: str, hint: str=""):
-        self.data.setdefault(area, {}).setdefault(cat, {"items": []})
-        it = self._mk(text, hint)
-        self.data[area][cat]["items"].append(it)
-        self.save()
+        with self._lock:
+            self._append(area, cat, self._mk(text, hint))
+            self.save()
 
     def update(self, area: str, cat: str, item_id: str, text: str, hint: str=""):
-        arr = self.data.get(area, {}).get(cat, {}).get("items", [])
-        for it in arr:
-            if it.get("id") == item_id:
-                it["text"] = text.strip()
-                it["hint"] = (hint or "").strip()
-                self.save()
-                return
-        raise KeyError(item_id)
+        with self._lock:
+            it = self._get_in(area, cat, item_id)
+            if it is None:
+                raise KeyError(item_id)
+            it["text"] = text.strip()
+            it["hint"] = (hint or "").strip()
+            self._touch(area, cat)
+            self.save()
 
     def delete(self, area: str, cat: str, item_id: str):
-        arr = self.data.get(area, {}).get(cat, {}).get("items", [])
-        n = len(arr)
-        arr[:] = [it for it in arr if it.get("id") != item_id]
-        if len(arr) == n:
-            raise KeyError(item_id)
-        self.save()
+        with self._lock:
+            if self._get_in(area, cat, item_id) is None:
+                raise KeyError(item_id)
+            _, _, pos = self._index.pop(item_id)
+            arr = self.data[area][cat]["items"]
+            a = self._aggs.get((area, cat))
+            if a is not None:
+                gone = arr[pos]
+                if item_id in a["used_today"]:
+                    a["used_today"].discard(item_id)
+                    a["uses_today"] -= int((gone.get("uses_by_day") or {}).get(self._agg_day) or 0)
+                a["copies"] -= int(gone.get("copies_total") or 0)
+            del arr[pos]
+            for i in range(pos, len(arr)):
+                self._index[arr[i]["id"]] = (area, cat, i)
+            self._touch(area, cat)
+            self.save()
+
+    def _apply_use(self, it: dict, ts: str, as_copy: bool):
+        if as_copy:
+            it["copies_total"] = int(it.get("copies_total") or 0) + 1
+        it["uses_total"] = int(it.get("uses_total") or 0) + 1
+        by = it.get("uses_by_day")
+        if not isinstance(by, dict):
+            by = {}
+            it["uses_by_day"] = by
+        tk = ts[:10]
+        by[tk] = int(by.get(tk) or 0) + 1
+        it["last_used"] = ts
+
+    def _agg(self, area: str, cat: str) -> dict:
+        # used_today (ids), uses_today and copies for one category; one scan per category
+        # per process, then maintained by mark_used/delete and reset when the day rolls over
+        tk = today_key()
+        if tk != self._agg_day:
+            self._agg_day = tk
+            for a in self._aggs.values():
+                a["used_today"] = set()
+                a["uses_today"] = 0
+        a = self._aggs.get((area, cat))
+        if a is None:
+            used: set[str] = set()
+            uses_today = copies = 0
+            for it in self.items(area, cat):
+                n = int((it.get("uses_by_day") or {}).get(tk) or 0)
+                if n:
+                    used.add(it["id"])
+                    uses_today += n
+                copies += int(it.get("copies_total") or 0)
+            a = self._aggs[(area, cat)] = {"used_today": used, "uses_today": uses_today, "copies": copies}
+        return a
+
+    def used_today_ids(self, area: str, cat: str) -> set[str]:
+        return self._agg(area, cat)["used_today"]
+
+    def day_stats(self, area: str, cat: str) -> dict:
+        a = self._agg(area, cat)
+        return {"total": len(self.items(area, cat)), "used_today": len(a["used_today"]),
+                "uses_today": a["uses_today"], "copies": a["copies"]}
 
     def mark_used(self, area: str, cat: str, item_id: str, as_copy: bool):
-        tk = today_key()
-        arr = self.data.get(area, {}).get(cat, {}).get("items", [])
-        for it in arr:
-            if it.get("id") == item_id:
-                if as_copy:
-                    it["copies_total"] = int(it.get("copies_total") or 0) + 1
-                it["uses_total"] = int(it.get("uses_total") or 0) + 1
-                by = it.get("uses_by_day")
-                if not isinstance(by, dict):
-                    by = {}
-                    it["uses_by_day"] = by
-                by[tk] = int(by.get(tk) or 0) + 1
-                it["last_used"] = datetime.now().isoformat(timespec="seconds")
-                self.save()
+        with self._lock:
+            it = self._get_in(area, cat, item_id)
+            if it is None:
                 return
+            a = self._agg(area, cat)
+            ts = datetime.now().isoformat(timespec="seconds")
+            self._apply_use(it, ts, as_copy)
+            if ts[:10] == self._agg_day:
+                a["used_today"].add(item_id)
+                a["uses_today"] += 1
+            a["copies"] += int(bool(as_copy))
+            gen = self.generation(area, cat)
+            self._touch(area, cat, usage=True)
+            self.picker.note_used((area, cat), gen, self._gen, item_id, it["uses_total"])
+            self._usage_seq += 1
+            self._append_usage([self._usage_seq, ts, int(as_copy), area, cat, item_id])
 
     def pick_random(self, area: str, cat: str, only_not_used_today: bool) -> Optional[dict]:
-        items = self.items(area, cat)
-        if not items:
+        with self._lock:
+            items = self.items(area, cat)
+            used = self.used_today_ids(area, cat) if only_not_used_today else None
+            item_id = self.picker.pick(
+                (area, cat), self.generation(area, cat),
+                lambda: [(it["id"], it.get("uses_total"), it.get("last_used")) for it in items], used)
+            return self._get_in(area, cat, item_id) if item_id is not None else None
+
+    def text_keys(self, area: str, cat: str) -> set[bytes]:
+        # text_key of every item in a category; cached until its texts change. Don't mutate.
+        with self._lock:
+            gen = self.generation(area, cat, texts=True)
+            hit = self._keys.get((area, cat))
+            if hit is None or hit[0] != gen:
+                hit = self._keys[(area, cat)] = (gen, {text_key(it.get("text") or "") for it in self.items(area, cat)})
+            return hit[1]
+
+    def add_many(self, area: str, cat: str, fresh: list[tuple[bytes, dict]]) -> int:
+        # commits dedupe_import() output with a single save; texts added meanwhile are skipped
+        with self._lock:
+            keys = self.text_keys(area, cat)
+            n = 0
+            for k, it in fresh:
+                if k in keys:
+                    continue
+                keys.add(k)
+                self._append(area, cat, it)
+                n += 1
+            if n:
+                self._keys[(area, cat)] = (self.generation(area, cat, texts=True), keys)
+                self.save()
+            return n
+
+    def add_batches(self, area: str, cat: str, batches: Iterable[list[tuple[bytes, dict]]]) -> int:
+        # a whole import: saves are held until the last batch, then written once
+        self.hold_saves()
+        try:
+            return sum(self.add_many(area, cat, fresh) for fresh in batches)
+        finally:
+            self.release_saves()
+
+    def import_json(self, area: str, cat: str, path: Path, fmt: Optional[str] = None) -> int:
+        # any IMPORT_FORMATS file, streamed, deduplicated and committed batch by batch;
+        # ContentPage runs the same steps with the parsing on a worker (ImportTask)
+        counts: dict[str, int] = {}
+        batches = dedupe_import(iter_import(path, fmt, counts=counts), set(self.text_keys(area, cat)), self._mk, counts)
+        n = self.add_batches(area, cat, batches)
+        logging.info("Imported %d texts from %s (duplicates: %d, malformed: %d)",
+                     n, path, counts.get("dup", 0), counts.get("bad", 0))
+        return n
+
+    def count(self, area: str, cat: str) -> int:
+        return len(self.items(area, cat))
+
+    def export_rows(self, area: str, cat: str) -> Iterator[tuple[str, str]]:
+        # (text, hint) in list order; safe to drain from another thread
+        with self._lock:
+            snap = list(self.items(area, cat))  # references only
+        for it in snap:
+            yield it.get("text", ""), it.get("hint", "")
+
+    def export_json(self, area: str, cat: str, path: Path, fmt: Optional[str] = None, progress=None) -> int:
+        fmt = fmt or ("jsonl" if path.suffix.lower() in (".jsonl", ".ndjson") else "json")
+        tmp = path.with_name(path.name + ".tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8", newline="\n") as f:
+                n = write_export(f, self.export_rows(area, cat), fmt, export_meta(area, cat), progress)
+            os.replace(tmp, path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        return n
+
+    def export_archive(self, path: Path, cats: Optional[list[tuple[str, str]]] = None, progress=None) -> dict:
+        # zip of (area, cat) categories (default: all of them), one .jsonl each, manifest last;
+        # off the owner thread pass cats explicitly (SqliteContentDB.categories needs its connection)
+        if cats is None:
+            cats = [(a, c) for a in ("ppv", "mailing") for c in self.categories(a)]
+        manifest = {"version": 1, "app": APP_NAME, "exported_at": utcnow(), "format": "jsonl", "categories": []}
+        tmp = path.with_name(path.name + ".tmp")
+        used: set[str] = set()
+        try:
+            # level 1: texts already pack ~3x; level 6 is ~6x slower for about 1% more
+            with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+                for area, cat in cats:
+                    name = archive_name(area, cat)
+                    k = 1
+                    while name in used:
+                        k += 1
+                        name = archive_name(area, f"{cat}~{k}")
+                    used.add(name)
+                    with io.TextIOWrapper(zf.open(name, "w"), encoding="utf-8", newline="\n") as f:
+                        n = write_export(f, self.export_rows(area, cat), "jsonl", progress=progress)
+                    manifest["categories"].append({"area": area, "category": cat, "file": name, "items": n})
+                manifest["items"] = sum(c["items"] for c in manifest["categories"])
+                zf.writestr(ARCHIVE_MANIFEST, json.dumps(manifest, ensure_ascii=False, indent=2))
+            os.replace(tmp, path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        return manifest
+
+class SqliteContentDB:
+    # Same interface as ContentDB on top of sqlite3 (WAL): items are looked up
+    # through the UNIQUE index on id and per-day usage lives in its own table.
+    # Every mutation is its own transaction, so save()/flush() have nothing to do.
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS categories(area TEXT NOT NULL, name TEXT NOT NULL, pos INTEGER NOT NULL,
+                                          PRIMARY KEY(area, name));
+    CREATE TABLE IF NOT EXISTS items(rid INTEGER PRIMARY KEY, id TEXT NOT NULL UNIQUE,
+                                     area TEXT NOT NULL, cat TEXT NOT NULL, text TEXT NOT NULL, hint TEXT NOT NULL,
+                                     created_at TEXT, uses_total INTEGER NOT NULL DEFAULT 0,
+                                     copies_total INTEGER NOT NULL DEFAULT 0, last_used TEXT);
+    CREATE INDEX IF NOT EXISTS items_by_cat ON items(area, cat, rid, id);
+    CREATE TABLE IF NOT EXISTS usage(item_id TEXT NOT NULL, day TEXT NOT NULL, n INTEGER NOT NULL,
+                                     PRIMARY KEY(item_id, day)) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS usage_by_day ON usage(day);
+    CREATE TABLE IF NOT EXISTS meta(key TEXT PRIMARY KEY, value TEXT NOT NULL);
+    """
+    COLS = "id, text, hint, created_at, uses_total, last_used, copies_total"
+    _mk = ContentDB._mk
+    _default = ContentDB._default
+
+    def __init__(self, path: Path):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path))
+        self._gens: dict[tuple[str, str], int] = {}
+        self._text_gens: dict[tuple[str, str], int] = {}
+        self._gen = 0
+        self._keys: dict[tuple[str, str], tuple[int, set[bytes]]] = {}
+        self._views: dict[tuple[str, str], tuple[int, ItemsView, dict[str, dict]]] = {}  # by generation
+        self.picker = ContentPicker()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        if self.conn.execute("SELECT 1 FROM categories LIMIT 1").fetchone() is None:
+            with self.conn:
+                for area, cats in self._default().items():
+                    if isinstance(cats, dict):
+                        for cat in cats:
+                            self._ensure_cat(area, cat)
+        self.compact_histories()
+
+    def _ensure_cat(self, area: str, cat: str):
+        self.conn.execute(
+            "INSERT OR IGNORE INTO categories(area, name, pos) "
+            "VALUES(?, ?, (SELECT COALESCE(MAX(pos), -1) + 1 FROM categories WHERE area = ?))",
+            (area, cat, area))
+
+    INSERT = ("INSERT INTO items(id, area, cat, text, hint, created_at, uses_total, copies_total, last_used) "
+              "VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?)")
+
+    @staticmethod
+    def _row(area: str, cat: str, it: dict) -> tuple:
+        return (it["id"], area, cat, it.get("text", ""), it.get("hint", ""), it.get("created_at"),
+                int(it.get("uses_total") or 0), int(it.get("copies_total") or 0), it.get("last_used"))
+
+    def _insert(self, area: str, cat: str, it: dict):
+        self.conn.execute(self.INSERT, self._row(area, cat, it))
+
+    @staticmethod
+    def _source_stamp(json_path: Path) -> Optional[str]:
+        # (mtime, size) of the JSON file and its usage journal: any write in JSON mode changes it
+        if not json_path.exists():
             return None
-        if not only_not_used_today:
-            return random.choice(items)
-        tk = today_key()
-        fresh = [it for it in items if int((it.get("uses_by_day") or {}).get(tk) or 0) == 0]
-        return random.choice(fresh) if fresh else random.choice(items)
-
-    def import_json(self, area: str, cat: str, path: Path) -> int:
-        obj = json.loads(path.read_text(encoding="utf-8"))
-        added = 0
-        self.data.setdefault(area, {}).setdefault(cat, {"items": []})
-        arr = self.data[area][cat]["items"]
-        if isinstance(obj, dict) and isinstance(obj.get("items"), list):
-            for x in obj["items"]:
-                if isinstance(x, dict) and (x.get("text") or "").strip():
-                    arr.append(self._mk(str(x["text"]), str(x.get("hint") or ""))); added += 1
-                elif isinstance(x, str) and x.strip():
-                    arr.append(self._mk(x.strip(), "")); added += 1
-        elif isinstance(obj, list):
-            for x in obj:
-                if isinstance(x, str) and x.strip():
-                    arr.append(self._mk(x.strip(), "")); added += 1
-        self.save()
-        return added
-
-    def export_json(self, area: str, cat: str, path: Path):
-        payload = {
-            "version": 1,
-            "area": area,
-            "category": cat,
-            "exported_at": utcnow(),
-            "items": [{"text": it.get("text",""), "hint": it.get("hint","")} for it in self.items(area, cat)],
-        }
-        path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        journal = json_path.with_name(json_path.stem + ".usage.jsonl")
+        stat = lambda p: [p.stat().st_mtime_ns, p.stat().st_size] if p.exists() else None
+        return json.dumps([stat(json_path), stat(journal)])
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str):
+        self.conn.execute("INSERT INTO meta(key, value) VALUES(?, ?) "
+                          "ON CONFLICT(key) DO UPDATE SET value = excluded.value", (key, value))
+
+    def migrate_from_json(self, json_path: Path) -> int:
+        # Import a version-2 content_bases.json (plus its usage journal) once, and
+        # again whenever the JSON was written after the last import -- the JSON
+        # backend was used in between, so it holds the newer data. Whether to
+        # import is decided by the recorded stamp alone: an items table emptied
+        # on the SQLite backend stays empty. The replaced contents go to <db>.bak.
+        stamp = self._source_stamp(json_path)
+        if stamp is None:
+            return 0
+        done = self._meta("migrated_from")
+        if done == stamp:
+            return 0
+        if done is None and self.conn.execute("SELECT 1 FROM items LIMIT 1").fetchone() is not None:
+            # migrated before stamps were kept: adopt the current JSON as the baseline
+            with self.conn:
+                self._set_meta("migrated_from", stamp)
+            return 0
+        bak = self.path.with_name(self.path.name + ".bak")
+        if done is not None:
+            logging.warning("%s changed since it was migrated; re-importing it, previous SQLite data saved to %s",
+                            json_path, bak)
+        dst = sqlite3.connect(str(bak))
+        try:
+            self.conn.backup(dst)
+        finally:
+            dst.close()
+        src = ContentDB(json_path, read_only=True)
+        try:
+            n = self._import_source(src)
+        finally:
+            src.close()
+        with self.conn:
+            self._set_meta("migrated_from", stamp)
+        for area in ("ppv", "mailing"):
+            for cat in self.categories(area):
+                self._touch(area, cat)
+        logging.info("Migrated %d content items from %s", n, json_path)
+        return n
+
+    def _import_source(self, src: "ContentDB") -> int:
+        n = 0
+        seen: set[str] = set()
+        with self.conn:
+            self.conn.execute("DELETE FROM usage")
+            self.conn.execute("DELETE FROM items")
+            self.conn.execute("DELETE FROM categories")
+            for area in ("ppv", "mailing"):
+                for cat in src.categories(area):
+                    self._ensure_cat(area, cat)
+                    for it in src.items(area, cat):
+                        if not it.get("id") or it["id"] in seen:
+                            it = dict(it, id=self._mk(it.get("text", ""), it.get("hint", ""))["id"])
+                        seen.add(it["id"])
+                        self._insert(area, cat, it)
+                        by = it.get("uses_by_day")
+                        if isinstance(by, dict):
+                            self.conn.executemany("INSERT INTO usage(item_id, day, n) VALUES(?, ?, ?)",
+                                                  [(it["id"], d, int(c or 0)) for d, c in by.items()])
+                        n += 1
+        return n
+
+    def save(self):
+        pass
+
+    def hold_saves(self):
+        pass
+
+    def release_saves(self):
+        pass
+
+    def flush(self):
+        self.conn.commit()
+
+    def close(self):
+        try:
+            self.conn.close()
+        except Exception:
+            pass
+
+    def _rows_to_items(self, rows: list, usage: Optional[list] = None) -> list[dict]:
+        items = [{"id": i, "text": t, "hint": h, "created_at": c, "uses_total": u, "uses_by_day": {},
+                  "last_used": lu, "copies_total": cp} for i, t, h, c, u, lu, cp in rows]
+        if items:
+            by_id = {it["id"]: it for it in items}
+            if usage is None:
+                usage = self.conn.execute(f"SELECT item_id, day, n FROM usage WHERE item_id IN ({','.join('?' * len(by_id))})",
+                                          list(by_id)).fetchall()
+            for item_id, day, n in usage:
+                it = by_id.get(item_id)
+                if it is not None:
+                    it["uses_by_day"][day] = n
+        return items
+
+    def generation(self, area: Optional[str] = None, cat: Optional[str] = None, texts: bool = False) -> int:
+        if area is None:
+            return self._gen
+        return (self._text_gens if texts else self._gens).get((area, cat), 0)
+
+    def _touch(self, area: str, cat: str, usage: bool = False):
+        self._gen += 1
+        self._gens[(area, cat)] = self._gen
+        if not usage:
+            self._text_gens[(area, cat)] = self._gen
+
+    def compact_histories(self) -> int:
+        today = date.today()
+        cutoff = (today - timedelta(days=HISTORY_DAILY_DAYS)).isoformat()
+        rows = self.conn.execute("SELECT item_id, day, n FROM usage WHERE day < ?", (cutoff,)).fetchall()
+        moves = [(item_id, day, history_bucket(day, today), n) for item_id, day, n in rows]
+        moves = [m for m in moves if m[2] != m[1]]
+        if moves:
+            with self.conn:
+                self.conn.executemany("DELETE FROM usage WHERE item_id = ? AND day = ?", [(m[0], m[1]) for m in moves])
+                self.conn.executemany("INSERT INTO usage(item_id, day, n) VALUES(?, ?, ?) "
+                                      "ON CONFLICT(item_id, day) DO UPDATE SET n = n + excluded.n",
+                                      [(m[0], m[2], m[3]) for m in moves])
+            logging.info("Usage history compacted: %d daily rows rolled up", len(moves))
+        return len(moves)
+
+    def used_today_ids(self, area: str, cat: str) -> set[str]:
+        return {r[0] for r in self.conn.execute(
+            "SELECT u.item_id FROM usage u JOIN items i ON i.id = u.item_id WHERE u.day = ? AND i.area = ? AND i.cat = ?",
+            (today_key(), area, cat))}
+
+    def day_stats(self, area: str, cat: str) -> dict:
+        total, copies = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(copies_total), 0) FROM items WHERE area = ? AND cat = ?", (area, cat)).fetchone()
+        used, uses = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(u.n), 0) FROM usage u JOIN items i ON i.id = u.item_id "
+            "WHERE u.day = ? AND i.area = ? AND i.cat = ?", (today_key(), area, cat)).fetchone()
+        return {"total": total, "used_today": used, "uses_today": uses, "copies": copies}
+
+    def get(self, item_id: str) -> Optional[dict]:
+        row = self.conn.execute(f"SELECT {self.COLS} FROM items WHERE id = ?", (item_id,)).fetchone()
+        return self._rows_to_items([row])[0] if row is not None else None
+
+    def categories(self, area: str) -> list[str]:
+        return [r[0] for r in self.conn.execute("SELECT name FROM categories WHERE area = ? ORDER BY pos", (area,))]
+
+    def items(self, area: str, cat: str) -> ItemsView:
+        # built once per generation; mark_used patches the cached dicts instead of refetching
+        gen = self.generation(area, cat)
+        hit = self._views.get((area, cat))
+        if hit is None or hit[0] != gen:
+            rows = self.conn.execute(f"SELECT {self.COLS} FROM items WHERE area = ? AND cat = ? ORDER BY rid", (area, cat)).fetchall()
+            usage = self.conn.execute("SELECT u.item_id, u.day, u.n FROM usage u JOIN items i ON i.id = u.item_id "
+                                      "WHERE i.area = ? AND i.cat = ?", (area, cat)).fetchall()
+            items = self._rows_to_items(rows, usage)
+            hit = self._views[(area, cat)] = (gen, ItemsView(items), {it["id"]: it for it in items})
+        return hit[1]
+
+    def add(self, area: str, cat: str, text: str, hint: str=""):
+        with self.conn:
+            self._ensure_cat(area, cat)
+            self._insert(area, cat, self._mk(text, hint))
+        self._touch(area, cat)
+
+    def update(self, area: str, cat: str, item_id: str, text: str, hint: str=""):
+        with self.conn:
+            cur = self.conn.execute("UPDATE items SET text = ?, hint = ? WHERE id = ? AND area = ? AND cat = ?",
+                                    (text.strip(), (hint or "").strip(), item_id, area, cat))
+        if cur.rowcount == 0:
+            raise KeyError(item_id)
+        self._touch(area, cat)
+
+    def delete(self, area: str, cat: str, item_id: str):
+        with self.conn:
+            cur = self.conn.execute("DELETE FROM items WHERE id = ? AND area = ? AND cat = ?", (item_id, area, cat))
+            if cur.rowcount:
+                self.conn.execute("DELETE FROM usage WHERE item_id = ?", (item_id,))
+        if cur.rowcount == 0:
+            raise KeyError(item_id)
+        self._touch(area, cat)
+
+    def mark_used(self, area: str, cat: str, item_id: str, as_copy: bool):
+        ts = datetime.now().isoformat(timespec="seconds")
+        with self.conn:
+            cur = self.conn.execute(
+                "UPDATE items SET uses_total = uses_total + 1, copies_total = copies_total + ?, last_used = ? "
+                "WHERE id = ? AND area = ? AND cat = ?", (int(bool(as_copy)), ts, item_id, area, cat))
+            if cur.rowcount:
+                self.conn.execute("INSERT INTO usage(item_id, day, n) VALUES(?, ?, 1) "
+                                  "ON CONFLICT(item_id, day) DO UPDATE SET n = n + 1", (item_id, ts[:10]))
+                uses = self.conn.execute("SELECT uses_total FROM items WHERE id = ?", (item_id,)).fetchone()[0]
+                gen = self.generation(area, cat)
+                self._touch(area, cat, usage=True)
+                self.picker.note_used((area, cat), gen, self._gen, item_id, uses)
+                hit = self._views.get((area, cat))
+                if hit is not None and hit[0] == gen and item_id in hit[2]:
+                    it = hit[2][item_id]
+                    it["uses_total"] = uses
+                    it["copies_total"] = int(it.get("copies_total") or 0) + int(bool(as_copy))
+                    it["last_used"] = ts
+                    it["uses_by_day"][ts[:10]] = it["uses_by_day"].get(ts[:10], 0) + 1
+                    self._views[(area, cat)] = (self._gen, hit[1], hit[2])
+
+    def pick_random(self, area: str, cat: str, only_not_used_today: bool) -> Optional[dict]:
+        # the picker only reads (id, uses_total, last_used) when the category changed shape
+        used = self.used_today_ids(area, cat) if only_not_used_today else None
+        item_id = self.picker.pick(
+            (area, cat), self.generation(area, cat),
+            lambda: self.conn.execute("SELECT id, uses_total, last_used FROM items WHERE area = ? AND cat = ? "
+                                      "ORDER BY rid", (area, cat)).fetchall(), used)
+        return self.get(item_id) if item_id is not None else None
+
+    def text_keys(self, area: str, cat: str) -> set[bytes]:
+        gen = self.generation(area, cat, texts=True)
+        hit = self._keys.get((area, cat))
+        if hit is None or hit[0] != gen:
+            hit = self._keys[(area, cat)] = (gen, {text_key(r[0]) for r in self.conn.execute(
+                "SELECT text FROM items WHERE area = ? AND cat = ?", (area, cat))})
+        return hit[1]
+
+    def add_many(self, area: str, cat: str, fresh: list[tuple[bytes, dict]]) -> int:
+        return self.add_batches(area, cat, (fresh,))
+
+    def add_batches(self, area: str, cat: str, batches: Iterable[list[tuple[bytes, dict]]]) -> int:
+        # every batch inside one transaction; rows are built per batch, never for the whole file
+        keys = self.text_keys(area, cat)
+        n = 0
+        try:
+            with self.conn:
+                self._ensure_cat(area, cat)
+                for fresh in batches:
+                    rows = []
+                    for k, it in fresh:
+                        if k not in keys:
+                            keys.add(k)
+                            rows.append(self._row(area, cat, it))
+                    self.conn.executemany(self.INSERT, rows)
+                    n += len(rows)
+        except Exception:
+            self._keys.pop((area, cat), None)  # keys already holds the rolled-back texts
+            raise
+        if n:
+            self._touch(area, cat)
+            self._keys[(area, cat)] = (self.generation(area, cat, texts=True), keys)
+        return n
+
+    import_json = ContentDB.import_json
+
+    def count(self, area: str, cat: str) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM items WHERE area = ? AND cat = ?", (area, cat)).fetchone()[0]
+
+    def export_rows(self, area: str, cat: str) -> Iterator[tuple[str, str]]:
+        # a connection of its own: usable from an export thread and reads one WAL snapshot
+        conn = sqlite3.connect(str(self.path))
+        try:
+            yield from conn.execute("SELECT text, hint FROM items WHERE area = ? AND cat = ? ORDER BY rid", (area, cat))
+        finally:
+            conn.close()
+
+    export_json = ContentDB.export_json
+    export_archive = ContentDB.export_archive
+
+CONTENT_BACKENDS = {"json": "JSON-файл", "sqlite": "SQLite"}
+
+def open_content_db(backend: str = "json"):
+    if backend == "sqlite":
+        try:
+            db = SqliteContentDB(CONTENT_SQLITE_FILE)
+            db.migrate_from_json(CONTENT_DB_FILE)
+            return db
+        except Exception:
+            logging.exception("SQLite content DB unavailable, falling back to JSON")
+    return ContentDB(CONTENT_DB_FILE)
 
 # ---------- Anim ----------
 class Toast(QtWidgets.QFrame):
@@ -633,25 +1992,141 @@ class Toast(QtWidgets.QFrame):
         Anim.fade(self, 1.0, 0.0, 180)
         QtCore.QTimer.singleShot(220, self.deleteLater)
 
+class AnimScheduler(QtCore.QObject):
+    # Every Anim goes through here. One running animation per (widget, property):
+    # a new one fast-forwards the old instead of stacking on top of it, and since a
+    # widget holds a single QGraphicsEffect all effect animations share one slot.
+    # Graphics effects are capped (each one renders its widget offscreen) and new
+    # animations are skipped -- jumped to their end state -- while frames run over
+    # budget. Opacity effects are removed once a fade-in completes.
+    MAX_EFFECTS = 3
+    FRAME_BUDGET_MS = 16.7
+    TICK_MS = 16
+
+    def __init__(self):
+        super().__init__()
+        self.performance_mode = False   # no blur, no ghost grabs, see load_settings
+        self._running: dict[tuple[int, bytes], tuple[QtCore.QAbstractAnimation, bool]] = {}
+        self._effects = 0
+        self._frame_ms = 0.0
+        self._clock = QtCore.QElapsedTimer()
+        self._tick = QtCore.QTimer(self)
+        self._tick.setTimerType(QtCore.Qt.PreciseTimer)
+        self._tick.setInterval(self.TICK_MS)
+        self._tick.timeout.connect(self._on_tick)
+        self.started = self.skipped = self.merged = 0
+
+    def _on_tick(self):
+        # event loop lag while something animates; an idle app needs no clock
+        dt = self._clock.restart()
+        self._frame_ms = 0.7 * self._frame_ms + 0.3 * dt
+        if not self._running:
+            self._tick.stop()
+            self._frame_ms = 0.0
+
+    def over_budget(self) -> bool:
+        return self._frame_ms > 2 * self.FRAME_BUDGET_MS
+
+    def active(self) -> int:
+        return len(self._running)
+
+    def allow(self, effect: bool = False) -> bool:
+        if self.over_budget() or (effect and self._effects >= self.MAX_EFFECTS):
+            self.skipped += 1
+            return False
+        return True
+
+    def run(self, anim: QtCore.QAbstractAnimation, target: QtCore.QObject, prop: bytes, effect: bool = False):
+        key = (id(target), b"effect" if effect else prop)
+        old = self._running.get(key)
+        self._running[key] = (anim, effect)
+        self._effects += effect
+        self.started += 1
+        if old is not None:
+            self.merged += 1
+            self._release(old[1])
+            try:
+                old[0].setCurrentTime(old[0].totalDuration())  # land on its end value
+                old[0].stop()
+            except Exception:
+                pass
+        # finished, stopped, or orphaned when its effect was replaced: all end up Stopped
+        anim.stateChanged.connect(lambda new, _old, k=key, a=anim: self._state_changed(k, a, new))
+        anim.destroyed.connect(lambda *_x, k=key, a=anim: self._forget(k, a))  # died with its widget
+        if not self._tick.isActive():
+            self._clock.start()
+            self._tick.start()
+        anim.start(QtCore.QAbstractAnimation.DeleteWhenStopped)
+
+    def owner(self, target: QtCore.QObject, prop: bytes = b"effect") -> Optional[QtCore.QAbstractAnimation]:
+        cur = self._running.get((id(target), prop))
+        return cur[0] if cur is not None else None
+
+    def _release(self, effect: bool):
+        self._effects = max(0, self._effects - effect)
+
+    def _state_changed(self, key, anim, state):
+        if state == QtCore.QAbstractAnimation.Stopped:
+            self._forget(key, anim)
+
+    def _forget(self, key, anim):
+        cur = self._running.get(key)
+        if cur is not None and cur[0] is anim:
+            del self._running[key]
+            self._release(cur[1])
+            try:
+                anim.deleteLater()
+            except RuntimeError:
+                pass
+
 class Anim:
+    _scheduler: Optional[AnimScheduler] = None
+
+    @classmethod
+    def scheduler(cls) -> AnimScheduler:
+        if cls._scheduler is None:
+            cls._scheduler = AnimScheduler()
+        return cls._scheduler
+
+    @staticmethod
+    def _strip(widget: QtWidgets.QWidget, eff: QtWidgets.QGraphicsEffect, anim: QtCore.QAbstractAnimation):
+        # a leftover effect keeps rendering the widget offscreen on every repaint;
+        # unless a newer animation has taken over the widget's effect meanwhile
+        try:
+            if widget.graphicsEffect() is eff and Anim.scheduler().owner(widget) in (None, anim):
+                widget.setGraphicsEffect(None)
+        except Exception:
+            pass
 
     @staticmethod
     def pop(w: QtWidgets.QWidget, ms: int = 170):
         try:
+            if not Anim.scheduler().allow():
+                return
             start = w.geometry()
             g = QtCore.QRect(start.x()+8, start.y()+8, max(1, start.width()-16), max(1, start.height()-16))
-            a = QtCore.QPropertyAnimation(w, b"geometry")
+            a = QtCore.QPropertyAnimation(w, b"geometry", w)
             a.setDuration(ms)
             a.setStartValue(g)
             a.setEndValue(start)
             a.setEasingCurve(QtCore.QEasingCurve.OutBack)
-            a.start(QtCore.QAbstractAnimation.DeleteWhenStopped)
+            Anim.scheduler().run(a, w, b"geometry")
         except Exception:
             pass
 
     @staticmethod
     def fade(widget: QtWidgets.QWidget, start=0.0, end=1.0, ms=180):
         eff = widget.graphicsEffect()
+        if not Anim.scheduler().allow(effect=True):
+            if end >= 0.999:
+                if isinstance(eff, QtWidgets.QGraphicsOpacityEffect):
+                    widget.setGraphicsEffect(None)
+            else:
+                if not isinstance(eff, QtWidgets.QGraphicsOpacityEffect):
+                    eff = QtWidgets.QGraphicsOpacityEffect(widget)
+                    widget.setGraphicsEffect(eff)
+                eff.setOpacity(end)
+            return
         if not isinstance(eff, QtWidgets.QGraphicsOpacityEffect):
             eff = QtWidgets.QGraphicsOpacityEffect(widget)
             widget.setGraphicsEffect(eff)
@@ -660,10 +2135,14 @@ class Anim:
         a.setStartValue(start); a.setEndValue(end)
         a.setDuration(ms)
         a.setEasingCurve(QtCore.QEasingCurve.OutCubic)
-        a.start(QtCore.QAbstractAnimation.DeleteWhenStopped)
+        if end >= 0.999:
+            a.finished.connect(lambda: Anim._strip(widget, eff, a))
+        Anim.scheduler().run(a, widget, b"opacity", effect=True)
 
     @staticmethod
     def slide_in(widget: QtWidgets.QWidget, dx=18, ms=220):
+        if not Anim.scheduler().allow():
+            return
         end = widget.pos()
         start = end + QtCore.QPoint(dx, 0)
         widget.move(start)
@@ -671,11 +2150,13 @@ class Anim:
         a.setStartValue(start); a.setEndValue(end)
         a.setDuration(ms)
         a.setEasingCurve(QtCore.QEasingCurve.OutCubic)
-        a.start(QtCore.QAbstractAnimation.DeleteWhenStopped)
+        Anim.scheduler().run(a, widget, b"pos")
 
     @staticmethod
     def menu_pop(menu: QtWidgets.QMenu):
         def run():
+            if not Anim.scheduler().allow(effect=True):
+                return
             eff = menu.graphicsEffect()
             if not isinstance(eff, QtWidgets.QGraphicsOpacityEffect):
                 eff = QtWidgets.QGraphicsOpacityEffect(menu)
@@ -693,22 +2174,27 @@ class Anim:
             a2.setEasingCurve(QtCore.QEasingCurve.OutCubic)
             group = QtCore.QParallelAnimationGroup(menu)
             group.addAnimation(a1); group.addAnimation(a2)
-            group.start(QtCore.QAbstractAnimation.DeleteWhenStopped)
+            group.finished.connect(lambda: Anim._strip(menu, eff, group))
+            Anim.scheduler().run(group, menu, b"menu_pop", effect=True)
         QtCore.QTimer.singleShot(0, run)
 
     @staticmethod
     def slide_out(widget: QtWidgets.QWidget, dy=10, ms=180):
+        if not Anim.scheduler().allow():
+            return
         start = widget.pos()
         end = start + QtCore.QPoint(0, dy)
         a = QtCore.QPropertyAnimation(widget, b"pos", widget)
         a.setStartValue(start); a.setEndValue(end)
         a.setDuration(ms)
         a.setEasingCurve(QtCore.QEasingCurve.InCubic)
-        a.start(QtCore.QAbstractAnimation.DeleteWhenStopped)
+        Anim.scheduler().run(a, widget, b"pos")
 
     @staticmethod
     def motion_blur(widget: QtWidgets.QWidget, ms: int = 200):
         try:
+            if Anim.scheduler().performance_mode or not Anim.scheduler().allow(effect=True):
+                return
             eff = QtWidgets.QGraphicsBlurEffect(widget)
             eff.setBlurRadius(8)
             widget.setGraphicsEffect(eff)
@@ -717,14 +2203,16 @@ class Anim:
             anim.setStartValue(8)
             anim.setEndValue(0)
             anim.setEasingCurve(QtCore.QEasingCurve.OutCubic)
-            anim.finished.connect(lambda: widget.setGraphicsEffect(None))
-            anim.start(QtCore.QAbstractAnimation.DeleteWhenStopped)
+            anim.finished.connect(lambda: Anim._strip(widget, eff, anim))
+            Anim.scheduler().run(anim, widget, b"blurRadius", effect=True)
         except Exception:
             pass
 
     @staticmethod
     def shake(widget: QtWidgets.QWidget, dist: int = 6, ms: int = 240):
         try:
+            if not Anim.scheduler().allow():
+                return
             pos = widget.pos()
             anim = QtCore.QPropertyAnimation(widget, b"pos", widget)
             anim.setDuration(ms)
@@ -735,13 +2223,15 @@ class Anim:
             anim.setKeyValueAt(0.8, pos + QtCore.QPoint(dist, 0))
             anim.setKeyValueAt(1.0, pos)
             anim.setEasingCurve(QtCore.QEasingCurve.OutCubic)
-            anim.start(QtCore.QAbstractAnimation.DeleteWhenStopped)
+            Anim.scheduler().run(anim, widget, b"pos")
         except Exception:
             pass
 
     @staticmethod
     def bounce(widget: QtWidgets.QWidget, ms: int = 220):
         try:
+            if not Anim.scheduler().allow():
+                return
             start = widget.geometry()
             grow = QtCore.QRect(start.x() - 2, start.y() - 2, start.width() + 4, start.height() + 4)
             anim = QtCore.QPropertyAnimation(widget, b"geometry", widget)
@@ -750,53 +2240,83 @@ class Anim:
             anim.setKeyValueAt(0.5, grow)
             anim.setEndValue(start)
             anim.setEasingCurve(QtCore.QEasingCurve.OutBack)
-            anim.start(QtCore.QAbstractAnimation.DeleteWhenStopped)
+            Anim.scheduler().run(anim, widget, b"geometry")
         except Exception:
             pass
 
 # ---------- Glass root ----------
+def paint_glass(p: QtGui.QPainter, r: QtCore.QRect, t: dict):
+    radius = float(t.get("radius", "16"))
+    path = QtGui.QPainterPath()
+    path.addRoundedRect(QtCore.QRectF(r), radius, radius)
+
+    grad = QtGui.QLinearGradient(r.topLeft(), r.bottomRight())
+    grad.setColorAt(0.0, QtGui.QColor(t["bg1"]))
+    grad.setColorAt(0.45, QtGui.QColor(t["bg2"]))
+    grad.setColorAt(1.0, QtGui.QColor(t["bg3"]))
+    p.fillPath(path, grad)
+
+    hl = QtGui.QLinearGradient(r.topLeft(), r.bottomLeft())
+    hl.setColorAt(0.0, QtGui.QColor(255, 255, 255, 52))
+    hl.setColorAt(1.0, QtGui.QColor(255, 255, 255, 10))
+    p.fillPath(path, hl)
+
+    pen = QtGui.QPen(QtGui.QColor(255, 255, 255, 36))
+    pen.setWidthF(1.1)
+    p.setPen(pen)
+    p.drawPath(path)
+
+    try:
+        strength = int(t.get("grain", "12"))
+        _draw_grain(p, r, strength=strength, step=3)
+    except Exception:
+        pass
+
 class GlassRoot(QtWidgets.QFrame):
+    # The composited background (gradients, border, grain) is rendered once per
+    # (theme, size, DPR) into a pixmap; repaints during fades/slides only blit
+    # the exposed part of it.
     def __init__(self, get_theme, parent=None):
         super().__init__(parent)
         self.setObjectName("GlassRoot")
         self._get_theme = get_theme
+        self._bg: Optional[QtGui.QPixmap] = None
+        self._bg_key: Optional[tuple] = None
+        self.bg_renders = 0
         self.setAttribute(QtCore.Qt.WA_TranslucentBackground, True)
         self.setAttribute(QtCore.Qt.WA_NoSystemBackground, True)
         self.setAttribute(QtCore.Qt.WA_OpaquePaintEvent, False)
 
+    def background(self) -> QtGui.QPixmap:
+        name = str(self._get_theme())
+        dpr = self.devicePixelRatioF()
+        key = (name, self.width(), self.height(), dpr)
+        if self._bg is None or self._bg_key != key:
+            t = THEMES.get(name, THEMES["Ametrine"])
+            pm = QtGui.QPixmap(max(1, round(self.width() * dpr)), max(1, round(self.height() * dpr)))
+            pm.setDevicePixelRatio(dpr)
+            pm.fill(QtCore.Qt.transparent)
+            p = QtGui.QPainter(pm)
+            p.setRenderHint(QtGui.QPainter.Antialiasing, True)
+            paint_glass(p, self.rect().adjusted(1, 1, -1, -1), t)
+            p.end()
+            self._bg, self._bg_key = pm, key
+            self.bg_renders += 1
+        return self._bg
+
+    def resizeEvent(self, e: QtGui.QResizeEvent):
+        self._bg = None  # don't keep the old size around until the next paint
+        super().resizeEvent(e)
+
     def paintEvent(self, e: QtGui.QPaintEvent):
         p = QtGui.QPainter(self)
         if not p.isActive():
             return
-        p.setRenderHint(QtGui.QPainter.Antialiasing, True)
-        r = self.rect().adjusted(1, 1, -1, -1)
-
-        t = THEMES.get(str(self._get_theme()), THEMES["Ametrine"])
-        radius = float(t.get("radius", "16"))
-        path = QtGui.QPainterPath()
-        path.addRoundedRect(QtCore.QRectF(r), radius, radius)
-
-        grad = QtGui.QLinearGradient(r.topLeft(), r.bottomRight())
-        grad.setColorAt(0.0, QtGui.QColor(t["bg1"]))
-        grad.setColorAt(0.45, QtGui.QColor(t["bg2"]))
-        grad.setColorAt(1.0, QtGui.QColor(t["bg3"]))
-        p.fillPath(path, grad)
-
-        hl = QtGui.QLinearGradient(r.topLeft(), r.bottomLeft())
-        hl.setColorAt(0.0, QtGui.QColor(255, 255, 255, 52))
-        hl.setColorAt(1.0, QtGui.QColor(255, 255, 255, 10))
-        p.fillPath(path, hl)
-
-        pen = QtGui.QPen(QtGui.QColor(255, 255, 255, 36))
-        pen.setWidthF(1.1)
-        p.setPen(pen)
-        p.drawPath(path)
-
-        try:
-            strength = int(t.get("grain", "12"))
-            _draw_grain(p, r, strength=strength, step=3)
-        except Exception:
-            pass
+        pm = self.background()
+        r = e.rect()
+        dpr = pm.devicePixelRatio()
+        src = QtCore.QRect(round(r.x() * dpr), round(r.y() * dpr), round(r.width() * dpr), round(r.height() * dpr))
+        p.drawPixmap(r, pm, src)
         p.end()
 
 # ---------- TitleBar ----------
@@ -1060,7 +2580,412 @@ class TextEditor(GlassDialog):
     def get(self) -> tuple[str, str]:
         return self.ed.toPlainText().rstrip(), self.hint.text().strip()
 
+# ---------- Search index ----------
+# Spotlight records (binds + every PPV/mailing item) with two levels of
+# postings: token -> docs, and 1..3-gram -> vocabulary tokens. A query term
+# is resolved against the (small) vocabulary through the gram postings, the
+# matching tokens' doc lists are merged, terms are intersected and only the
+# survivors are checked with `q in blob`, so results match the old substring
+# scan. Edits append a new doc and tombstone the old one; doc lists are
+# rebuilt once tombstones outnumber live docs. sync() only re-reads sources
+# whose generation moved and only re-tokenizes records whose text changed.
+_WORD_RE = re.compile(r"\w+")
+SPOTLIGHT_LIMIT = 200  # rows shown per query; keeps a keystroke from filling a 50k-row list
+# per-term scores: whole word > word prefix > inside a word > one/two typos away
+SCORE_EXACT, SCORE_PREFIX, SCORE_INFIX, SCORE_TYPO1, SCORE_TYPO2 = 10, 8, 4, 3, 2
+SCORE_PHRASE, SCORE_KEY = 5, 3  # whole query verbatim; term found in a bind trigger
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    # optimal string alignment distance (adjacent swaps count once), capped at limit + 1
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            v = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if prev2 is not None and i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                v = min(v, prev2[j - 2] + 1)
+            cur[j] = v
+        if min(cur) > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return min(prev[-1], limit + 1)
+
+class SearchIndex:
+    def __init__(self):
+        self.records: dict[int, dict[str, Any]] = {}
+        self._blob: dict[int, str] = {}
+        self._tok_id: dict[str, int] = {}
+        self._tok: list[str] = []
+        self._tok_docs: list[list[int]] = []
+        self._gram_toks: dict[str, list[int]] = {}
+        self._bind_docs: list[int] = []                          # bind position -> doc id
+        self._cat_docs: dict[tuple[str, str], dict[str, int]] = {}  # item id -> doc id
+        self._gens: dict[tuple[str, str], int] = {}
+        self._bind_sig: list[tuple] = []
+        self._next = 0
+        self._dead = 0
+        self._term_cache: dict[str, dict[int, int]] = {}  # term -> {vocabulary id: score}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @staticmethod
+    def _blob_of(rec: dict[str, Any]) -> str:
+        return " ".join(str(rec.get(k, "")) for k in ("type", "key", "category", "text") if k in rec).lower()
+
+    def _token(self, t: str) -> int:
+        tid = self._tok_id.get(t)
+        if tid is None:
+            tid = self._tok_id[t] = len(self._tok)
+            self._tok.append(t)
+            self._term_cache.clear()
+            self._tok_docs.append([])
+            grams = self._gram_toks
+            for g in {t[i:i + n] for n in (1, 2, 3) for i in range(len(t) - n + 1)}:
+                lst = grams.get(g)
+                if lst is None:
+                    grams[g] = [tid]
+                else:
+                    lst.append(tid)
+        return tid
+
+    def _post(self, d: int, blob: str):
+        tok_id, tok_docs = self._tok_id, self._tok_docs
+        for t in set(_WORD_RE.findall(blob)):
+            tid = tok_id.get(t)
+            if tid is None:
+                tid = self._token(t)
+            tok_docs[tid].append(d)
+
+    def _add(self, rec: dict[str, Any]) -> int:
+        d = self._next
+        self._next += 1
+        blob = self._blob_of(rec)
+        self.records[d] = rec
+        self._blob[d] = blob
+        self._post(d, blob)
+        return d
+
+    def _kill(self, d: int):
+        del self.records[d]
+        del self._blob[d]
+        self._dead += 1
+
+    def _compact(self):
+        for lst in self._tok_docs:
+            lst.clear()
+        for d in sorted(self._blob):
+            self._post(d, self._blob[d])
+        self._dead = 0
+
+    def sync(self, binds, db) -> int:
+        # bring the index up to date; returns how many records were (re)indexed or dropped
+        changed = 0
+        sig = [(b.key, b.category, b.text) for b in binds]
+        if sig != self._bind_sig:
+            old, docs = self._bind_sig, self._bind_docs
+            for i, (key, cat, text) in enumerate(sig):
+                if i < len(old) and old[i] == sig[i]:
+                    continue
+                if i < len(docs):
+                    self._kill(docs[i])
+                    docs[i] = self._add({"type": "bind", "key": key, "category": cat, "text": text, "row": i})
+                else:
+                    docs.append(self._add({"type": "bind", "key": key, "category": cat, "text": text, "row": i}))
+                changed += 1
+            while len(docs) > len(sig):
+                self._kill(docs.pop())
+                changed += 1
+            self._bind_sig = sig
+        live = set()
+        records = self.records
+        for area in ("ppv", "mailing"):
+            for cat in db.categories(area):
+                live.add((area, cat))
+                gen = db.generation(area, cat, texts=True)
+                if self._gens.get((area, cat)) == gen:
+                    continue
+                docs = self._cat_docs.get((area, cat), {})
+                fresh: dict[str, int] = {}
+                for it in db.items(area, cat):
+                    iid = it.get("id")
+                    text = it.get("text", "")
+                    d = docs.pop(iid, None)
+                    if d is None or records[d]["text"] != text:
+                        if d is not None:
+                            self._kill(d)
+                        d = self._add({"type": area, "category": cat, "text": text, "id": iid})
+                        changed += 1
+                    fresh[iid] = d
+                for d in docs.values():
+                    self._kill(d)
+                    changed += 1
+                self._cat_docs[(area, cat)] = fresh
+                self._gens[(area, cat)] = gen
+        for k in [k for k in self._cat_docs if k not in live]:
+            for d in self._cat_docs.pop(k).values():
+                self._kill(d)
+                changed += 1
+            self._gens.pop(k, None)
+        if self._dead > max(1000, len(self.records)):
+            self._compact()
+        return changed
+
+    def _term_tokens(self, term: str):
+        # vocabulary ids of the words that contain term
+        if len(term) <= 3:
+            return self._gram_toks.get(term, ())
+        posts = [self._gram_toks.get(term[i:i + 3]) for i in range(len(term) - 2)]
+        if not all(posts):
+            return ()
+        tok = self._tok
+        return [t for t in min(posts, key=len) if term in tok[t]]
+
+    def search(self, q: str, limit: Optional[int] = None) -> list[int]:
+        # doc ids whose blob contains q, in index order
+        q = (q or "").strip().lower()
+        blob = self._blob
+        terms = sorted(set(_WORD_RE.findall(q)), key=len, reverse=True)  # longest is usually the rarest
+        tids = [self._term_tokens(t) for t in terms]
+        est = min((sum(len(self._tok_docs[t]) for t in ts) for ts in tids), default=len(blob))
+        if not terms or (limit is not None and est > len(blob) // 8):
+            # punctuation-only query, or one so common that scanning until `limit` hits is cheaper
+            hits = (d for d, b in blob.items() if q in b)
+        else:
+            cand = None
+            for ts in tids:
+                docs: set[int] = set()
+                for t in ts:
+                    docs.update(self._tok_docs[t])
+                cand = docs if cand is None else cand & docs
+                if not cand:
+                    return []
+            exact = terms == [q]  # a lone word needs no confirmation
+            hits = (d for d in sorted(cand) if d in blob and (exact or q in blob[d]))
+        out = []
+        for d in hits:
+            out.append(d)
+            if limit is not None and len(out) >= limit:
+                break
+        return out
+
+    def _term_scores(self, term: str) -> dict[int, int]:
+        sc = self._term_cache.get(term)
+        if sc is not None:
+            return sc
+        tok = self._tok
+        sc = {}
+        for t in self._term_tokens(term):
+            w = tok[t]
+            sc[t] = SCORE_EXACT if w == term else SCORE_PREFIX if w.startswith(term) else SCORE_INFIX
+        if len(term) >= 4:
+            # typo candidates share most bigrams with the term; confirm with the real distance
+            limit = 1 if len(term) < 8 else 2
+            need = len(term) - 1 - 2 * limit
+            hits: dict[int, int] = {}
+            for g in {term[i:i + 2] for i in range(len(term) - 1)}:
+                for t in self._gram_toks.get(g, ()):
+                    hits[t] = hits.get(t, 0) + 1
+            for t, n in hits.items():
+                if n >= need and t not in sc:
+                    dist = edit_distance(term, tok[t], limit)
+                    if dist <= limit:
+                        sc[t] = SCORE_TYPO1 if dist <= 1 else SCORE_TYPO2
+        if len(self._term_cache) > 256:
+            self._term_cache.clear()
+        self._term_cache[term] = sc
+        return sc
+
+    def rank(self, q: str, k: int = SPOTLIGHT_LIMIT, cancel=None) -> list[tuple[int, int]]:
+        # best k (score, doc id): every term must match a word exactly, by prefix,
+        # inside it or within a typo or two; only the k winners leave the heap.
+        # cancel() is polled between phases; a cancelled query returns []
+        q = (q or "").strip().lower()
+        terms = list(dict.fromkeys(_WORD_RE.findall(q)))
+        if not terms:
+            return [(0, d) for d in self.search(q, k)]
+        blob, tok_docs, tok_id = self._blob, self._tok_docs, self._tok_id
+        scored = [self._term_scores(t) for t in terms]
+        if not all(scored):
+            return []
+        scored.sort(key=lambda sc: sum(len(tok_docs[t]) for t in sc))  # rarest term first
+        best: dict[int, int] = {}
+        tiers: dict[int, list[int]] = {}
+        for t, v in scored[0].items():
+            tiers.setdefault(v, []).append(t)
+        single = len(scored) == 1 and len(terms[0]) == len(q)
+        for v in sorted(tiers, reverse=True):
+            for t in tiers[v]:
+                for d in tok_docs[t]:
+                    if d not in best and d in blob:
+                        best[d] = v
+                if single and len(best) >= 4 * k:
+                    break  # plenty of equal-score candidates; the rest of this tier would only tie
+            if single and len(best) >= k:
+                break  # lower tiers can't outrank a full top-k
+        for sc in scored[1:]:
+            if cancel is not None and cancel():
+                return []
+            if sum(len(tok_docs[t]) for t in sc) <= 4 * len(best):
+                got: dict[int, int] = {}
+                for t, v in sc.items():
+                    for d in tok_docs[t]:
+                        if d in best and v > got.get(d, 0):
+                            got[d] = v
+            else:
+                got = {}
+                for d in best:
+                    v = max((sc.get(tok_id.get(w, -1), 0) for w in _WORD_RE.findall(blob[d])), default=0)
+                    if v:
+                        got[d] = v
+            best = {d: best[d] + v for d, v in got.items()}
+            if not best:
+                return []
+        if cancel is not None and cancel():
+            return []
+        records = self.records
+        for d in best:
+            if len(terms) > 1 and q in blob[d]:
+                best[d] += SCORE_PHRASE
+            key = records[d].get("key")
+            if key and any(t in key.lower() for t in terms):
+                best[d] += SCORE_KEY
+        top = heapq.nlargest(k, best, key=lambda d: (best[d], -len(blob[d]), -d))
+        return [(best[d], d) for d in top]
+
+    def spans(self, label: str, q: str) -> list[tuple[int, int]]:
+        # (start, length) of the query terms inside a display label, for highlighting
+        terms = list(dict.fromkeys(_WORD_RE.findall((q or "").lower())))
+        out = []
+        for m in _WORD_RE.finditer(label.lower()):
+            w = m.group()
+            tid = self._tok_id.get(w, -1)
+            for t in terms:
+                i = w.find(t)
+                if i >= 0:
+                    out.append((m.start() + i, len(t)))
+                    break
+                if self._term_scores(t).get(tid):
+                    out.append((m.start(), len(w)))
+                    break
+        return out
+
+class LatencyHistogram:
+    # fixed millisecond buckets; summary() is what goes to app.log
+    BOUNDS_MS = (5, 10, 20, 50, 100, 200, 500)
+
+    def __init__(self, name: str):
+        self.name = name
+        self.counts = [0] * (len(self.BOUNDS_MS) + 1)
+        self.samples: deque[float] = deque(maxlen=1000)
+        self._logged = 0
+
+    def add(self, seconds: float):
+        ms = seconds * 1000
+        self.samples.append(ms)
+        i = 0
+        while i < len(self.BOUNDS_MS) and ms > self.BOUNDS_MS[i]:
+            i += 1
+        self.counts[i] += 1
+
+    def summary(self) -> str:
+        lat = sorted(self.samples)
+        if not lat:
+            return f"{self.name}: no samples"
+        pick = lambda q: lat[min(len(lat) - 1, int(q * len(lat)))]
+        edges = [f"<={b}" for b in self.BOUNDS_MS] + [f">{self.BOUNDS_MS[-1]}"]
+        hist = " ".join(f"{e}:{n}" for e, n in zip(edges, self.counts) if n)
+        return f"{self.name}: n={sum(self.counts)} p50={pick(0.5):.1f}ms p95={pick(0.95):.1f}ms max={lat[-1]:.1f}ms [{hist}]"
+
+    def log(self, force: bool = False, every: int = 50):
+        n = sum(self.counts)
+        if n and (n - self._logged >= every or (force and n != self._logged)):
+            self._logged = n
+            logging.info("%s", self.summary())
+
+SPOTLIGHT_LATENCY = LatencyHistogram("Spotlight keystroke->first result")
+SPOTLIGHT_DEBOUNCE_MS = 90
+SPOTLIGHT_BATCH = 25
+
+class SearchSignals(QtCore.QObject):
+    batch = QtCore.Signal(int, list, bool)  # query seq, [(label, spans, record)], last batch
+
+class SearchTask(QtCore.QRunnable):
+    # ranks one query off the GUI thread and streams labelled rows back in
+    # SPOTLIGHT_BATCH chunks; gives up as soon as a newer query is issued
+    def __init__(self, index: SearchIndex, q: str, seq: int, current, signals: SearchSignals):
+        super().__init__()
+        self.index, self.q, self.seq, self.current, self.signals = index, q, seq, current, signals
+
+    def run(self):
+        try:
+            stale = lambda: self.current() != self.seq
+            ranked = self.index.rank(self.q, SPOTLIGHT_LIMIT, cancel=stale)
+            rows = []
+            for i, (_, d) in enumerate(ranked):
+                if stale():
+                    return
+                it = self.index.records[d]
+                if it["type"] == "bind":
+                    label = f"Бинд • {it['category']} • {it['key']} — {it['text'][:60]}"
+                elif it["type"] == "ppv":
+                    label = f"PPV • {it['category']} — {it['text'][:60]}"
+                else:
+                    label = f"Рассылка • {it['category']} — {it['text'][:60]}"
+                rows.append((label, self.index.spans(label, self.q) if self.q else [], it))
+                if len(rows) >= SPOTLIGHT_BATCH and i < len(ranked) - 1:
+                    self.signals.batch.emit(self.seq, rows, False)
+                    rows = []
+            if not stale():
+                self.signals.batch.emit(self.seq, rows, True)
+        except Exception:
+            logging.exception("Spotlight search failed")
+
+class HighlightDelegate(QtWidgets.QStyledItemDelegate):
+    # paints an item's text with the (start, length) spans stored under SPANS_ROLE underlined in bold
+    SPANS_ROLE = QtCore.Qt.UserRole + 1
+
+    def paint(self, painter: QtGui.QPainter, option, index):
+        spans = index.data(self.SPANS_ROLE)
+        if not spans:
+            return super().paint(painter, option, index)
+        opt = QtWidgets.QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        text = opt.text
+        opt.text = ""
+        style = opt.widget.style() if opt.widget else QtWidgets.QApplication.style()
+        style.drawControl(QtWidgets.QStyle.CE_ItemViewItem, opt, painter, opt.widget)
+        html, pos = [], 0
+        for start, n in sorted(spans):
+            if start < pos:
+                continue
+            html.append(html_escape(text[pos:start]))
+            html.append(f"<b><u>{html_escape(text[start:start + n])}</u></b>")
+            pos = start + n
+        html.append(html_escape(text[pos:]))
+        doc = QtGui.QTextDocument()
+        doc.setDefaultFont(opt.font)
+        doc.setDocumentMargin(0)
+        doc.setHtml("".join(html))
+        rect = style.subElementRect(QtWidgets.QStyle.SE_ItemViewItemText, opt, opt.widget)
+        ctx = QtGui.QAbstractTextDocumentLayout.PaintContext()
+        role = QtGui.QPalette.HighlightedText if opt.state & QtWidgets.QStyle.State_Selected else QtGui.QPalette.Text
+        ctx.palette.setColor(QtGui.QPalette.Text, opt.palette.color(role))
+        painter.save()
+        painter.translate(rect.left(), rect.top() + max(0, (rect.height() - doc.size().height()) / 2))
+        painter.setClipRect(QtCore.QRectF(0, 0, rect.width(), rect.height()))
+        doc.documentLayout().draw(painter, ctx)
+        painter.restore()
+
 class SpotlightDialog(GlassDialog):
+    # Keystrokes restart a debounce timer; the query then runs as a SearchTask
+    # on a single-thread pool (the index's term cache isn't shared between
+    # threads) and rows arrive in batches. Batches of superseded queries are
+    # dropped, and the first batch of each query feeds SPOTLIGHT_LATENCY.
     def __init__(self, mw: 'MainWindow'):
         super().__init__(mw.get_theme, mw, 720, 420, "Поиск")
         self.mw = mw
@@ -1068,55 +2993,81 @@ class SpotlightDialog(GlassDialog):
         self.query = QtWidgets.QLineEdit()
         self.query.setPlaceholderText("Поиск по биндам, категориям, PPV, рассылкам…")
         self.list = QtWidgets.QListWidget()
+        self.list.setItemDelegate(HighlightDelegate(self.list))
+        self.list.setUniformItemSizes(True)
         lay.addWidget(self.query)
         lay.addWidget(self.list, 1)
-        self.query.textChanged.connect(self._refresh)
+        self.query.textChanged.connect(self._on_text)
+        self.query.returnPressed.connect(lambda: self._open_item(self.list.currentItem()))
         self.list.itemActivated.connect(self._open_item)
         self._items: list[dict[str, Any]] = []
-        self._refresh("")
-
-    def _collect(self) -> list[dict[str, Any]]:
-        out: list[dict[str, Any]] = []
-        for b in self.mw.binds:
-            out.append({"type": "bind", "key": b.key, "category": b.category, "text": b.text})
-        for area in ("ppv", "mailing"):
-            for cat in self.mw.content_db.categories(area):
-                for it in self.mw.content_db.items(area, cat):
-                    out.append({"type": area, "category": cat, "text": it.get("text", ""), "id": it.get("id")})
-        return out
-
-    def _refresh(self, q: str):
-        self.list.clear()
-        q = (q or "").strip().lower()
-        items = self._collect()
-        self._items = []
-        for it in items:
-            blob = " ".join(str(v) for v in it.values()).lower()
-            if q and q not in blob:
-                continue
-            label = ""
-            if it["type"] == "bind":
-                label = f"Бинд • {it['category']} • {it['key']} — {it['text'][:60]}"
-            elif it["type"] == "ppv":
-                label = f"PPV • {it['category']} — {it['text'][:60]}"
-            else:
-                label = f"Рассылка • {it['category']} — {it['text'][:60]}"
-            self.list.addItem(label)
+        self.index = mw.search_index
+        self.index.sync(mw.binds, mw.content_db)  # modal: nothing changes while we're open
+        self._seq = 0
+        self._shown = 0          # seq of the rows currently in the list
+        self._typed_at = 0.0
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._signals = SearchSignals(self)
+        self._signals.batch.connect(self._on_batch)
+        self._debounce = QtCore.QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(SPOTLIGHT_DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._start_query)
+        self._typed_at = time.perf_counter()
+        self._start_query()
+
+    def _on_text(self, _q: str):
+        self._typed_at = time.perf_counter()
+        self._seq += 1  # cancels whatever is running now
+        self._debounce.start()
+
+    def _start_query(self):
+        self._seq += 1
+        self._pool.start(SearchTask(self.index, self.query.text(), self._seq, lambda: self._seq, self._signals))
+
+    def _on_batch(self, seq: int, rows: list, last: bool):
+        if seq != self._seq:
+            return
+        if self._shown != seq:
+            self._shown = seq
+            self.list.clear()
+            self._items = []
+            SPOTLIGHT_LATENCY.add(time.perf_counter() - self._typed_at)
+        self.list.setUpdatesEnabled(False)
+        for label, spans, it in rows:
+            row = QtWidgets.QListWidgetItem(label)
+            if spans:
+                row.setData(HighlightDelegate.SPANS_ROLE, spans)
+            self.list.addItem(row)
             self._items.append(it)
-
-    def _open_item(self, item: QtWidgets.QListWidgetItem):
-        row = self.list.row(item)
+        self.list.setUpdatesEnabled(True)
+        if self._items and self.list.currentRow() < 0:
+            self.list.setCurrentRow(0)
+        if last:
+            SPOTLIGHT_LATENCY.log()
+
+    def done(self, r: int):
+        self._seq += 1
+        self._debounce.stop()
+        self._pool.waitForDone(1000)
+        SPOTLIGHT_LATENCY.log(force=True)
+        super().done(r)
+
+    def _open_item(self, item: Optional[QtWidgets.QListWidgetItem]):
+        row = self.list.row(item) if item is not None else -1
         if not (0 <= row < len(self._items)):
             return
         it = self._items[row]
         if it["type"] == "bind":
             self.mw.switch_page(self.mw.page_binds)
+            self.mw.page_binds.select_bind(it["row"])
         elif it["type"] == "ppv":
             self.mw.switch_page(self.mw.page_ppv)
-            self.mw.page_ppv.cmb.setCurrentText(it["category"])
+            self.mw.page_ppv.select_item(it["category"], it["id"])
         else:
             self.mw.switch_page(self.mw.page_mail)
-            self.mw.page_mail.cmb.setCurrentText(it["category"])
+            self.mw.page_mail.select_item(it["category"], it["id"])
         self.accept()
 
 class OnboardingOverlay(QtWidgets.QFrame):
@@ -1255,17 +3206,371 @@ class OnboardingOverlay(QtWidgets.QFrame):
         except Exception:
             pass
 
+# ---------- Text triggers ----------
+# Aho-Corasick automaton built once per apply_binds and stepped per keystroke:
+# feed() is O(1) amortized and returns the longest trigger ending at the cursor
+# (first bind wins when two binds share a trigger).
+class TriggerMatcher:
+    def __init__(self, binds: list[Bind], history: int = 120):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[Optional[Bind]] = [None]
+        self._states: deque[int] = deque(maxlen=history)
+        for b in binds:
+            trig = b.key.strip().lower()
+            if not trig:
+                continue
+            s = 0
+            for ch in trig:
+                nxt = self._goto[s].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(None)
+                    self._goto[s][ch] = nxt
+                s = nxt
+            if self._out[s] is None:
+                self._out[s] = b
+        # BFS: fail links + inherit the longest proper-suffix match
+        queue = deque(self._goto[0].values())
+        while queue:
+            s = queue.popleft()
+            for ch, nxt in self._goto[s].items():
+                queue.append(nxt)
+                f = self._fail[s]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                if self._out[nxt] is None:
+                    self._out[nxt] = self._out[self._fail[nxt]]
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    def _next(self, s: int, ch: str) -> int:
+        goto = self._goto
+        nxt = goto[s].get(ch)
+        if nxt is not None:
+            return nxt
+        f = s
+        while f and ch not in goto[f]:
+            f = self._fail[f]
+        nxt = goto[f].get(ch, 0)
+        goto[s][ch] = nxt  # memoize as a DFA edge
+        return nxt
+
+    def feed(self, ch: str) -> Optional[Bind]:
+        s = self._next(self._states[-1] if self._states else 0, ch)
+        self._states.append(s)
+        return self._out[s]
+
+    def backspace(self):
+        if self._states:
+            self._states.pop()
+
+    def reset(self):
+        self._states.clear()
+
+# ---------- Injection worker ----------
+INJECT_CANCEL_HOTKEY = "esc"
+INJECT_TYPE_CHUNK = 32
+
+class InjectionWorker:
+    # Single background thread that performs injections so the keyboard hook
+    # callback returns immediately. Bounded queue: a job already pending under
+    # the same key is coalesced; when full, "drop_oldest" evicts the head and
+    # "drop_new" rejects the incoming job.
+    def __init__(self, maxlen: int = 16, policy: str = "drop_oldest", on_idle=None, idle_delay: float = 0.25):
+        self.maxlen = maxlen
+        self.policy = policy
+        # called once the queue has stayed empty for idle_delay after a job
+        self.on_idle = on_idle
+        self.idle_delay = idle_delay
+        self._idle_due = False
+        # set from submit until the queue has gone idle: keystrokes we synthesize
+        # (including between the jobs of a burst) must not feed the trigger matcher
+        self.busy = threading.Event()
+        self._jobs: deque[tuple[Any, Any, float]] = deque()
+        self._cond = threading.Condition()
+        self._cancel = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = False
+        self.latencies: deque[float] = deque(maxlen=512)  # enqueue -> inject start, seconds
+        self.injected = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def submit(self, key: Any, job) -> bool:
+        with self._cond:
+            if any(k == key for k, _, _ in self._jobs):
+                self.coalesced += 1
+                return False
+            if len(self._jobs) >= self.maxlen:
+                self.dropped += 1
+                if self.policy == "drop_new":
+                    return False
+                self._jobs.popleft()
+            self._jobs.append((key, job, time.perf_counter()))
+            self.busy.set()
+            if self._thread is None:
+                self._stop = False
+                self._thread = threading.Thread(target=self._run, name="whybinder-inject", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return True
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._jobs)
+
+    def cancel(self):
+        # drop everything pending and ask the in-flight job to stop at its next chunk
+        with self._cond:
+            self.dropped += len(self._jobs)
+            self._jobs.clear()
+        self._cancel.set()
+
+    def stop(self, timeout: float = 1.0):
+        # Pending jobs are dropped, not injected, and the idle hook (the clipboard
+        # restore) runs here on the caller's thread instead of waiting out the
+        # idle window, so nothing of ours is left on the clipboard at exit.
+        with self._cond:
+            self._stop = True
+            self.dropped += len(self._jobs)
+            self._jobs.clear()
+            self._cond.notify()
+        self._cancel.set()
+        t = self._thread
+        if t is not None:
+            t.join(timeout)
+        self._thread = None
+        self._idle_due = False
+        if self.on_idle is not None:
+            try:
+                self.on_idle()
+            except Exception:
+                logging.exception("Injection idle hook failed")
+        self.busy.clear()
+
+    def _run(self):
+        while True:
+            idle = False
+            with self._cond:
+                while not self._jobs and not self._stop:
+                    if self._idle_due:
+                        self._cond.wait(self.idle_delay)
+                        if not self._jobs and not self._stop:
+                            self._idle_due = False
+                            idle = True
+                            break
+                    else:
+                        self._cond.wait()
+                if self._stop:
+                    return
+                if not idle:
+                    _, job, t0 = self._jobs.popleft()
+                    self._cancel.clear()
+                    self._idle_due = True
+            if idle:
+                if self.on_idle is not None:
+                    try:
+                        self.on_idle()
+                    except Exception:
+                        logging.exception("Injection idle hook failed")
+                with self._cond:
+                    if not self._jobs:
+                        self.busy.clear()
+                continue
+            self.latencies.append(time.perf_counter() - t0)
+            try:
+                job(self._cancel)
+            except Exception:
+                logging.exception("Injection failed")
+            self.injected += 1
+            if self.injected % 50 == 0:
+                logging.info("Injection latency: %s", self.stats())
+
+    def stats(self) -> dict:
+        lat = sorted(self.latencies)
+        out: dict[str, Any] = {"n": len(lat), "dropped": self.dropped, "coalesced": self.coalesced}
+        if lat:
+            pick = lambda q: round(lat[min(len(lat) - 1, int(q * len(lat)))] * 1000, 2)
+            out.update(p50_ms=pick(0.5), p95_ms=pick(0.95), max_ms=round(lat[-1] * 1000, 2))
+        return out
+
+# ---------- Clipboard ----------
+class PyperclipBackend:
+    name = "pyperclip"
+
+    def snapshot(self) -> Any:
+        return pyperclip.paste()
+
+    def restore(self, snap: Any):
+        pyperclip.copy(snap or "")
+
+    def set_text(self, text: str):
+        pyperclip.copy(text)
+
+    def close(self):
+        pass
+
+class QtClipboardBackend(QtCore.QObject):
+    # In-process QClipboard; calls from other threads are queued to the GUI thread.
+    # The caller waits for the result with a timeout rather than a blocking
+    # connection: the GUI thread may itself be joining the injection worker.
+    # A call given up on is marked so it never runs late.
+    name = "qt"
+    CALL_TIMEOUT = 2.0
+    _call = QtCore.Signal(object)
+
+    def __init__(self):
+        super().__init__()
+        self.moveToThread(QtWidgets.QApplication.instance().thread())
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._call.connect(self._run, QtCore.Qt.QueuedConnection)
+
+    def close(self):
+        # stop waiting on the GUI thread; direct calls from it keep working
+        self._closed.set()
+
+    @QtCore.Slot(object)
+    def _run(self, box: list):
+        # box: [fn, result, error, done event, abandoned]
+        with self._lock:
+            if box[4]:
+                return
+            try:
+                box[1] = box[0]()
+            except Exception as e:
+                box[2] = e
+            box[3].set()
+
+    def _invoke(self, fn):
+        if QtCore.QThread.currentThread() == self.thread():
+            return fn()
+        box = [fn, None, None, threading.Event(), False]
+        self._call.emit(box)
+        deadline = time.monotonic() + self.CALL_TIMEOUT
+        while not box[3].wait(0.02):
+            if self._closed.is_set() or time.monotonic() > deadline:
+                with self._lock:
+                    if not box[3].is_set():
+                        box[4] = True
+                        raise TimeoutError("clipboard call not served by the GUI thread")
+                break
+        if box[2] is not None:
+            raise box[2]
+        return box[1]
+
+    def snapshot(self) -> Any:
+        def grab():
+            src = QtWidgets.QApplication.clipboard().mimeData()
+            if src is None:
+                return {}
+            return {fmt: src.data(fmt).data() for fmt in src.formats()}
+        return self._invoke(grab)
+
+    def restore(self, snap: Any):
+        def put():
+            cb = QtWidgets.QApplication.clipboard()
+            if set(snap) <= {"text/plain"}:
+                cb.setText(snap.get("text/plain", b"").decode("utf-8", "replace"))
+                return
+            # rich contents (images, html, files): the clipboard takes ownership of the QMimeData
+            md = QtCore.QMimeData()
+            for fmt, raw in snap.items():
+                md.setData(fmt, QtCore.QByteArray(raw))
+            cb.setMimeData(md)
+        self._invoke(put)
+
+    def set_text(self, text: str):
+        self._invoke(lambda: QtWidgets.QApplication.clipboard().setText(text))
+
+def clipboard_backend():
+    if QtWidgets.QApplication.instance() is not None:
+        try:
+            return QtClipboardBackend()
+        except Exception:
+            pass
+    if pyperclip is not None:
+        return PyperclipBackend()
+    return None
+
+def copy_text(text: str):
+    # GUI-thread copy used by the pages: in-process clipboard first
+    app = QtWidgets.QApplication.instance()
+    if app is not None:
+        app.clipboard().setText(text)
+    elif pyperclip is not None:
+        pyperclip.copy(text)
+
+class ClipboardPaster:
+    # Paste via the clipboard without clobbering it: the user's contents are
+    # snapshotted before the first paste of a burst and restored once the
+    # injection queue goes idle, so rapid consecutive pastes share one
+    # snapshot/restore pair.
+    def __init__(self, backend):
+        self.backend = backend
+        self._saved: Any = None
+        self._dirty = False
+        self.timings: dict[str, deque[float]] = {}
+        self.pastes = 0
+
+    def paste(self, text: str, send):
+        t0 = time.perf_counter()
+        if not self._dirty:
+            try:
+                self._saved = self.backend.snapshot()
+            except Exception:
+                self._saved = None
+            self._dirty = True
+        self.backend.set_text(text)
+        send("ctrl+v")
+        self.timings.setdefault(self.backend.name, deque(maxlen=512)).append(time.perf_counter() - t0)
+        self.pastes += 1
+        if self.pastes % 50 == 0:
+            logging.info("Paste cost: %s", self.stats())
+
+    def restore(self):
+        # state is only dropped once the backend took the snapshot back, so a
+        # restore that timed out on the worker is retried by the final one
+        if not self._dirty:
+            return
+        if self._saved is not None:
+            self.backend.restore(self._saved)
+        self._dirty = False
+        self._saved = None
+
+    def stats(self) -> dict:
+        out = {}
+        for name, lat in self.timings.items():
+            if lat:
+                out[name] = {"n": len(lat), "mean_ms": round(sum(lat) / len(lat) * 1000, 3),
+                             "max_ms": round(max(lat) * 1000, 3)}
+        return out
+
 # ---------- Binder engine ----------
+def _combo_parts(key: str) -> frozenset[str]:
+    return frozenset(x.strip().lower() for x in key.replace(",", "+").split("+") if x.strip())
+
 class BinderEngine(QtCore.QObject):
     status = QtCore.Signal(str)
     def __init__(self):
         super().__init__()
         self.enabled = True
-        self._hotkeys = []
+        # id(bind) -> (bind, registered key, keyboard handle); the bind ref keeps the id stable
+        self._hotkeys: dict[int, tuple[Bind, str, Any]] = {}
         self.binds: list[Bind] = []
         self._text_hook = None
-        self._text_buffer = ""
-        self._injecting = False
+        self._matcher: Optional[TriggerMatcher] = None
+        self._trigger_sig: Optional[list[tuple[int, str]]] = None
+        backend = clipboard_backend()
+        self.paster = ClipboardPaster(backend) if backend is not None else None
+        self._worker = InjectionWorker(on_idle=self.paster.restore if self.paster is not None else None)
+        self._cancel_hk = None
+        self.hook_ops = 0  # keyboard add/remove/hook/unhook calls, for diagnostics
 
     def set_enabled(self, on: bool):
         self.enabled = bool(on)
@@ -1274,35 +3579,79 @@ class BinderEngine(QtCore.QObject):
     def clear_hotkeys(self):
         if keyboard is None:
             return
-        for hk in self._hotkeys:
-            try:
-                keyboard.remove_hotkey(hk)
-            except Exception:
-                pass
-        self._hotkeys = []
+        for bid in list(self._hotkeys):
+            self._remove_hotkey(bid)
         if self._text_hook is not None:
             try:
                 keyboard.unhook(self._text_hook)
+                self.hook_ops += 1
             except Exception:
                 pass
             self._text_hook = None
-            self._text_buffer = ""
+        self._matcher = None
+        self._trigger_sig = None
+        if self._cancel_hk is not None:
+            try:
+                keyboard.remove_hotkey(self._cancel_hk)
+                self.hook_ops += 1
+            except Exception:
+                pass
+            self._cancel_hk = None
+
+    def shutdown(self):
+        # GUI thread: release a worker waiting on us first, then stop it; the
+        # final clipboard restore runs right here
+        self.clear_hotkeys()
+        if self.paster is not None:
+            self.paster.backend.close()
+        self._worker.stop()
+
+    def _add_hotkey(self, b: Bind):
+        try:
+            hk = keyboard.add_hotkey(b.key, lambda bb=b: self._fire(bb), suppress=True, trigger_on_release=False)
+            self.hook_ops += 1
+            self._hotkeys[id(b)] = (b, b.key.strip(), hk)
+        except Exception:
+            pass
+
+    def _remove_hotkey(self, bid: int):
+        _, _, hk = self._hotkeys.pop(bid)
+        try:
+            keyboard.remove_hotkey(hk)
+            self.hook_ops += 1
+        except Exception:
+            pass
 
     def apply_binds(self, binds: list[Bind]):
+        # Diff against what is registered: only hotkeys whose bind was removed,
+        # disabled, re-keyed or added are touched; the rest keep firing.
         self.binds = binds[:]
-        self.clear_hotkeys()
         if keyboard is None:
             self.status.emit("keyboard не установлен — бинды не активны")
             return
 
-        # Fix: prioritize longer combos so F10+1 doesn't trigger F10
-        enabled = [b for b in self.binds if b.enabled and b.kind == "hotkey" and b.key.strip()]
-        enabled.sort(key=lambda b: len(b.key), reverse=True)
+        wanted = {id(b): b for b in self.binds if b.enabled and b.kind == "hotkey" and b.key.strip()}
+        for bid, (b, key, _) in list(self._hotkeys.items()):
+            if wanted.get(bid) is not b or b.key.strip() != key:
+                self._remove_hotkey(bid)
 
-        for b in enabled:
+        # Fix: prioritize longer combos so F10+1 doesn't trigger F10
+        added = [b for bid, b in wanted.items() if bid not in self._hotkeys]
+        added.sort(key=lambda b: len(b.key), reverse=True)
+        for b in added:
+            parts = _combo_parts(b.key)
+            shadowed = [ob for ob, key, _ in self._hotkeys.values()
+                        if len(key) < len(b.key.strip()) and _combo_parts(key) <= parts]
+            self._add_hotkey(b)
+            # shorter overlapping combos must stay registered after the longer one
+            for ob in shadowed:
+                self._remove_hotkey(id(ob))
+                self._add_hotkey(ob)
+        if self._cancel_hk is None:
             try:
-                hk = keyboard.add_hotkey(b.key, lambda bb=b: self._fire(bb), suppress=True, trigger_on_release=False)
-                self._hotkeys.append(hk)
+                # not suppressed: Esc keeps working in the target app
+                self._cancel_hk = keyboard.add_hotkey(INJECT_CANCEL_HOTKEY, self._worker.cancel, suppress=False)
+                self.hook_ops += 1
             except Exception:
                 pass
         self._setup_text_triggers()
@@ -1312,55 +3661,296 @@ class BinderEngine(QtCore.QObject):
         if keyboard is None:
             return
         triggers = [b for b in self.binds if b.enabled and b.kind == "text" and b.key.strip()]
-        if not triggers:
-            return
-
-        def on_key(e):
-            if self._injecting or not self.enabled:
-                return
-            name = (e.name or "").lower()
-            if name in ("space", "enter", "tab"):
-                self._text_buffer += " "
-            elif len(name) == 1:
-                self._text_buffer += name
-            elif name == "backspace":
-                self._text_buffer = self._text_buffer[:-1]
-            else:
-                return
-            self._text_buffer = self._text_buffer[-120:]
-            for b in triggers:
-                trig = b.key.strip().lower()
-                if trig and self._text_buffer.endswith(trig):
-                    try:
-                        self._injecting = True
-                        for _ in range(len(trig)):
-                            keyboard.send("backspace")
-                        keyboard.write(b.text, delay=0.0)
-                        self._text_buffer = ""
-                    finally:
-                        self._injecting = False
+        sig = [(id(b), b.key.strip().lower()) for b in triggers]
+        if sig != self._trigger_sig:
+            self._trigger_sig = sig
+            self._matcher = TriggerMatcher(triggers) if triggers else None
 
-        try:
-            self._text_hook = keyboard.on_release(on_key)
-        except Exception:
+        if triggers and self._text_hook is None:
+            try:
+                self._text_hook = keyboard.on_release(self._on_text_key)
+                self.hook_ops += 1
+            except Exception:
+                self._text_hook = None
+        elif not triggers and self._text_hook is not None:
+            try:
+                keyboard.unhook(self._text_hook)
+                self.hook_ops += 1
+            except Exception:
+                pass
             self._text_hook = None
 
+    def _on_text_key(self, e):
+        matcher = self._matcher
+        if self._worker.busy.is_set() or not self.enabled or matcher is None:
+            return
+        name = (e.name or "").lower()
+        if name in ("space", "enter", "tab"):
+            b = matcher.feed(" ")
+        elif len(name) == 1:
+            b = matcher.feed(name)
+        elif name == "backspace":
+            matcher.backspace()
+            return
+        else:
+            return
+        if b is None:
+            return
+        matcher.reset()
+        erase = len(b.key.strip())
+        self._worker.submit(("text", id(b)), lambda cancel, bb=b: self._inject(bb, cancel, erase=erase, paste=False))
+
     def _fire(self, b: Bind):
         if not self.enabled:
             return
+        self._worker.submit(("hotkey", id(b)), lambda cancel, bb=b: self._inject(bb, cancel, paste=bb.mode != "type"))
+
+    def _inject(self, b: Bind, cancel: threading.Event, erase: int = 0, paste: bool = True):
+        # runs on the injection worker thread; _worker.busy masks our own keystrokes
         try:
-            if b.mode == "type" or pyperclip is None:
+            if keyboard is not None:
+                for _ in range(erase):
+                    keyboard.send("backspace")
+            if not paste or self.paster is None:
                 if keyboard is not None:
-                    keyboard.write(b.text, delay=0.0)
-            else:
+                    text = b.text
+                    for i in range(0, len(text), INJECT_TYPE_CHUNK):
+                        if cancel.is_set():
+                            break
+                        keyboard.write(text[i:i + INJECT_TYPE_CHUNK], delay=0.0)
+            elif not cancel.is_set() and keyboard is not None:
                 # paste mode
-                pyperclip.copy(b.text)
-                if keyboard is not None:
-                    keyboard.send("ctrl+v")
+                self.paster.paste(b.text, keyboard.send)
         except Exception:
             pass
 
 # ---------- Pages ----------
+class BindsModel(QtCore.QAbstractTableModel):
+    # Table over the live binds list, kept in display order (favorites, then
+    # category, then trigger) through self.order: model row -> index in binds.
+    # Mutate through the helpers so views get fine-grained insert/remove/
+    # dataChanged signals and a row only moves when its sort key changed;
+    # set_binds() is the only full reset. Sorting lives here, in Python, once
+    # per change: a proxy sort would cost a data() round-trip per comparison.
+    COLUMNS = ["★","Категория","Тип","Триггер","Режим","Вкл","Текст (превью)"]
+    ID_ROLE = QtCore.Qt.UserRole + 1   # stable per-bind id; survives sorting, filtering and deletes
+    _ON, _OFF = QtGui.QColor(90, 230, 140), QtGui.QColor(255, 120, 120)
+    _FLASH = QtGui.QColor(255, 255, 255, 30)
+    _CENTER = int(QtCore.Qt.AlignCenter)
+
+    def __init__(self, binds: list[Bind], parent=None):
+        super().__init__(parent)
+        self.binds = binds
+        self.order: list[int] = []
+        self._row: list[int] = []
+        self._flash: set[int] = set()   # bind indices
+        self.uids: list[int] = []       # parallel to binds
+        self._at: dict[int, int] = {}   # uid -> index in binds
+        self._next_uid = 1
+        self._assign()
+        self._resort()
+
+    def _assign(self):
+        n = len(self.binds)
+        self.uids = list(range(self._next_uid, self._next_uid + n))
+        self._next_uid += n
+        self._at = {u: i for i, u in enumerate(self.uids)}
+
+    def uid(self, i: int) -> int:
+        return self.uids[i]
+
+    def uid_at(self, row: int) -> int:
+        return self.uids[self.order[row]]
+
+    def index_of(self, uid: int) -> Optional[int]:
+        return self._at.get(uid)
+
+    @staticmethod
+    def _key(b: Bind):
+        return (not b.favorite, b.category, b.key)
+
+    def _resort(self):
+        binds = self.binds
+        self.order = sorted(range(len(binds)), key=lambda i: self._key(binds[i]))
+        self._reverse()
+
+    def _reverse(self):
+        self._row = [0] * len(self.order)
+        for r, i in enumerate(self.order):
+            self._row[i] = r
+
+    def bind_index(self, row: int) -> int:
+        return self.order[row]
+
+    def row_of(self, i: int) -> int:
+        return self._row[i]
+
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.order)
+
+    def columnCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        r, c = index.row(), index.column()
+        if not (0 <= r < len(self.order)):
+            return None
+        i = self.order[r]
+        b = self.binds[i]
+        if role == QtCore.Qt.DisplayRole:
+            if c == 0:
+                return "★" if b.favorite else "☆"
+            if c == 1:
+                return b.category
+            if c == 2:
+                return b.kind
+            if c == 3:
+                return b.key
+            if c == 4:
+                return b.mode
+            if c == 5:
+                return "●"
+            prev = (b.text or "").replace("\n", "  ")
+            return prev[:80] + "…" if len(prev) > 80 else prev
+        if role == self.ID_ROLE:
+            return self.uids[i]
+        if role == QtCore.Qt.TextAlignmentRole and c in (0, 5):
+            return self._CENTER
+        if role == QtCore.Qt.ForegroundRole and c == 5:
+            return self._ON if b.enabled else self._OFF
+        if role == QtCore.Qt.BackgroundRole and i in self._flash:
+            return self._FLASH
+        if role == QtCore.Qt.ToolTipRole and c == 6:
+            return (b.text or "").replace("\n", "  ")
+        return None
+
+    def set_binds(self, binds: list[Bind]):
+        self.beginResetModel()
+        self.binds = binds
+        self._flash.clear()
+        self._assign()
+        self._resort()
+        self.endResetModel()
+
+    def _emit_rows(self, rows):
+        # one dataChanged per contiguous run of model rows
+        rows = sorted(set(rows))
+        i = 0
+        while i < len(rows):
+            j = i
+            while j + 1 < len(rows) and rows[j + 1] == rows[j] + 1:
+                j += 1
+            self.dataChanged.emit(self.index(rows[i], 0), self.index(rows[j], len(self.COLUMNS) - 1))
+            i = j + 1
+
+    def touch(self, idxs):
+        # binds (by index) edited in place: repaint their rows, and move the
+        # ones whose sort key changed with a layout change that keeps selection
+        idxs = [i for i in set(idxs) if 0 <= i < len(self.binds)]
+        if not idxs:
+            return
+        binds, order = self.binds, self.order
+        key = self._key
+        moved = False
+        for i in idxs:
+            r = self._row[i]
+            k = key(binds[i])
+            if (r > 0 and key(binds[order[r - 1]]) > k) or (r + 1 < len(order) and k > key(binds[order[r + 1]])):
+                moved = True
+                break
+        if not moved:
+            self._emit_rows(self._row[i] for i in idxs)
+            return
+        self.layoutAboutToBeChanged.emit()
+        old = self.persistentIndexList()
+        held = [(self.order[ix.row()], ix.column()) for ix in old]
+        self._resort()
+        self.changePersistentIndexList(old, [self.index(self._row[i], c) for i, c in held])
+        self.layoutChanged.emit()
+
+    def replace(self, i: int, b: Bind):
+        self.binds[i] = b
+        self.touch([i])
+
+    def append(self, b: Bind) -> int:
+        i = len(self.binds)
+        k = self._key(b)
+        keys = [self._key(self.binds[j]) for j in self.order]
+        row = bisect.bisect_right(keys, k)
+        self.beginInsertRows(QtCore.QModelIndex(), row, row)
+        self.binds.append(b)
+        self.uids.append(self._next_uid)
+        self._at[self._next_uid] = i
+        self._next_uid += 1
+        self.order.insert(row, i)
+        self._reverse()
+        self.endInsertRows()
+        return i
+
+    def remove(self, idxs):
+        gone = {i for i in idxs if 0 <= i < len(self.binds)}
+        if not gone:
+            return
+        self._flash.clear()
+        # one removeRows per contiguous run of display rows; the binds list is
+        # compacted afterwards, when no visible row refers to a removed bind
+        rows = sorted((self._row[i] for i in gone), reverse=True)
+        k = 0
+        while k < len(rows):
+            hi = lo = rows[k]
+            while k + 1 < len(rows) and rows[k + 1] == lo - 1:
+                k += 1
+                lo = rows[k]
+            self.beginRemoveRows(QtCore.QModelIndex(), lo, hi)
+            del self.order[lo:hi + 1]
+            self.endRemoveRows()
+            k += 1
+        remap, j = [-1] * len(self.binds), 0
+        for i in range(len(self.binds)):
+            if i not in gone:
+                remap[i] = j
+                j += 1
+        self.binds[:] = [b for i, b in enumerate(self.binds) if i not in gone]  # in place: mw.binds is this list
+        self.uids = [u for i, u in enumerate(self.uids) if i not in gone]
+        self._at = {u: i for i, u in enumerate(self.uids)}
+        self.order = [remap[i] for i in self.order]
+        self._reverse()
+
+    def flash(self, i: int, ms: int = 180):
+        self._flash.add(i)
+        self._emit_rows([self._row[i]])
+        QtCore.QTimer.singleShot(ms, lambda: self._unflash(i))
+
+    def _unflash(self, i: int):
+        if i in self._flash:
+            self._flash.discard(i)
+            if i < len(self._row):
+                self._emit_rows([self._row[i]])
+
+class BindsProxy(QtCore.QSortFilterProxyModel):
+    # category filter on top of BindsModel's own order; header clicks sort by a
+    # column and a third click (clearable indicator) goes back to model order.
+    # The filter is Qt's own anchored regex on the category column: with no
+    # category set it never calls back into Python, and dynamicSortFilter only
+    # re-checks the rows named in a dataChanged
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.category = ""
+        self.setFilterKeyColumn(1)
+        self.setDynamicSortFilter(True)
+
+    def set_category(self, cat: str):
+        cat = "" if cat == "Все" else (cat or "")
+        if cat != self.category:
+            self.category = cat
+            pattern = "^" + QtCore.QRegularExpression.escape(cat) + "$" if cat else ""
+            self.setFilterRegularExpression(pattern)
+
 class BindsPage(QtWidgets.QWidget):
     def __init__(self, mw: 'MainWindow'):
         super().__init__()
@@ -1368,7 +3958,7 @@ class BindsPage(QtWidgets.QWidget):
 
         top = QtWidgets.QHBoxLayout()
         self.cmb_cat = QtWidgets.QComboBox()
-        self.cmb_cat.currentTextChanged.connect(self.refresh)
+        self.cmb_cat.currentTextChanged.connect(self._filter_changed)
         btn_cat = QtWidgets.QPushButton("Категории")
         try:
             btn_cat.clicked.connect(self.mw.open_categories)
@@ -1380,14 +3970,23 @@ class BindsPage(QtWidgets.QWidget):
         top.addWidget(btn_cat)
         top.addStretch(1)
 
-        self.table = QtWidgets.QTableWidget(0, 7)
-        self.table.setHorizontalHeaderLabels(["★","Категория","Тип","Триггер","Режим","Вкл","Текст (превью)"])
+        self.model = BindsModel(self.mw.binds, self)
+        self.proxy = BindsProxy(self)
+        self.proxy.setSourceModel(self.model)
+        self.table = QtWidgets.QTableView()
+        self.table.setModel(self.proxy)
         self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.horizontalHeader().setResizeContentsPrecision(50)
+        self.table.horizontalHeader().setSortIndicator(-1, QtCore.Qt.AscendingOrder)
+        self.table.horizontalHeader().setSortIndicatorClearable(True)
+        self.table.setSortingEnabled(True)
         self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
         self.table.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
         self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+        self.table.setWordWrap(False)
         self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
-        self.table.cellClicked.connect(self._cell_clicked)
+        self.table.clicked.connect(self._cell_clicked)
         self.table.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
         self.table.customContextMenuRequested.connect(self._open_context_menu)
 
@@ -1455,45 +4054,31 @@ class BindsPage(QtWidgets.QWidget):
                 self.cmb_cat.addItem(c)
         self.cmb_cat.blockSignals(False)
 
+    def _setup_categories_keep(self, cats: list[str]):
+        # refill the combo without losing the current filter
+        cur = self.cmb_cat.currentText()
+        self.setup_categories(cats)
+        self.cmb_cat.setCurrentText(cur)
+        self.proxy.set_category(self.cmb_cat.currentText())
+
     def refresh(self):
+        # full rebuild, for when mw.binds was replaced or edited behind the model's back
         old_geom = self.table.geometry()
-        self.table.setRowCount(0)
-        cat = self.cmb_cat.currentText()
-        binds = self.mw.binds
-        if cat and cat != "Все":
-            binds = [b for b in binds if b.category == cat]
-        binds = sorted(binds, key=lambda b: (not b.favorite, b.category, b.key))
-        for b in binds:
-            r = self.table.rowCount()
-            self.table.insertRow(r)
-            star = QtWidgets.QTableWidgetItem("★" if b.favorite else "☆")
-            star.setTextAlignment(QtCore.Qt.AlignCenter)
-            self.table.setItem(r, 0, star)
-            self.table.setItem(r, 1, QtWidgets.QTableWidgetItem(b.category))
-            self.table.setItem(r, 2, QtWidgets.QTableWidgetItem(b.kind))
-            self.table.setItem(r, 3, QtWidgets.QTableWidgetItem(b.key))
-            self.table.setItem(r, 4, QtWidgets.QTableWidgetItem(b.mode))
-            status = QtWidgets.QTableWidgetItem("●" if b.enabled else "●")
-            status.setTextAlignment(QtCore.Qt.AlignCenter)
-            status.setForeground(QtGui.QBrush(QtGui.QColor(90, 230, 140) if b.enabled else QtGui.QColor(255, 120, 120)))
-            self.table.setItem(r, 5, status)
-            prev = (b.text or "").replace("\n","  ")
-            if len(prev) > 80:
-                short = prev[:80] + "…"
-            else:
-                short = prev
-            item = QtWidgets.QTableWidgetItem(short)
-            item.setToolTip(prev)
-            self.table.setItem(r, 6, item)
+        self.model.set_binds(self.mw.binds)
+        self.proxy.set_category(self.cmb_cat.currentText())
         self.table.resizeColumnsToContents()
         self.table.horizontalHeader().setSectionResizeMode(6, QtWidgets.QHeaderView.Stretch)
         self._animate_table_reorder(old_geom)
 
+    def _filter_changed(self, cat: str):
+        self.proxy.set_category(cat)
+
     def _animate_table_reorder(self, old_geom: QtCore.QRect):
         try:
             new_geom = self.table.geometry()
-            if old_geom == new_geom:
-                return
+            sched = Anim.scheduler()
+            if old_geom == new_geom or sched.performance_mode or not sched.allow():
+                return  # the ghost costs a grab of the whole table
             ghost = QtWidgets.QLabel(self.table.parentWidget())
             pm = self.table.grab()
             ghost.setPixmap(pm)
@@ -1504,47 +4089,62 @@ class BindsPage(QtWidgets.QWidget):
             anim.setStartValue(old_geom)
             anim.setEndValue(new_geom)
             anim.setEasingCurve(QtCore.QEasingCurve.OutCubic)
-            anim.start(QtCore.QAbstractAnimation.DeleteWhenStopped)
+            sched.run(anim, ghost, b"geometry")
             QtCore.QTimer.singleShot(220, ghost.deleteLater)
         except Exception:
             pass
 
+    def _view_row(self, i: int) -> int:
+        # table row showing self.mw.binds[i], or -1 when the filter hides it
+        return self.proxy.mapFromSource(self.model.index(self.model.row_of(i), 0)).row()
+
+    def select_bind(self, i: int):
+        # select self.mw.binds[i] in the table, widening the category filter if it hides it
+        if not (0 <= i < len(self.mw.binds)):
+            return
+        if self._view_row(i) < 0:
+            self.cmb_cat.setCurrentText("Все")
+        r = self._view_row(i)
+        if r >= 0:
+            self.table.selectRow(r)
+            self.table.scrollTo(self.proxy.index(r, 0), QtWidgets.QAbstractItemView.PositionAtCenter)
+
+    def selected_ids(self) -> list[int]:
+        # stable ids of the selected rows, O(1) per row. Walks the raw selection
+        # ranges: selectedRows() and mapSelectionToSource() are quadratic-ish in
+        # the number of ranges, which a ctrl-click multi-select produces plenty of
+        m, proxy = self.model, self.proxy
+        rows: set[int] = set()
+        for rng in self.table.selectionModel().selection():
+            rows.update(range(rng.top(), rng.bottom() + 1))
+        return [m.uid_at(proxy.mapToSource(proxy.index(r, 0)).row()) for r in sorted(rows)]
+
+    def _indices_of(self, uids) -> list[int]:
+        # current positions in mw.binds of the given ids; ids deleted meanwhile are skipped
+        return sorted(i for i in (self.model.index_of(u) for u in uids) if i is not None)
+
     def selected_indices(self) -> list[int]:
-        rows = sorted({i.row() for i in self.table.selectionModel().selectedRows()})
-        if not rows:
-            return []
-        # map visible rows to real binds by key+text matching (stable)
-        cat = self.cmb_cat.currentText()
-        visible = self.mw.binds if (cat=="Все" or not cat) else [b for b in self.mw.binds if b.category==cat]
-        visible = sorted(visible, key=lambda b: (not b.favorite, b.category, b.key))
-        visible = sorted(visible, key=lambda b: (not b.favorite, b.category, b.key))
-        out = []
-        for r in rows:
-            if 0 <= r < len(visible):
-                b = visible[r]
-                # find in global list
-                for i, gb in enumerate(self.mw.binds):
-                    if gb is b:
-                        out.append(i); break
-        return out
+        return self._indices_of(self.selected_ids())
 
-    def _cell_clicked(self, row: int, col: int):
-        if col != 0:
+    def _cell_clicked(self, ix: QtCore.QModelIndex):
+        if ix.column() != 0:
             return
-        cat = self.cmb_cat.currentText()
-        visible = self.mw.binds if (cat=="Все" or not cat) else [b for b in self.mw.binds if b.category==cat]
-        if 0 <= row < len(visible):
-            b = visible[row]
+        # resolve through the stable id, not the row: the proxy may have re-sorted meanwhile
+        i = self.model.index_of(ix.data(BindsModel.ID_ROLE))
+        if i is not None:
+            b = self.mw.binds[i]
             b.favorite = not b.favorite
+            self.model.touch([i])   # repaints (and if needed moves) just this row
             self.mw.save_all()
-            self.refresh()
-            self._flash_row(row)
-            self._sparkle(row, col)
+            self._flash_row(i)
+            self._sparkle(self._view_row(i), 0)
             Anim.bounce(self.table, 140)
 
     def _sparkle(self, row: int, col: int):
         try:
-            rect = self.table.visualItemRect(self.table.item(row, col))
+            if not Anim.scheduler().allow(effect=True):
+                return
+            rect = self.table.visualRect(self.proxy.index(row, col))
             lbl = QtWidgets.QLabel("★", self.table.viewport())
             lbl.setStyleSheet("QLabel{color: rgba(255,255,255,0.9); font-size: 18px;}")
             lbl.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents, True)
@@ -1562,7 +4162,7 @@ class BindsPage(QtWidgets.QWidget):
             a2.setDuration(420)
             group = QtCore.QParallelAnimationGroup(lbl)
             group.addAnimation(a1); group.addAnimation(a2)
-            group.start(QtCore.QAbstractAnimation.DeleteWhenStopped)
+            Anim.scheduler().run(group, lbl, b"sparkle", effect=True)
             QtCore.QTimer.singleShot(450, lbl.deleteLater)
         except Exception:
             pass
@@ -1585,13 +4185,9 @@ class BindsPage(QtWidgets.QWidget):
         elif action == act_copy:
             self.copy_bind()
 
-    def _flash_row(self, row: int):
+    def _flash_row(self, i: int):
         try:
-            for col in range(self.table.columnCount()):
-                item = self.table.item(row, col)
-                if item:
-                    item.setBackground(QtGui.QColor(255, 255, 255, 30))
-            QtCore.QTimer.singleShot(180, lambda: self.refresh())
+            self.model.flash(i)
         except Exception:
             pass
 
@@ -1599,16 +4195,16 @@ class BindsPage(QtWidgets.QWidget):
         dlg = BindEditor(self.mw.get_theme, self.mw, None, self.mw.categories)
         if dlg.exec() == QtWidgets.QDialog.Accepted and dlg.result_bind:
             Anim.fade(self.table_card, 1.0, 0.0, 120)
-            self.mw.binds.append(dlg.result_bind)
+            i = self.model.append(dlg.result_bind)
             if dlg.result_bind.category not in self.mw.categories:
                 self.mw.categories.append(dlg.result_bind.category)
             self.mw.save_all()
             self.mw.engine.apply_binds(self.mw.binds)
-            self.setup_categories(self.mw.categories)
-            QtCore.QTimer.singleShot(120, self._finish_add)
+            self._setup_categories_keep(self.mw.categories)
+            QtCore.QTimer.singleShot(120, lambda: self._finish_add(i))
 
-    def _finish_add(self):
-        self.refresh()
+    def _finish_add(self, i: int):
+        self.select_bind(i)
         Anim.pop(self.table, 160)
         Anim.fade(self.table_card, 0.0, 1.0, 160)
 
@@ -1619,31 +4215,28 @@ class BindsPage(QtWidgets.QWidget):
         i = idxs[0]
         dlg = BindEditor(self.mw.get_theme, self.mw, self.mw.binds[i], self.mw.categories)
         if dlg.exec() == QtWidgets.QDialog.Accepted and dlg.result_bind:
-            self.mw.binds[i] = dlg.result_bind
+            self.model.replace(i, dlg.result_bind)
             if dlg.result_bind.category not in self.mw.categories:
                 self.mw.categories.append(dlg.result_bind.category)
             self.mw.save_all()
             self.mw.engine.apply_binds(self.mw.binds)
-            self.setup_categories(self.mw.categories)
-            self.refresh()
+            self._setup_categories_keep(self.mw.categories)
 
     def delete_binds(self):
-        idxs = self.selected_indices()
-        if not idxs:
+        ids = self.selected_ids()
+        if not ids:
             return
-        idxs = sorted(idxs, reverse=True)
-        dlg = ConfirmDialog(self.mw.get_theme, self, "Удалить", f"Удалить выбранные бинды: {len(idxs)}?")
+        dlg = ConfirmDialog(self.mw.get_theme, self, "Удалить", f"Удалить выбранные бинды: {len(ids)}?")
         if dlg.exec() != QtWidgets.QDialog.Accepted:
             return
         Anim.fade(self.table_card, 1.0, 0.0, 140)
-        QtCore.QTimer.singleShot(140, lambda: self._finish_delete(idxs))
+        # ids, not positions: resolved after the fade in case the list moved meanwhile
+        QtCore.QTimer.singleShot(140, lambda: self._finish_delete(ids))
 
-    def _finish_delete(self, idxs: list[int]):
-        for i in idxs:
-            self.mw.binds.pop(i)
+    def _finish_delete(self, ids: list[int]):
+        self.model.remove(self._indices_of(ids))
         self.mw.save_all()
         self.mw.engine.apply_binds(self.mw.binds)
-        self.refresh()
         Anim.fade(self.table_card, 0.0, 1.0, 160)
         Anim.slide_in(self.table_card, dx=8, ms=160)
 
@@ -1654,10 +4247,10 @@ class BindsPage(QtWidgets.QWidget):
         b = self.mw.binds[idxs[0]]
         nb = Bind(**asdict(b))
         nb.key = b.key + "_copy"
-        self.mw.binds.append(nb)
+        i = self.model.append(nb)
         self.mw.save_all()
         self.mw.engine.apply_binds(self.mw.binds)
-        self.refresh()
+        self.select_bind(i)
 
     def copy_bind(self):
         idxs = self.selected_indices()
@@ -1665,10 +4258,7 @@ class BindsPage(QtWidgets.QWidget):
             Toast(self, "Выбери 1 бинд.", kind="info").show_toast()
             return
         b = self.mw.binds[idxs[0]]
-        if pyperclip is not None:
-            pyperclip.copy(b.text)
-        else:
-            QtWidgets.QApplication.clipboard().setText(b.text)
+        copy_text(b.text)
         Toast(self, "Бинд скопирован ✅", kind="info").show_toast()
         Anim.bounce(self.btn_copy, 180)
 
@@ -1697,27 +4287,163 @@ class BindsPage(QtWidgets.QWidget):
             return
         for i in idxs:
             self.mw.binds[i].enabled = on
+        self.model.touch(idxs)
         self.mw.save_all()
         self.mw.engine.apply_binds(self.mw.binds)
-        self.refresh()
 
     def mass_move(self):
-        idxs = self.selected_indices()
-        if not idxs:
+        ids = self.selected_ids()
+        if not ids:
             return
         cat, ok = QtWidgets.QInputDialog.getItem(self, "Категория", "Переместить в категорию:", self.mw.categories, 0, False)
         if not ok or not cat:
             return
+        idxs = self._indices_of(ids)
         for i in idxs:
             self.mw.binds[i].category = cat
+        self.model.touch(idxs)  # rows leave/enter the current filter on their own
         self.mw.save_all()
-        self.refresh()
 
     def _toggle_engine(self, on: bool):
         self.btn_engine.setText("Бинды включены" if on else "Бинды выключены")
         self.mw.engine.set_enabled(on)
         Anim.bounce(self.btn_engine, 180)
 
+class TaskSignals(QtCore.QObject):
+    progress = QtCore.Signal(int)   # percent done
+    batch = QtCore.Signal(object)   # ImportTask: one dedupe_import() batch to commit
+    done = QtCore.Signal(object)    # (result, error)
+
+class ImportTask(QtCore.QRunnable):
+    # reads and dedupes an import file off the GUI thread and hands the new items
+    # over batch by batch; the page commits each with db.add_many(), so the DB is
+    # only touched on the GUI thread. The page releases room after each commit:
+    # at most IMPORT_INFLIGHT batches are ever waiting, however big the file
+    def __init__(self, path: Path, known: set[bytes], mk, signals: TaskSignals):
+        super().__init__()
+        self.path, self.known, self.mk, self.signals = path, known, mk, signals
+        self.room = threading.Semaphore(IMPORT_INFLIGHT)
+        self.cancelled = threading.Event()
+
+    def run(self):
+        last = -1
+
+        def progress(done: int, total: int):
+            nonlocal last
+            pct = done * 100 // total
+            if pct != last:
+                last = pct
+                self.signals.progress.emit(pct)
+
+        counts = {"dup": 0, "bad": 0}
+        try:
+            for fresh in dedupe_import(iter_import(self.path, progress=progress, counts=counts),
+                                       self.known, self.mk, counts):
+                while not self.room.acquire(timeout=0.1):
+                    if self.cancelled.is_set():
+                        return
+                self.signals.batch.emit(fresh)
+            res = (counts, "")
+        except Exception as e:
+            logging.exception("Import failed: %s", self.path)
+            res = (None, str(e) or type(e).__name__)
+        try:
+            self.signals.done.emit(res)
+        except RuntimeError:
+            pass  # page already gone
+
+class ExportTask(QtCore.QRunnable):
+    # runs job(progress) off the GUI thread; job calls progress() once per item written
+    # (db.export_json / db.export_archive, which read through export_rows)
+    def __init__(self, job, total: int, signals: TaskSignals):
+        super().__init__()
+        self.job, self.total, self.signals = job, max(1, total), signals
+
+    def run(self):
+        done, last = 0, -1
+
+        def progress():
+            nonlocal done, last
+            done += 1
+            pct = done * 100 // self.total
+            if pct != last:
+                last = pct
+                self.signals.progress.emit(min(pct, 100))
+
+        try:
+            res = (self.job(progress), "")
+        except Exception as e:
+            logging.exception("Export failed")
+            res = (None, str(e) or type(e).__name__)
+        try:
+            self.signals.done.emit(res)
+        except RuntimeError:
+            pass
+
+class ContentListModel(QtCore.QAbstractListModel):
+    # Lazy list over one category's texts: nothing is rendered up front, the
+    # view asks data() only for the rows it paints. Previews of recently shown
+    # rows sit in a small LRU keyed by item id; the cached entry remembers the
+    # text object it came from, so an edited text is re-rendered on sight.
+    PREVIEW_LEN = 60
+    CACHE_SIZE = 512
+    ID_ROLE = QtCore.Qt.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows: Sequence[dict] = []
+        self._n = 0
+        self._row_of: Optional[dict[str, int]] = None
+        self._cache: OrderedDict[str, tuple[str, str]] = OrderedDict()
+
+    def set_rows(self, rows: Sequence[dict]):
+        self.beginResetModel()
+        self.rows = rows
+        # the page hands over live DB sequences; pin the length so the view
+        # never sees rows appear between refreshes without a signal
+        self._n = len(rows)
+        self._row_of = None
+        self.endResetModel()
+
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._n
+
+    def item(self, row: int) -> Optional[dict]:
+        if 0 <= row < self._n and row < len(self.rows):
+            return self.rows[row]
+        return None
+
+    def row_of(self, item_id: str) -> Optional[int]:
+        # built on first lookup only; plain browsing never pays for it
+        if self._row_of is None:
+            rows = self.rows
+            self._row_of = {rows[i].get("id"): i for i in range(min(self._n, len(rows)))}
+        return self._row_of.get(item_id)
+
+    def _preview(self, it: dict) -> str:
+        key = it.get("id")
+        text = it.get("text") or ""
+        hit = self._cache.get(key)
+        if hit is not None and hit[0] is text:
+            self._cache.move_to_end(key)
+            return hit[1]
+        txt = text.replace("\n", " ")
+        short = txt[:self.PREVIEW_LEN] + "…" if len(txt) > self.PREVIEW_LEN else txt
+        self._cache[key] = (text, short)
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return short
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.DisplayRole):
+        it = self.item(index.row()) if index.isValid() else None
+        if it is None:
+            return None
+        if role == QtCore.Qt.DisplayRole:
+            return self._preview(it)
+        if role == self.ID_ROLE:
+            return it.get("id")
+        return None
+
 class ContentPage(QtWidgets.QWidget):
     def __init__(self, mw: 'MainWindow', area: str, title: str, add_label: str):
         super().__init__()
@@ -1727,6 +4453,7 @@ class ContentPage(QtWidgets.QWidget):
         self.db = mw.content_db
         self.current_cat = self.db.categories(area)[0]
         self.only_today = False
+        self._fresh_cache: Optional[tuple[tuple, list[dict]]] = None
         head = QtWidgets.QHBoxLayout()
         lbl = QtWidgets.QLabel(title); lbl.setObjectName("Title")
         head.addWidget(lbl)
@@ -1758,15 +4485,35 @@ class ContentPage(QtWidgets.QWidget):
         self.btn_menu.setMenu(self.menu)
         self.menu.aboutToShow.connect(lambda: Anim.menu_pop(self.menu))
         self.act_add = self.menu.addAction(add_label)
-        self.act_import = self.menu.addAction("Импорт JSON…")
-        self.act_export = self.menu.addAction("Экспорт JSON…")
+        self.act_import = self.menu.addAction("Импорт…")
+        self.act_export = self.menu.addAction("Экспорт…")
+        self.act_archive = self.menu.addAction("Архив раздела…")
+        self.act_backup = self.menu.addAction("Архив всей базы…")
+        self.menu.addSeparator()
+        self.menu_pick = self.menu.addMenu("Случайный текст")
+        smooth_menu(self.menu_pick)
+        grp = QtGui.QActionGroup(self.menu_pick)
+        for mode, label in PICK_MODES.items():
+            act = self.menu_pick.addAction(label)
+            act.setCheckable(True)
+            act.setData(mode)
+            grp.addAction(act)
+            act.triggered.connect(lambda checked=False, m=mode: self._set_pick_mode(m))
+        # the mode is shared by both content pages, so sync the check mark on open
+        self.menu_pick.aboutToShow.connect(
+            lambda: [a.setChecked(a.data() == self.db.picker.mode) for a in self.menu_pick.actions()])
         self.menu.addSeparator()
         self.act_edit = self.menu.addAction("Редактировать выбранный")
         self.act_del = self.menu.addAction("Удалить выбранный")
 
         head.addWidget(self.btn_menu)
 
-        self.lst = QtWidgets.QListWidget()
+        self.model = ContentListModel(self)
+        self.lst = QtWidgets.QListView()
+        self.lst.setModel(self.model)
+        self.lst.setUniformItemSizes(True)
+        self.lst.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.lst.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
         self.preview = QtWidgets.QPlainTextEdit()
         self.preview.setReadOnly(True)
         self.hint = QtWidgets.QLabel("Подсказка по контенту: —")
@@ -1777,10 +4524,15 @@ class ContentPage(QtWidgets.QWidget):
         self.btn_random = QtWidgets.QPushButton("Случайный текст")
         self.btn_copy = QtWidgets.QPushButton("COPY"); self.btn_copy.setIcon(icon_svg("copy"))
         self.btn_toggle_preview = QtWidgets.QPushButton("Свернуть просмотр")
+        self.task_bar = QtWidgets.QProgressBar()
+        self.task_bar.setRange(0, 100)
+        self.task_bar.setFixedWidth(180)
+        self.task_bar.hide()
 
         bottom = QtWidgets.QHBoxLayout()
         bottom.addWidget(self.btn_random)
         bottom.addStretch(1)
+        bottom.addWidget(self.task_bar)
         bottom.addWidget(self.btn_copy)
         bottom.addWidget(self.btn_toggle_preview)
 
@@ -1810,7 +4562,7 @@ class ContentPage(QtWidgets.QWidget):
 
         self.setLayout(grid)
 
-        self.lst.currentRowChanged.connect(self._sel_changed)
+        self.lst.selectionModel().currentRowChanged.connect(lambda cur, prev: self._sel_changed(cur.row()))
         self.btn_random.clicked.connect(self.pick_random)
         self.btn_copy.clicked.connect(self.copy_current)
         self.btn_toggle_preview.clicked.connect(self.toggle_preview)
@@ -1818,11 +4570,43 @@ class ContentPage(QtWidgets.QWidget):
         self.act_add.triggered.connect(self.add_item)
         self.act_import.triggered.connect(self.import_items)
         self.act_export.triggered.connect(self.export_items)
+        self.act_archive.triggered.connect(lambda: self.export_archive([self.area]))
+        self.act_backup.triggered.connect(lambda: self.export_archive(["ppv", "mailing"]))
         self.act_edit.triggered.connect(self.edit_item)
         self.act_del.triggered.connect(self.delete_item)
 
+        # one background import/export at a time
+        self._pool = QtCore.QThreadPool(self)  # created first, so it's destroyed (and joined) first
+        self._pool.setMaxThreadCount(1)
+        self._signals = TaskSignals(self)
+        self._signals.progress.connect(self.task_bar.setValue)
+        self._signals.batch.connect(self._import_batch)
+        self._signals.done.connect(self._task_done)
+        self._task: Optional[tuple] = None  # (kind, detail) of the running job
+        self._import_task: Optional[ImportTask] = None
+        self._imported = (0, 0)             # (added, skipped as added meanwhile) so far
+
         self.refresh()
 
+    def select_item(self, cat: str, item_id: str):
+        if cat != self.current_cat:
+            self.cmb.setCurrentText(cat)
+        if self.model.row_of(item_id) is None and self.only_today:
+            self.chk_today.setChecked(False)  # the filter hides it
+        row = self.model.row_of(item_id)
+        if row is not None:
+            self._set_row(row, QtWidgets.QAbstractItemView.PositionAtCenter)
+
+    def _set_row(self, row: int, hint=QtWidgets.QAbstractItemView.EnsureVisible):
+        idx = self.model.index(row, 0)
+        self.lst.setCurrentIndex(idx)
+        self.lst.scrollTo(idx, hint)
+
+    def _set_pick_mode(self, mode: str):
+        self.db.picker.set_mode(mode)
+        self.mw.g["pick_mode"] = mode
+        save_settings(self.mw.g)
+
     def _set_today(self, on: bool):
         self.only_today = bool(on)
         self.refresh()
@@ -1850,39 +4634,30 @@ class ContentPage(QtWidgets.QWidget):
         self.current_cat = cat
         self.refresh()
 
-    def _items_filtered(self) -> list[dict]:
-        items = self.db.items(self.area, self.current_cat)
+    def _items_filtered(self) -> Sequence[dict]:
         if not self.only_today:
-            return items
-        tk = today_key()
-        return [it for it in items if int((it.get("uses_by_day") or {}).get(tk) or 0) == 0]
+            return self.db.items(self.area, self.current_cat)
+        key = (self.current_cat, self.db.generation(self.area, self.current_cat), today_key())
+        if self._fresh_cache is None or self._fresh_cache[0] != key:
+            used = self.db.used_today_ids(self.area, self.current_cat)
+            self._fresh_cache = (key, [it for it in self.db.items(self.area, self.current_cat) if it.get("id") not in used])
+        return self._fresh_cache[1]
 
     def refresh(self):
-        self.lst.clear()
-        items = self._items_filtered()
-        for it in items:
-            txt = (it.get("text") or "").replace("\n"," ")
-            short = txt[:60] + "…" if len(txt) > 60 else txt
-            item = QtWidgets.QListWidgetItem(short)
-            self.lst.addItem(item)
+        # a live ItemsView of the current category (or the "today" list cached
+        # per db.generation): edits bump the generation and call refresh() to
+        # reset the model, which pins the row count in between
+        self.model.set_rows(self._items_filtered())
         self.preview.setPlainText("")
         self.hint.setText("Подсказка по контенту: —")
         self._update_stats()
 
     def _update_stats(self):
-        items = self.db.items(self.area, self.current_cat)
-        tk = today_key()
-        used_today = sum(1 for it in items if int((it.get("uses_by_day") or {}).get(tk) or 0) > 0)
-        total = len(items)
-        copies = sum(int(it.get("copies_total") or 0) for it in items)
-        self.stats.setText(f"Статистика: {total} шт • использовано сегодня: {used_today} • всего копий: {copies}")
+        st = self.db.day_stats(self.area, self.current_cat)
+        self.stats.setText(f"Статистика: {st['total']} шт • использовано сегодня: {st['used_today']} • всего копий: {st['copies']}")
 
     def _current_item(self) -> Optional[dict]:
-        row = self.lst.currentRow()
-        items = self._items_filtered()
-        if 0 <= row < len(items):
-            return items[row]
-        return None
+        return self.model.item(self.lst.currentIndex().row())
 
     def _sel_changed(self, row: int):
         it = self._current_item()
@@ -1929,40 +4704,112 @@ class ContentPage(QtWidgets.QWidget):
         if not it:
             return
         # select it in filtered list
-        items = self._items_filtered()
-        for i, x in enumerate(items):
-            if x.get("id") == it.get("id"):
-                self.lst.setCurrentRow(i)
-                break
+        row = self.model.row_of(it.get("id"))
+        if row is not None:
+            self._set_row(row)
 
     def copy_current(self):
         it = self._current_item()
         if not it:
             return
         text = it.get("text","")
-        if pyperclip is not None:
-            pyperclip.copy(text)
-        else:
-            QtWidgets.QApplication.clipboard().setText(text)
+        copy_text(text)
         self.db.mark_used(self.area, self.current_cat, it["id"], as_copy=True)
         self._update_stats()
         Toast(self, "Скопировано ✅", kind="info").show_toast()
         Anim.bounce(self.btn_copy, 180)
 
+    def _start_task(self, task: QtCore.QRunnable, kind: str, detail, label: str):
+        self._task = (kind, detail)
+        for a in (self.act_import, self.act_export, self.act_archive, self.act_backup):
+            a.setEnabled(False)
+        self.task_bar.setFormat(f"{label}… %p%")
+        self.task_bar.setValue(0)
+        self.task_bar.show()
+        self._pool.start(task)
+
+    def _task_done(self, res: tuple):
+        (kind, detail), self._task = self._task or ("", None), None
+        for a in (self.act_import, self.act_export, self.act_archive, self.act_backup):
+            a.setEnabled(True)
+        self.task_bar.hide()
+        out, err = res
+        if self._import_task is not None and not self._import_task.cancelled.is_set():
+            self.db.release_saves()  # one write for the whole import
+        self._import_task = None
+        if err or not kind:
+            Toast(self, f"Ошибка: {err}", kind="error").show_toast()
+        elif kind == "import":
+            n, raced = self._imported
+            msg = f"Добавлено: {n} • дубликатов: {out['dup'] + raced}"
+            if out["bad"]:
+                msg += f" • пропущено битых записей: {out['bad']}"
+            Toast(self, msg, kind="info").show_toast()
+            if detail == self.current_cat:
+                self.refresh()
+        elif kind == "export":
+            Toast(self, f"Экспорт завершён: {out} шт", kind="info").show_toast()
+        else:
+            Toast(self, f"Архив сохранён: {len(out['categories'])} категорий • {out['items']} текстов",
+                  kind="info").show_toast()
+
     def import_items(self):
-        fn, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Импорт JSON", "", "JSON (*.json)")
+        if self._task is not None:
+            return
+        fn, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Импорт", "", "Тексты (*.json *.jsonl *.ndjson *.csv *.txt);;Все файлы (*)")
         if not fn:
             return
-        n = self.db.import_json(self.area, self.current_cat, Path(fn))
-        Toast(self, f"Добавлено: {n}", kind="info").show_toast()
-        self.refresh()
+        # the category may be switched while the file is read; the texts still go where they were aimed
+        known = set(self.db.text_keys(self.area, self.current_cat))
+        self._import_task = ImportTask(Path(fn), known, self.db._mk, self._signals)
+        self.db.hold_saves()  # batches land over many event-loop turns; flush once in _task_done
+        self._imported = (0, 0)
+        self._start_task(self._import_task, "import", self.current_cat, "Импорт")
+
+    def _import_batch(self, fresh: list):
+        # GUI thread, in order, before the task's done signal
+        task, (_, cat) = self._import_task, self._task or ("", self.current_cat)
+        if task is None or task.cancelled.is_set():
+            return  # cancelled on close: the DB is being shut down
+        try:
+            n = self.db.add_many(self.area, cat, fresh)
+            added, raced = self._imported
+            self._imported = (added + n, raced + len(fresh) - n)   # raced: texts added meanwhile
+        finally:
+            if task is not None:
+                task.room.release()
+
+    def cancel_task(self):
+        if self._import_task is not None:
+            self._import_task.cancelled.set()
 
     def export_items(self):
-        fn, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Экспорт JSON", f"{self.area}_{self.current_cat}.json", "JSON (*.json)")
+        if self._task is not None:
+            return
+        fn, flt = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Экспорт", f"{self.area}_{self.current_cat}.json", "JSON (*.json);;JSON Lines (*.jsonl)")
+        if not fn:
+            return
+        path, cat = Path(fn), self.current_cat
+        fmt = "jsonl" if path.suffix.lower() == ".jsonl" or (not path.suffix and "jsonl" in flt) else "json"
+        if not path.suffix:
+            path = path.with_suffix("." + fmt)
+        job = lambda progress: self.db.export_json(self.area, cat, path, fmt, progress)
+        self._start_task(ExportTask(job, self.db.count(self.area, cat), self._signals), "export", path, "Экспорт")
+
+    def export_archive(self, areas: list[str]):
+        if self._task is not None:
+            return
+        name = f"{APP_NAME}_{'_'.join(areas)}_{date.today().isoformat()}.zip"
+        fn, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Архив", name, "ZIP (*.zip)")
         if not fn:
             return
-        self.db.export_json(self.area, self.current_cat, Path(fn))
-        Toast(self, "Экспорт завершён", kind="info").show_toast()
+        path = Path(fn) if Path(fn).suffix else Path(fn).with_suffix(".zip")
+        cats = [(a, c) for a in areas for c in self.db.categories(a)]
+        total = sum(self.db.count(a, c) for a, c in cats)
+        job = lambda progress: self.db.export_archive(path, cats, progress)
+        self._start_task(ExportTask(job, total, self._signals), "archive", path, "Архив")
 
 class PricePage(QtWidgets.QWidget):
     def __init__(self, mw: 'MainWindow'):
@@ -2089,6 +4936,7 @@ class MainWindow(QtWidgets.QWidget):
         self._closing = False
         self.g = g
         self._theme = self.g.get("theme", "Ametrine")
+        Anim.scheduler().performance_mode = bool(self.g.get("performance_mode", False))
 
         self.setWindowTitle(APP_NAME)
         self.setMinimumSize(1100, 720)
@@ -2142,7 +4990,9 @@ class MainWindow(QtWidgets.QWidget):
         rlay.addWidget(self.status)
 
         # Data
-        self.content_db = ContentDB(CONTENT_DB_FILE)
+        self.content_db = open_content_db(self.g.get("content_backend", "json"))
+        self.content_db.picker.set_mode(self.g.get("pick_mode", "deck"))
+        self.search_index = SearchIndex()
         self.categories, self.binds = load_profile(self.cmb_profile.currentText())
 
         # Engine
@@ -2192,6 +5042,18 @@ class MainWindow(QtWidgets.QWidget):
         smooth_menu(dens_menu)
         self.act_dense_compact = dens_menu.addAction("Compact")
         self.act_dense_comfy = dens_menu.addAction("Comfortable")
+        store_menu = self.menu.addMenu("Хранилище контента")
+        smooth_menu(store_menu)
+        store_grp = QtGui.QActionGroup(store_menu)
+        for backend, label in CONTENT_BACKENDS.items():
+            act = store_menu.addAction(label)
+            act.setCheckable(True)
+            act.setChecked(backend == self.g.get("content_backend", "json"))
+            store_grp.addAction(act)
+            act.triggered.connect(lambda checked=False, b=backend: self.set_content_backend(b))
+        self.act_perf = self.menu.addAction("Режим производительности")
+        self.act_perf.setCheckable(True)
+        self.act_perf.setChecked(Anim.scheduler().performance_mode)
         self.menu.addSeparator()
         self.act_open_log = self.menu.addAction("Открыть лог")
         self.act_about = self.menu.addAction("О приложении")
@@ -2223,6 +5085,7 @@ class MainWindow(QtWidgets.QWidget):
         self.act_spotlight.setShortcut("Ctrl+K")
         self.act_dense_compact.triggered.connect(lambda: self.set_density("compact"))
         self.act_dense_comfy.triggered.connect(lambda: self.set_density("comfortable"))
+        self.act_perf.toggled.connect(self.set_performance_mode)
         try:
 
             self.act_share.triggered.connect(self.share_selected_bind)
@@ -2247,12 +5110,18 @@ class MainWindow(QtWidgets.QWidget):
 
         # Show animation
         Anim.fade(self, 0.0, 1.0, 220)
-        self._glow = None
+        self._glow = HoverGlow(self._glow_color, lambda: float(THEMES.get(self._theme, THEMES["Ametrine"]).get("radius", "16")))
+        QtWidgets.QApplication.instance().installEventFilter(self._glow)
 
     # --- Helpers ---
     def get_theme(self) -> str:
         return self._theme
 
+    def _glow_color(self) -> QtGui.QColor:
+        c = _parse_rgba(THEMES.get(self._theme, THEMES["Ametrine"])["accent"])
+        c.setAlpha(min(255, c.alpha() * 2))
+        return c
+
     def set_status(self, s: str):
         self.status.setText(str(s))
 
@@ -2285,6 +5154,16 @@ class MainWindow(QtWidgets.QWidget):
 
     def closeEvent(self, e: QtGui.QCloseEvent):
         if self._closing:
+            try:
+                self.engine.shutdown()
+            except Exception:
+                pass
+            for page in (self.page_ppv, self.page_mail):
+                page.cancel_task()
+            try:
+                self.content_db.close()
+            except Exception:
+                pass
             e.accept()
             return
         self._closing = True
@@ -2300,15 +5179,13 @@ class MainWindow(QtWidgets.QWidget):
         cur = self.stack.currentWidget()
         if cur is w:
             return
-        try:
-            Anim.fade(cur, 1.0, 0.0, 120)
-        except Exception:
-            pass
+        # no fade-out for cur: the stack hides it right away, the effect would
+        # only render it offscreen unseen (and stay behind on the hidden page)
         self.stack.setCurrentWidget(w)
         try:
             Anim.fade(w, 0.0, 1.0, 180)
             Anim.slide_in(w, dx=16, ms=180)
-            Anim.motion_blur(w, 180)
+            Anim.motion_blur(w, 180)   # takes over w's effect slot; skipped in performance mode
         except Exception:
             pass
 
@@ -2325,9 +5202,7 @@ class MainWindow(QtWidgets.QWidget):
         self._theme = str(name)
         self.g["theme"] = self._theme
         save_settings(self.g)
-        QtWidgets.QApplication.instance().setStyleSheet(
-            app_stylesheet(self._theme, self.g.get("density", "comfortable"))
-        )
+        apply_stylesheet(self._theme, self.g.get("density", "comfortable"))
         self._theme_colors = THEMES.get(self._theme, THEMES["Ametrine"])
         try:
             Anim.fade(self.root, 0.0, 1.0, 220)
@@ -2337,12 +5212,24 @@ class MainWindow(QtWidgets.QWidget):
         self.root.update()
 
 
+    def set_content_backend(self, backend: str):
+        # pages hold the open DB, so the switch (and any migration) happens on the next start
+        if backend not in CONTENT_BACKENDS or backend == self.g.get("content_backend", "json"):
+            return
+        self.g["content_backend"] = backend
+        save_settings(self.g)
+        Toast(self, f"Хранилище: {CONTENT_BACKENDS[backend]} — вступит в силу после перезапуска", kind="info").show_toast()
+
+    def set_performance_mode(self, on: bool):
+        self.g["performance_mode"] = bool(on)
+        save_settings(self.g)
+        Anim.scheduler().performance_mode = bool(on)
+        Toast(self, "Режим производительности: " + ("вкл" if on else "выкл"), kind="info").show_toast()
+
     def set_density(self, density: str):
         self.g["density"] = density
         save_settings(self.g)
-        QtWidgets.QApplication.instance().setStyleSheet(
-            app_stylesheet(self._theme, self.g.get("density", "comfortable"))
-        )
+        apply_stylesheet(self._theme, density)
 
     def open_spotlight(self):
         dlg = SpotlightDialog(self)
@@ -2509,11 +5396,7 @@ class MainWindow(QtWidgets.QWidget):
             return
         b = self.binds[idxs[0]]
         code = encode_share({"type": "bind", "bind": asdict(b)})
-        try:
-            import pyperclip  # type: ignore
-            pyperclip.copy(code)
-        except Exception:
-            QtWidgets.QApplication.clipboard().setText(code)
+        copy_text(code)
         Toast(self, "Код бинда скопирован ✅").show_toast()
 
     def import_bind_code(self):
@@ -2549,6 +5432,9 @@ def load_settings() -> dict:
     s.setdefault("profile", DEFAULT_PROFILES[0])
     s.setdefault("density", "comfortable")
     s.setdefault("onboarding_seen", False)
+    s.setdefault("content_backend", "json")  # "json" | "sqlite"
+    s.setdefault("pick_mode", "deck")          # see PICK_MODES
+    s.setdefault("performance_mode", False)    # no blur / ghost grabs, see AnimScheduler
     s.pop("last_updated_tag", None)
     s.pop("pending_update_tag", None)
     return s
@@ -2559,6 +5445,12 @@ def save_settings(s: dict):
 # ---------- main ----------
 
 def main():
+    if "--compact-usage" in sys.argv:
+        setup_logging()
+        db = ContentDB(CONTENT_DB_FILE)
+        db.compact()
+        db.close()
+        return
     QtCore.QCoreApplication.setApplicationName(APP_NAME)
     try:
         os.environ["TMP"] = str(TEMP_DIR)